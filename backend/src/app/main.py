@@ -1,8 +1,28 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from backend.src.app.routers import chat
+from backend.src.app.services.inference import analysis_batcher, inference_pool
+from backend.src.app.services.order_service import order_status_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts the inference workers (models loaded) and opens the order-status
+    connection pool on startup; closes both on shutdown.
+    """
+    await inference_pool.start()
+    await order_status_service.start()
+    yield
+    await analysis_batcher.close()
+    await inference_pool.close()
+    await order_status_service.close()
 
-app = FastAPI(title="ChatBot")
+
+app = FastAPI(title="ChatBot", lifespan=lifespan)
 
 origins = ["http://localhost:5173"]
 
@@ -22,4 +42,12 @@ async def root():
     """
     Root endpoint for basic health check.
     """
-    return {"message": "ChatBot is running"}
\ No newline at end of file
+    return {"message": "ChatBot is running"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus metrics of the NER micro-batcher: batch sizes and queue wait times.
+    """
+    return "\n".join(analysis_batcher.prometheus_lines()) + "\n"
@@ -1,10 +1,12 @@
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 
 # Import the decoupled services
-from backend.src.app.services import nlp_service, email_service
-from backend.src.summarizer import get_n_tokens_summary
+from backend.src.app.services import email_service, order_service
+from backend.src.app.services.inference import InferenceTimeout, analyze_message
+from backend.src.highlighter import highlight
 
 # --- Pydantic Models (as defined above) ---
 class ChatRequest(BaseModel):
@@ -17,6 +19,8 @@ class ChatRequest(BaseModel):
 class ExtractedEntity(BaseModel):
     text: str
     label: str
+    start_char: Optional[int] = None
+    end_char: Optional[int] = None
 
 class FoundEmail(BaseModel):
     id: str
@@ -26,17 +30,23 @@ class FoundEmail(BaseModel):
     class Config:
         populate_by_name = True 
 
+class OrderStatus(BaseModel):
+    order_id: str
+    found: bool
+    status: Optional[str] = None
+    carrier: Optional[str] = None
+    tracking_id: Optional[str] = None
+
 class ChatResponse(BaseModel):
     reply: str
     entities: List[ExtractedEntity]
+    orders: List[OrderStatus] = []
     found_emails: Optional[List[FoundEmail]] = None
     draft_details: Optional[dict] = None
 
 
 def highlight_entities(text, entities):
-    for entity in entities:
-        text = text.replace(entity["text"], f"<strong>{entity['text']}</strong>")
-    return text
+    return highlight(text, entities, style="html")
 
 
 
@@ -58,22 +68,33 @@ async def handle_chat_message(request: ChatRequest):
     Main endpoint for the chat UI to interact with the AI agent.
     
     1. Validates the incoming ChatRequest.
-    2. Processes the message for NLP entities.
-    3. (Simulates) action based on the message.
-    4. Returns a structured ChatResponse.
+    2. Processes the message for NLP entities and its summary, in the
+       inference worker pool (the event loop stays free meanwhile).
+    3. Looks up the ORDER_ID entities in the tracking table (cached, batched).
+    4. (Simulates) action based on the message.
+    5. Returns a structured ChatResponse.
     """
     try:
         # 1. Call NLP service
-        entities = nlp_service.process_text_for_entities(request.message)
+        analysis = await analyze_message(request.message)
+        entities = analysis["entities"]
         
         reply_message = "Message processed."
         found_emails = None
         draft_details = None
 
-        summary = get_n_tokens_summary(request.message)
+        summary = analysis["summary"]
         highlighted_summary = highlight_entities(summary, entities)
         reply_message = highlighted_summary
 
+        # Order IDs found by the entity ruler, resolved in one query (or from the cache)
+        order_ids = list(dict.fromkeys(entity["text"] for entity in entities if entity["label"] == "ORDER_ID"))
+        statuses = await order_service.lookup_orders(order_ids) if order_ids else {}
+        orders = [
+            OrderStatus(**(statuses[order_id] or {"order_id": order_id}), found=statuses[order_id] is not None)
+            for order_id in order_ids if order_id in statuses
+        ]
+
         # 2. Simple logic to call email service (simulation)
         # if "search" in request.message.lower() or "find" in request.message.lower():
         #     query = request.message.replace("search", "").replace("find", "").strip()
@@ -95,9 +116,13 @@ async def handle_chat_message(request: ChatRequest):
         # 3. Assemble and return the structured response
         return ChatResponse(
             reply=reply_message,
-            entities=entities
+            entities=entities,
+            orders=orders
         )
         
+    except InferenceTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+
     except Exception as e:
         # Generic error handling
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
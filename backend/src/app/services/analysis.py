@@ -0,0 +1,72 @@
+from functools import cached_property
+from typing import Iterable, List, Optional
+
+import spacy
+
+from backend.src.summary_engine import extractive_summary
+
+
+# Pipeline components each endpoint needs. The others (tagger, parser,
+# attribute_ruler, lemmatizer, ...) are not run for it, and those that no
+# endpoint needs are not even loaded.
+ENDPOINT_COMPONENTS = {
+    "chat": ("pii_redactor", "transformer", "tok2vec", "entity_ruler", "ner"),
+}
+
+
+def disabled_components(pipe_names: Iterable[str], endpoint: str) -> List[str]:
+    needed = ENDPOINT_COMPONENTS[endpoint]
+    return [name for name in pipe_names if name not in needed]
+
+
+def unused_components(pipe_names: Iterable[str]) -> List[str]:
+    needed = {name for names in ENDPOINT_COMPONENTS.values() for name in names}
+    return [name for name in pipe_names if name not in needed]
+
+
+def load_pipeline(model_path: str):
+    """spacy.load() without the components that no endpoint uses."""
+    pipe_names = spacy.util.load_config(f"{model_path}/config.cfg")["nlp"]["pipeline"]
+    return spacy.load(model_path, exclude=unused_components(pipe_names))
+
+
+class MessageAnalysis:
+    """
+    One parse of a chat message, shared by everything the request needs:
+    entities with their character offsets and the token-limited summary,
+    which is picked using those entities. Offsets are into `text`, the
+    text of the Doc (PII already redacted by the pipeline), which is also
+    the text the summary is taken from.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+
+    @property
+    def text(self) -> str:
+        return self.doc.text
+
+    @cached_property
+    def entities(self) -> List[dict]:
+        return [
+            {"text": ent.text, "label": ent.label_, "start_char": ent.start_char, "end_char": ent.end_char}
+            for ent in self.doc.ents
+        ]
+
+    def summary(self, n_tokens: Optional[int] = None) -> str:
+        """
+        Extractive summary of at most n_tokens tokens (config.SUMMARY_PLACEHOLDER_TOKEN_LIMIT
+        by default), preferring the sentences with order IDs, carriers and
+        the entities found in this Doc (backend/src/summary_engine.py).
+        """
+        return extractive_summary(self.text, n_tokens, entities=self.entities)
+
+    def to_dict(self) -> dict:
+        """Plain-data form, to send back from an inference worker."""
+        return {"text": self.text, "entities": self.entities, "summary": self.summary()}
+
+
+def analyze_many(nlp, texts: List[str], endpoint: str = "chat") -> List[MessageAnalysis]:
+    """Parses the texts once, as one nlp.pipe batch, with only the endpoint's components."""
+    docs = nlp.pipe(texts, batch_size=max(len(texts), 1), disable=disabled_components(nlp.pipe_names, endpoint))
+    return [MessageAnalysis(doc) for doc in docs]
@@ -0,0 +1,148 @@
+import asyncio
+import time
+from typing import Any, Callable, List, Sequence
+
+
+# Histogram buckets of the exposed metrics
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+QUEUE_WAIT_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as Prometheus exposes them."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def prometheus(self, metric: str, labels: str) -> List[str]:
+        lines = [f'{metric}_bucket{{{labels},le="{bound}"}} {count}' for bound, count in zip(self.buckets, self.counts)]
+        lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{metric}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{metric}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests into batches for a model that is faster
+    on many documents at once (spaCy's nlp.pipe).
+
+    A batch is closed when it holds max_batch_size items or when its first
+    item has waited max_wait_ms, whichever comes first. `process_batch`
+    takes the list of items and returns one result per item, in order. It
+    runs in `executor` (the default thread pool if None), off the event
+    loop. Each caller of submit() gets its own result or exception.
+
+    Up to max_in_flight batches run at the same time (size it to the
+    executor's workers); while they all run, new requests keep queueing
+    and form the next, fuller batch.
+
+    Batch sizes and queue wait times are kept as histograms for /metrics.
+    """
+
+    def __init__(self, process_batch: Callable[[list], list], max_batch_size: int = 16,
+                 max_wait_ms: float = 5.0, name: str = "batch", executor=None, max_in_flight: int = 1):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait = Histogram(QUEUE_WAIT_BUCKETS)
+        self._queue = None
+        self._worker = None
+        self._slots = None
+        self._batches = set()
+
+    def _ensure_started(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, item: Any):
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future, time.perf_counter()))
+        return await future
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            for task in self._batches:
+                task.cancel()
+            await asyncio.gather(self._worker, *self._batches, return_exceptions=True)
+            self._worker = None
+            self._batches.clear()
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            await self._slots.acquire()
+            task = loop.create_task(self._process(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _process(self, batch: list):
+        try:
+            batch = [entry for entry in batch if not entry[1].cancelled()]   # callers that gave up
+            if not batch:
+                return
+
+            started = time.perf_counter()
+            self.batch_sizes.observe(len(batch))
+            for _, _, enqueued in batch:
+                self.queue_wait.observe(started - enqueued)
+
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, self.process_batch, [item for item, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+    def prometheus_lines(self, prefix: str = "shipcube_nlp") -> List[str]:
+        labels = f'batcher="{self.name}"'
+        lines = [f"# TYPE {prefix}_batch_size histogram"]
+        lines += self.batch_sizes.prometheus(f"{prefix}_batch_size", labels)
+        lines.append(f"# TYPE {prefix}_queue_wait_seconds histogram")
+        lines += self.queue_wait.prometheus(f"{prefix}_queue_wait_seconds", labels)
+        return lines
@@ -0,0 +1,131 @@
+import asyncio
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from backend.src import config
+from backend.src.app.services.batching import MicroBatcher
+
+
+class InferenceTimeout(TimeoutError):
+    """The models did not answer within the request's time budget."""
+
+
+# --- Worker side: these run in the pool processes only ---
+
+def _load_models(threads: int = 1):
+    """
+    Pool initializer: loads the hybrid NER pipeline and the summarizer
+    model once per worker process. Torch is limited to `threads` threads
+    so that the workers do not fight over the same cores.
+    """
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads))
+    os.environ.setdefault("MKL_NUM_THREADS", str(threads))
+    from backend.src.app.services import nlp_service  # noqa: F401  (loads the models)
+
+
+def _analyze_batch(texts: List[str]) -> List[dict]:
+    from backend.src.app.services import nlp_service
+    return nlp_service.analyze_texts(texts)
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+# --- API side ---
+
+class InferencePool(concurrent.futures.Executor):
+    """
+    Process pool for the CPU-bound NLP work, so a forward pass never runs
+    on the event loop. Workers are spawned (not forked: torch and the
+    event loop do not survive a fork) and each loads the models once,
+    in `initializer`.
+
+    It is an Executor, so it can be handed to loop.run_in_executor() or
+    MicroBatcher. If a worker dies (e.g. killed for memory), the broken
+    pool is replaced on the next submit; the requests that were in it fail.
+    """
+
+    def __init__(self, workers: int = config.INFERENCE_WORKERS, initializer=_load_models,
+                 initargs=(config.INFERENCE_THREADS_PER_WORKER,)):
+        self.workers = workers
+        self.initializer = initializer
+        self.initargs = initargs if initializer else ()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _new_executor(self):
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=self.initializer, initargs=self.initargs,
+        )
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor()
+            try:
+                return self._executor.submit(fn, *args, **kwargs)
+            except BrokenProcessPool:
+                logging.warning("Inference pool is broken (a worker died); starting a new one.")
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+                return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    async def start(self) -> List[int]:
+        """
+        Spawns every worker and waits until each has loaded the models, so
+        the first requests do not pay for it. Returns the worker PIDs.
+        """
+        loop = asyncio.get_running_loop()
+        # all submitted at once: no worker is idle, so the pool spawns one per task
+        pids = await asyncio.gather(*(loop.run_in_executor(self, _worker_pid) for _ in range(self.workers)))
+        logging.info(f"Inference pool ready: {len(set(pids))} worker(s).")
+        return sorted(set(pids))
+
+    async def close(self):
+        await asyncio.get_running_loop().run_in_executor(None, lambda: self.shutdown(cancel_futures=True))
+
+    async def run(self, fn, *args, timeout: Optional[float] = config.INFERENCE_TIMEOUT_SECONDS):
+        """
+        Runs fn(*args) in a worker. Raises InferenceTimeout after `timeout`
+        seconds. On timeout or cancellation the job is dropped if it has not
+        started yet; a job already running finishes in its worker and its
+        result is discarded.
+        """
+        future = asyncio.get_running_loop().run_in_executor(self, fn, *args)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise InferenceTimeout(f"Inference did not finish within {timeout}s.") from None
+
+
+inference_pool = InferencePool()
+
+# Concurrent chat messages share one worker round trip and one nlp.pipe
+# pass; up to one batch per worker runs at a time
+analysis_batcher = MicroBatcher(_analyze_batch, max_batch_size=config.NER_BATCH_SIZE,
+                                max_wait_ms=config.NER_BATCH_WAIT_MS, name="ner",
+                                executor=inference_pool, max_in_flight=inference_pool.workers)
+
+
+async def analyze_message(text: str, timeout: Optional[float] = config.INFERENCE_TIMEOUT_SECONDS) -> dict:
+    """
+    Entities and summary of a chat message, computed in the worker pool.
+    {"entities": [{"text", "label"}, ...], "summary": str}
+    """
+    try:
+        return await asyncio.wait_for(analysis_batcher.submit(text), timeout)
+    except asyncio.TimeoutError:
+        raise InferenceTimeout(f"Inference did not finish within {timeout}s.") from None
@@ -3,14 +3,32 @@ from ml.ner_entity.nlp.build_pipeline import create_pii_redactor
 from ml.pii_redactor import redact_prompt
 from typing import List
 
+from backend.src.app.services.analysis import MessageAnalysis, load_pipeline
+from backend.src.app.services.analysis import analyze_many as _analyze_many
+
 
 """Load the final hybrid NLP pipeline."""
 
 model_path = "ml/ner_entity/models/final_hybrid_pipeline"
 try:
-    nlp = spacy.load(model_path)
+    nlp = load_pipeline(model_path)
 except Exception as e:
     print(f"Failed to load NLP model from {model_path}: {e}")
+    nlp = None
+
+# Without the model, messages are still tokenized for their summary
+tokenizer_only = spacy.blank("en")
+
+
+def analyze(text: str, endpoint: str = "chat") -> MessageAnalysis:
+    """
+    Parses a message once; entities, summary and offsets all come from that Doc.
+    """
+    return analyze_many([text], endpoint)[0]
+
+
+def analyze_many(texts: List[str], endpoint: str = "chat") -> List[MessageAnalysis]:
+    return _analyze_many(nlp if nlp is not None else tokenizer_only, texts, endpoint)
 
 
 def process_text_for_entities(text: str) -> List[dict]:
@@ -21,14 +39,22 @@ def process_text_for_entities(text: str) -> List[dict]:
     if nlp is None:
         return []
 
-    doc = nlp(text)
-    entities = []
-    
-    # Iterate over recognized entities
-    for ent in doc.ents:
-        entities.append({
-            "text": ent.text,
-            "label": ent.label_
-        })
-
-    return entities
\ No newline at end of file
+    return analyze(text).entities
+
+
+def process_texts_for_entities(texts: List[str]) -> List[List[dict]]:
+    """
+    Entities of several texts, run through the model as one nlp.pipe batch.
+    """
+    if nlp is None:
+        return [[] for _ in texts]
+
+    return [analysis.entities for analysis in analyze_many(texts)]
+
+
+def analyze_texts(texts: List[str]) -> List[dict]:
+    """
+    Entities and summary of each text, for a batch of chat messages.
+    Runs in the inference worker processes (backend/src/app/services/inference.py).
+    """
+    return [analysis.to_dict() for analysis in analyze_many(texts)]
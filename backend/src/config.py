@@ -1,3 +1,23 @@
 # In backend/src/config.py
 
-SUMMARY_PLACEHOLDER_TOKEN_LIMIT = 500
\ No newline at end of file
+import os
+
+SUMMARY_PLACEHOLDER_TOKEN_LIMIT = 500
+
+# NER micro-batching (backend/src/app/services/batching.py): a batch runs
+# once it holds NER_BATCH_SIZE messages or its first one waited NER_BATCH_WAIT_MS
+NER_BATCH_SIZE = int(os.environ.get("NER_BATCH_SIZE", 16))
+NER_BATCH_WAIT_MS = float(os.environ.get("NER_BATCH_WAIT_MS", 5.0))
+
+# Inference worker processes (backend/src/app/services/inference.py). Each
+# one loads its own copy of the models, so size this to cores and memory.
+INFERENCE_WORKERS = int(os.environ.get("INFERENCE_WORKERS", min(4, os.cpu_count() or 1)))
+INFERENCE_THREADS_PER_WORKER = int(os.environ.get("INFERENCE_THREADS_PER_WORKER", 1))
+INFERENCE_TIMEOUT_SECONDS = float(os.environ.get("INFERENCE_TIMEOUT_SECONDS", 10.0))
+
+# Extractive summaries (backend/src/summary_engine.py): reading stops after
+# SUMMARY_CANDIDATE_FACTOR x the token limit of candidate sentences,
+# SUMMARY_MAX_SCAN_CHARS characters or SUMMARY_TIME_BUDGET_MS, whichever comes first
+SUMMARY_CANDIDATE_FACTOR = 4
+SUMMARY_MAX_SCAN_CHARS = 100_000
+SUMMARY_TIME_BUDGET_MS = 50.0
@@ -0,0 +1,144 @@
+# backend/src/connectors/rate_client.py
+
+import bisect
+import datetime as dt
+import logging
+import threading
+from array import array
+
+from sqlalchemy import text
+
+
+RATE_COLUMNS = ("origin", "destination", "product_id", "effective_date", "base_rate",
+                "surcharge_type", "surcharge_value", "currency", "last_updated")
+
+# Rows written while a refresh runs can carry a last_updated (NOW() of their
+# transaction) just before the watermark; re-reading a short overlap catches them.
+REFRESH_OVERLAP = dt.timedelta(minutes=5)
+
+
+def _as_date(value) -> dt.date:
+    if isinstance(value, dt.datetime):
+        return value.date()
+    if isinstance(value, dt.date):
+        return value
+    return dt.date.fromisoformat(str(value)[:10])
+
+
+class RateLookupEngine:
+    """
+    In-memory as-of lookup over rate_table.
+
+    Rates are indexed per lane, (origin, destination, product_id), as an
+    array of effective dates (date ordinals, sorted) with the rates in the
+    same order. A quote is a dict lookup plus a bisect: the rate in effect
+    on the ship date is the one with the latest effective_date on or
+    before it. No database round trip per quote.
+
+    refresh() reads only the rows whose last_updated is past the
+    watermark and replaces the affected lanes. Each lane is rebuilt and
+    then swapped in, so quotes from other threads never see a
+    half-updated lane. Deleted rows are only dropped by a full reload
+    (refresh(full=True)).
+    """
+
+    def __init__(self, engine, table_name: str = "rate_table"):
+        self.engine = engine
+        self.table_name = table_name
+        self.watermark = None
+        self._lanes = {}        # (origin, destination, product_id) -> (array of date ordinals, tuple of rates)
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(dates) for dates, _ in self._lanes.values())
+
+    @property
+    def lanes(self) -> int:
+        return len(self._lanes)
+
+    def apply_rows(self, rows, replace: bool = False) -> int:
+        """
+        Adds or replaces rates from rate_table rows (mappings with
+        RATE_COLUMNS). A row replaces the rate of its lane and effective date.
+        Returns the number of lanes rebuilt.
+        """
+
+        changes = {}
+        for row in rows:
+            lane = (row["origin"], row["destination"], row["product_id"])
+            rate = {
+                "origin": row["origin"],
+                "destination": row["destination"],
+                "product_id": row["product_id"],
+                "effective_date": _as_date(row["effective_date"]),
+                "base_rate": row["base_rate"],
+                "surcharge_type": row.get("surcharge_type"),
+                "surcharge_value": row.get("surcharge_value"),
+                "currency": row["currency"],
+            }
+            changes.setdefault(lane, {})[rate["effective_date"].toordinal()] = rate
+            last_updated = row.get("last_updated")
+            if last_updated is not None and (self.watermark is None or last_updated > self.watermark):
+                self.watermark = last_updated
+
+        lanes = {} if replace else self._lanes
+        updated = dict(lanes)
+        for lane, rates_by_day in changes.items():
+            if lane in lanes:
+                dates, rates = lanes[lane]
+                merged = dict(zip(dates, rates))
+                merged.update(rates_by_day)
+            else:
+                merged = rates_by_day
+            days = sorted(merged)
+            updated[lane] = (array("l", days), tuple(merged[day] for day in days))
+
+        self._lanes = updated      # one reference swap, seen whole by concurrent quotes
+        return len(changes)
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Loads the rows changed since the watermark (all rows if full or on
+        the first call). Returns the number of rows read.
+        """
+
+        with self._refresh_lock:
+            full = full or self.watermark is None
+            sql = f"SELECT {', '.join(RATE_COLUMNS)} FROM {self.table_name}"
+            params = {}
+            if not full:
+                sql += " WHERE last_updated > :since"
+                params["since"] = self.watermark - REFRESH_OVERLAP
+            sql += " ORDER BY last_updated"
+
+            with self.engine.connect() as conn:
+                rows = conn.execute(text(sql), params).mappings().all()
+
+            if full:
+                self.watermark = None
+            lanes = self.apply_rows(rows, replace=full)
+            logging.info(f"Rate index {'loaded' if full else 'refreshed'}: {len(rows)} rows read, "
+                         f"{lanes} lanes updated, {self.lanes} lanes in total. Watermark {self.watermark}.")
+            return len(rows)
+
+    def quote(self, origin: str, destination: str, product_id: str, ship_date):
+        """The rate in effect for the lane and product on ship_date, or None."""
+        lane = self._lanes.get((origin, destination, product_id))
+        if lane is None:
+            return None
+        dates, rates = lane
+        i = bisect.bisect_right(dates, _as_date(ship_date).toordinal())
+        return rates[i - 1] if i else None
+
+    def quote_many(self, requests) -> list:
+        """Quotes for (origin, destination, product_id, ship_date) tuples, in order."""
+        lanes = self._lanes
+        quotes = []
+        for origin, destination, product_id, ship_date in requests:
+            lane = lanes.get((origin, destination, product_id))
+            if lane is None:
+                quotes.append(None)
+                continue
+            i = bisect.bisect_right(lane[0], _as_date(ship_date).toordinal())
+            quotes.append(lane[1][i - 1] if i else None)
+        return quotes
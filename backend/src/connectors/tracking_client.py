@@ -0,0 +1,222 @@
+# backend/src/connectors/tracking_client.py
+
+import asyncio
+import datetime as dt
+import logging
+import time
+
+import httpx
+from sqlalchemy import text
+
+from etl.utils import get_sqlalchemy_table
+from etl.staging_upsert import copy_upsert
+from etl.partitions import get_partition_column
+from etl.notify import notify_upserted
+
+
+# Per-carrier batch endpoints. Each takes POST {"tracking_ids": [...]} and
+# answers {"results": [{"tracking_id", "status", ...}]}; IDs it does not
+# know are left out of the results.
+CARRIERS = {
+    "UPS": {"url": "http://localhost:8099/ups/track", "batch_size": 100, "rate_per_second": 10, "timeout": 10.0},
+    "FedEx": {"url": "http://localhost:8099/fedex/track", "batch_size": 30, "rate_per_second": 5, "timeout": 10.0},
+    "USPS": {"url": "http://localhost:8099/usps/track", "batch_size": 35, "rate_per_second": 5, "timeout": 15.0},
+    "DHL": {"url": "http://localhost:8099/dhl/track", "batch_size": 50, "rate_per_second": 5, "timeout": 10.0},
+}
+
+BATCH_WINDOW_SECONDS = 0.05     # how long a lookup waits for others to share its batch request
+MAX_CONNECTIONS = 20
+FINAL_STATUSES = ("Delivered", "Returned", "Cancelled")
+
+
+class RateLimiter:
+    """Token bucket: `rate` requests per second on average, bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class TrackingClient:
+    """
+    Async carrier tracking client.
+
+    * One httpx.AsyncClient (a persistent, keep-alive connection pool)
+      for all carriers.
+    * Simultaneous lookups of the same (carrier, tracking_id) share one
+      result.
+    * Lookups of a carrier are collected for batch_window seconds, or
+      until the carrier's batch_size is reached, and sent as one batch
+      request.
+    * Each carrier has its own rate limit (token bucket) and request timeout.
+
+    `await client.track(carrier, tracking_id)` gives the carrier's result
+    dict, or None if the carrier does not know the ID. It raises if the
+    batch request failed.
+    """
+
+    def __init__(self, carriers: dict = None, client: httpx.AsyncClient = None,
+                 batch_window: float = BATCH_WINDOW_SECONDS, max_connections: int = MAX_CONNECTIONS):
+        self.carriers = CARRIERS if carriers is None else carriers
+        self.batch_window = batch_window
+        self._client = client or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections))
+        self._limiters = {name: RateLimiter(cfg["rate_per_second"], cfg.get("burst", 1))
+                          for name, cfg in self.carriers.items()}
+        self._inflight = {}      # (carrier, tracking_id) -> future
+        self._pending = {}       # carrier -> [tracking_id] waiting for the next batch
+        self._timers = {}        # carrier -> TimerHandle of the pending batch
+        self._sending = set()    # batch tasks in progress
+        self.requests_sent = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        for carrier in list(self._pending):
+            self._flush(carrier)
+        if self._sending:
+            await asyncio.gather(*self._sending, return_exceptions=True)
+        await self._client.aclose()
+
+    def track(self, carrier: str, tracking_id: str) -> asyncio.Future:
+        if carrier not in self.carriers:
+            raise ValueError(f"No tracking endpoint configured for carrier '{carrier}'.")
+
+        key = (carrier, tracking_id)
+        if key in self._inflight:
+            return self._inflight[key]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        pending = self._pending.setdefault(carrier, [])
+        pending.append(tracking_id)
+
+        if len(pending) >= self.carriers[carrier]["batch_size"]:
+            self._flush(carrier)
+        elif carrier not in self._timers:
+            self._timers[carrier] = loop.call_later(self.batch_window, self._flush, carrier)
+        return future
+
+    async def track_many(self, lookups) -> list:
+        """Results for (carrier, tracking_id) pairs, in order; a failed lookup gives its exception."""
+        return await asyncio.gather(*(self.track(carrier, tid) for carrier, tid in lookups), return_exceptions=True)
+
+    def _flush(self, carrier: str):
+        timer = self._timers.pop(carrier, None)
+        if timer:
+            timer.cancel()
+        tracking_ids = self._pending.pop(carrier, [])
+        if tracking_ids:
+            task = asyncio.ensure_future(self._send(carrier, tracking_ids))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, carrier: str, tracking_ids: list):
+        cfg = self.carriers[carrier]
+        keys = [(carrier, tid) for tid in tracking_ids]
+        try:
+            await self._limiters[carrier].acquire()
+            self.requests_sent += 1
+            response = await self._client.post(cfg["url"], json={"tracking_ids": tracking_ids}, timeout=cfg["timeout"])
+            response.raise_for_status()
+            results = {r["tracking_id"]: r for r in response.json().get("results", [])}
+        except Exception as e:
+            logging.warning(f"{carrier} batch of {len(tracking_ids)} tracking IDs failed: {e!r}")
+            for key in keys:
+                future = self._inflight.pop(key, None)
+                if future and not future.done():
+                    future.set_exception(e)
+            return
+
+        for key in keys:
+            future = self._inflight.pop(key, None)
+            if future and not future.done():
+                future.set_result(results.get(key[1]))
+
+
+def select_open_shipments(engine) -> list:
+    """Tracked shipments whose status is not final, with their current status."""
+    placeholders = ", ".join(f":final{i}" for i in range(len(FINAL_STATUSES)))
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT order_id, transaction_date, transaction_status, carrier, tracking_id FROM tracking "
+            "WHERE tracking_id IS NOT NULL AND carrier IS NOT NULL "
+            f"AND COALESCE(transaction_status, '') NOT IN ({placeholders})"
+        ), {f"final{i}": status for i, status in enumerate(FINAL_STATUSES)}).mappings().all()
+
+
+def write_back(engine, shipments, results) -> int:
+    """
+    Upserts the new statuses into tracking through the COPY staging merge
+    (etl/staging_upsert.py), keyed like the ETL loads (plus
+    transaction_date on the partitioned layout), and notifies caches.
+    Only statuses that changed are written.
+    """
+
+    now = dt.datetime.now(dt.timezone.utc)
+    partition_column = get_partition_column("tracking", engine)
+    records = []
+    for shipment, result in zip(shipments, results):
+        if not isinstance(result, dict) or result.get("status") in (None, shipment["transaction_status"]):
+            continue
+        record = {"order_id": shipment["order_id"], "transaction_status": result["status"], "last_updated": now}
+        if partition_column:
+            record[partition_column] = shipment[partition_column]
+        records.append(record)
+
+    if not records:
+        return 0
+    key = ("order_id", partition_column) if partition_column else "order_id"
+    copy_upsert(get_sqlalchemy_table("tracking", engine), records, key, engine)
+    notify_upserted(engine, "tracking", [r["order_id"] for r in records])
+    return len(records)
+
+
+async def refresh_open_shipments(engine, client: TrackingClient = None) -> dict:
+    """Re-tracks every open shipment in batches and writes the changes back to tracking."""
+
+    started = time.perf_counter()
+    shipments = await asyncio.to_thread(select_open_shipments, engine)
+    own_client = client is None
+    client = client or TrackingClient()
+    try:
+        known = [s for s in shipments if s["carrier"] in client.carriers]
+        results = await client.track_many((s["carrier"], s["tracking_id"]) for s in known)
+    finally:
+        if own_client:
+            await client.aclose()
+
+    failed = sum(isinstance(r, Exception) for r in results)
+    updated = await asyncio.to_thread(write_back, engine, known, results)
+    summary = {"open": len(shipments), "tracked": len(known), "failed": failed, "updated": updated,
+               "requests": client.requests_sent, "seconds": round(time.perf_counter() - started, 3)}
+    logging.info(f"Tracking refresh: {summary}")
+    return summary
+
+
+if __name__ == "__main__":
+    from sqlalchemy import create_engine
+    from etl.load_data import DB_CONN_STRING
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    asyncio.run(refresh_open_shipments(create_engine(DB_CONN_STRING)))
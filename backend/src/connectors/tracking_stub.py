@@ -0,0 +1,96 @@
+# backend/src/connectors/tracking_stub.py
+#
+# Local stand-in for the carriers' batch tracking endpoints, for tests and
+# for trying the tracking client without carrier credentials:
+#   python -m backend.src.connectors.tracking_stub --port 8099
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubTrackingServer:
+    """
+    Serves POST /<carrier>/track on localhost in a background thread.
+
+    Answers every tracking ID found in `statuses` ({tracking_id: status}),
+    or any ID with default_status if one is given, and leaves the others
+    out, after `delay` seconds. Each request's carrier and ID list is
+    recorded in `requests`.
+    """
+
+    def __init__(self, statuses: dict = None, port: int = 0, delay: float = 0.0, default_status: str = None):
+        self.statuses = dict(statuses or {})
+        self.default_status = default_status
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"     # keep-alive, as the carriers' APIs
+
+            def do_POST(self):
+                parts = self.path.strip("/").split("/")
+                if len(parts) != 2 or parts[1] != "track":
+                    self.send_error(404)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                tracking_ids = body.get("tracking_ids", [])
+                with stub._lock:
+                    stub.requests.append((parts[0], list(tracking_ids)))
+                if stub.delay:
+                    time.sleep(stub.delay)
+
+                results = [{"tracking_id": tid, "status": stub.statuses.get(tid, stub.default_status),
+                            "carrier": parts[0]}
+                           for tid in tracking_ids if tid in stub.statuses or stub.default_status]
+                payload = json.dumps({"results": results}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub carrier tracking server.")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--status", default="In Transit", help="status reported for every tracking ID")
+    args = parser.parse_args()
+
+    server = StubTrackingServer(port=args.port, default_status=args.status).start()
+    print(f"Stub tracking server on {server.url}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
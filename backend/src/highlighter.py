@@ -0,0 +1,140 @@
+# In backend/src/highlighter.py
+
+import html
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Opening and closing marks of each output style
+STYLES = {
+    "markdown": ("**", "**"),
+    "html": ("<strong>", "</strong>"),
+}
+
+
+def _lower(text: str) -> str:
+    """Lowercase that keeps every character at its offset (str.lower() may not, e.g. for 'İ')."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+class Automaton:
+    """
+    Aho-Corasick automaton over a set of lowercased patterns: finds every
+    occurrence of all of them in one pass over the text.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.length: List[int] = [0]    # length of the pattern ending at the node, 0 if none
+        self.output: List[int] = [0]    # nearest node on the fail chain that ends a pattern
+
+        for pattern in patterns:
+            node = 0
+            for char in pattern:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.length.append(0)
+                    self.output.append(0)
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.length[node] = len(pattern)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(char, 0)
+                target = self.fail[child]
+                self.output[child] = target if self.length[target] else self.output[target]
+                queue.append(child)
+
+    def longest_at(self, text: str) -> List[int]:
+        """
+        For each start offset, the length of the longest pattern found
+        there (0 if none). Runs in O(len(text) + number of occurrences).
+        """
+        goto, fail, length, output = self.goto, self.fail, self.length, self.output
+        longest = [0] * (len(text) + 1)
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            match = node if length[node] else output[node]
+            while match:
+                start = end - length[match]
+                if length[match] > longest[start]:
+                    longest[start] = length[match]
+                match = output[match]
+        return longest
+
+
+@lru_cache(maxsize=256)
+def compile_automaton(patterns: Tuple[str, ...]) -> Automaton:
+    """Cached: the same entity set (e.g. from a repeated query) is compiled once."""
+    return Automaton(patterns)
+
+
+def _offset_spans(text: str, entities: List[dict]) -> Optional[List[Tuple[int, int]]]:
+    """Entity offsets, if every entity has them and they point at its text in `text`."""
+    spans = []
+    for entity in entities:
+        start, end = entity.get("start_char"), entity.get("end_char")
+        if start is None or end is None or text[start:end] != entity.get("text"):
+            return None
+        spans.append((start, end))
+    return spans
+
+
+def _matched_spans(text: str, entity_texts: Iterable[str]) -> List[Tuple[int, int]]:
+    patterns = tuple(sorted({_lower(t) for t in entity_texts if t}))
+    if not patterns:
+        return []
+    longest = compile_automaton(patterns).longest_at(_lower(text))
+    return [(start, start + length) for start, length in enumerate(longest) if length]
+
+
+def _select(spans: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Leftmost-longest, non-overlapping spans: an entity inside another is not marked twice."""
+    selected = []
+    for start, end in sorted(spans, key=lambda s: (s[0], -s[1])):
+        if start >= end or (selected and start < selected[-1][1]):
+            continue
+        selected.append((start, end))
+    return selected
+
+
+def highlight(text: str, entities: Iterable[dict], style: str = "markdown") -> str:
+    """
+    Marks the entities in text, in one pass, with markdown bold or HTML
+    <strong> (the HTML output is escaped). Entity offsets (start_char,
+    end_char) are used when they match this text; otherwise the entity
+    texts are searched for, case-insensitively, with an Aho-Corasick
+    automaton. Longer matches win over the entities they contain.
+    """
+
+    opening, closing = STYLES[style]
+    escape = html.escape if style == "html" else (lambda s: s)
+    entities = [entity for entity in entities if entity.get("text")]
+
+    spans = _offset_spans(text, entities) if entities else []
+    if spans is None:
+        spans = _matched_spans(text, (entity["text"] for entity in entities))
+
+    parts = []
+    position = 0
+    for start, end in _select(spans):
+        parts.append(escape(text[position:start]))
+        parts.append(f"{opening}{escape(text[start:end])}{closing}")
+        position = end
+    parts.append(escape(text[position:]))
+    return "".join(parts)
@@ -0,0 +1,71 @@
+-- ------------------------------
+-- 3. tracking, partitioned by month
+-- ------------------------------
+
+-- Optional layout of the tracking table (create_schema.py --partitioned-tracking
+-- uses it in place of the one in schema.sql). Same columns, but:
+--   * monthly range partitions on transaction_date, which must be set;
+--     partitions are created by the loaders as rows arrive (etl/partitions.py)
+--   * the primary key includes transaction_date, as Postgres requires. It no
+--     longer stops a second row for the same order_id: when an order's
+--     transaction_date changes (possibly to another month, i.e. another
+--     partition), the loaders delete the old row in the upsert's transaction
+--     (etl/partitions.py), so the table keeps one row per order_id. Writers
+--     other than etl/ must do the same.
+--   * BRIN indexes on the timestamp columns: a few pages per partition,
+--     enough for range scans over append-ordered data
+--   * old months are removed with DETACH PARTITION (etl/partitions.py detach),
+--     not DELETE + VACUUM
+
+CREATE TABLE tracking (
+    order_id TEXT NOT NULL,
+    user_id TEXT,
+    merchant_name TEXT,
+    customer_name TEXT,
+    transaction_status VARCHAR(50),
+    transaction_type VARCHAR(50),
+    invoice_number TEXT,
+    transaction_date TIMESTAMPTZ NOT NULL,
+    store_order_id TEXT,
+    tracking_id TEXT,
+    fulfillment_without_surcharge BOOLEAN,
+    surcharge_applied BOOLEAN,
+    invoice_amount NUMERIC(10,2),
+    wms_fuel_surcharge NUMERIC(10,2),
+    delivery_area_surcharge NUMERIC(10,2),
+    address_correction NUMERIC(10,2),
+    insurance_amount NUMERIC(10,2),
+    final_invoice_amt NUMERIC(10,2),
+    products_sold TEXT,
+    total_quantity INT,
+    ship_option_id TEXT,
+    carrier TEXT,
+    carrier_service TEXT,
+    zone_used TEXT,
+    actual_weight_oz NUMERIC(10,2),
+    dim_weight_oz NUMERIC(10,2),
+    billable_weight_oz NUMERIC(10,2),
+    length NUMERIC(10,2),
+    width NUMERIC(10,2),
+    height NUMERIC(10,2),
+    zip_code TEXT,
+    city TEXT,
+    destination_country TEXT,
+    order_insert_timestamp TIMESTAMPTZ,
+    label_generation_timestamp TIMESTAMPTZ,
+    fc_name TEXT,
+    order_category TEXT,
+    final_invoice_amt_added_50c NUMERIC(10,2),
+    last_updated TIMESTAMPTZ DEFAULT NOW(),
+    customer_id UUID REFERENCES customers(customer_id) ON DELETE SET NULL,
+    PRIMARY KEY (order_id, transaction_date)
+) PARTITION BY RANGE (transaction_date);
+
+CREATE INDEX idx_tracking_customer_id ON tracking(customer_id);
+CREATE INDEX idx_tracking_status ON tracking(transaction_status);
+CREATE INDEX idx_tracking_tracking_id ON tracking(tracking_id);
+
+CREATE INDEX idx_tracking_transaction_date_brin ON tracking USING brin (transaction_date);
+CREATE INDEX idx_tracking_order_insert_brin ON tracking USING brin (order_insert_timestamp);
+CREATE INDEX idx_tracking_label_generation_brin ON tracking USING brin (label_generation_timestamp);
+CREATE INDEX idx_tracking_last_updated_brin ON tracking USING brin (last_updated);
@@ -1,9 +1,9 @@
 # In backend/src/summarizer.py
 
-import re
 import spacy
 from typing import List, Dict
 from . import config
+from .highlighter import highlight
 
 
 # There should be a single instance of spacy class to maintain invariance.
@@ -40,29 +40,4 @@ def highlight_entities(summary_text: str, query_entities: List) -> str:
     
     """
 
-    highlighted_text = summary_text
-    entity_texts = list(set([ent['text'] for ent in query_entities if 'text' in ent]))
-
-    entity_texts.sort(key=len, reverse=True)
-
-    replacements = {}
-    for i, entity_text in enumerate(entity_texts):
-        placeholder = f"__HIGHLIGHT_{i}__"
-
-        pattern = re.compile(f"({re.escape(entity_text)})", re.IGNORECASE)
-
-        def get_replacement(match):
-            original_text = match.group(1)
-            replacements[placeholder] = f"**{original_text}**"
-            return placeholder
-
-        highlighted_text = pattern.sub(
-            get_replacement,
-            highlighted_text
-        ) 
-    
-    for placeholder, value in replacements.items():
-        highlighted_text = highlighted_text.replace(placeholder, value)
-
-    return highlighted_text
-
+    return highlight(summary_text, query_entities, style="markdown")
@@ -0,0 +1,116 @@
+# In backend/src/summary_engine.py
+
+import re
+import time
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from . import config
+
+
+# A sentence runs up to a newline or to . ! ? followed by whitespace, so
+# "12.50", "e.g.x" and "john.doe@example.com" do not split. Each character
+# is matched once: splitting is linear in the text scanned.
+SENTENCE_RE = re.compile(r"(?:[^\n.!?]|[.!?](?=\S))+[.!?]*")
+
+# Roughly spaCy's English tokenization: words (with inner - or '), and
+# each punctuation mark on its own
+TOKEN_RE = re.compile(r"\w+(?:[-']\w+)*|[^\w\s]")
+
+ORDER_ID_RE = re.compile(r"\b(?:SC|EU)\d{5}\b")
+CARRIER_RE = re.compile(r"\b(?:UPS|USPS|FedEx|DHL)\b", re.IGNORECASE)
+SHIPPING_TERMS_RE = re.compile(
+    r"\b(?:deliver\w*|ship\w*|track\w*|delay\w*|late|lost|damaged|return\w*|refund\w*|invoice\w*|charge\w*)\b",
+    re.IGNORECASE,
+)
+# Quoted replies and the headers of forwarded mails
+THREAD_NOISE_RE = re.compile(r"^(?:>|(?:From|Sent|To|Cc|Subject|Date):|On .{0,200} wrote:)", re.IGNORECASE)
+
+
+def split_sentences(text: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """
+    Lazily yields (start offset, sentence) for text[start:end], stripped,
+    empty ones skipped. Nothing past the last sentence asked for is scanned.
+    """
+    end = len(text) if end is None else min(end, len(text))
+    for match in SENTENCE_RE.finditer(text, start, end):
+        sentence = match.group().strip()
+        if sentence:
+            yield match.end() - len(match.group().lstrip()), sentence
+
+
+def count_tokens(text: str) -> int:
+    return sum(1 for _ in TOKEN_RE.finditer(text))
+
+
+def score_sentence(sentence: str, index: int, entity_texts: Iterable[str] = ()) -> float:
+    """
+    How informative a sentence is for a shipping support reply: order IDs
+    and carriers count most, then entities found by the NER model and
+    shipping terms. Quoted replies and mail headers count against it, and
+    earlier sentences win ties.
+    """
+
+    score = 3.0 * len(ORDER_ID_RE.findall(sentence))
+    score += 2.0 * len(CARRIER_RE.findall(sentence))
+    score += 2.0 * sum(1 for entity in entity_texts if entity and entity in sentence)
+    score += 1.0 * min(len(SHIPPING_TERMS_RE.findall(sentence)), 3)
+    if THREAD_NOISE_RE.match(sentence):
+        score -= 2.0
+    return score + 1.0 / (1 + index)
+
+
+def extractive_summary(text: str, token_budget: Optional[int] = None, entities: Iterable[dict] = (),
+                       time_budget_ms: Optional[float] = None, max_scan_chars: Optional[int] = None) -> str:
+    """
+    Summary of at most `token_budget` tokens (config.SUMMARY_PLACEHOLDER_TOKEN_LIMIT
+    by default) made of the most informative sentences, in their original order.
+
+    The text is read sentence by sentence and reading stops as soon as one of these holds:
+      - config.SUMMARY_CANDIDATE_FACTOR x token_budget tokens of candidates are collected,
+      - max_scan_chars characters are scanned (config.SUMMARY_MAX_SCAN_CHARS),
+      - time_budget_ms has passed (config.SUMMARY_TIME_BUDGET_MS).
+    So the cost is bounded whatever the size of the input (a long forwarded
+    thread). A text that fits the budget is returned as is; otherwise "..."
+    marks that something was left out, as get_n_tokens_summary does.
+    """
+
+    budget = config.SUMMARY_PLACEHOLDER_TOKEN_LIMIT if token_budget is None else token_budget
+    time_budget_ms = config.SUMMARY_TIME_BUDGET_MS if time_budget_ms is None else time_budget_ms
+    max_scan_chars = config.SUMMARY_MAX_SCAN_CHARS if max_scan_chars is None else max_scan_chars
+    deadline = time.perf_counter() + time_budget_ms / 1000
+    candidate_tokens = budget * config.SUMMARY_CANDIDATE_FACTOR
+    entity_texts = {entity["text"] for entity in entities if entity.get("text")}
+
+    candidates = []      # (score, index, sentence, n_tokens)
+    collected = 0
+    complete = True      # whether the whole text was read
+    for index, (_, sentence) in enumerate(split_sentences(text, 0, max_scan_chars)):
+        n_tokens = count_tokens(sentence)
+        candidates.append((score_sentence(sentence, index, entity_texts), index, sentence, n_tokens))
+        collected += n_tokens
+        if collected >= candidate_tokens or time.perf_counter() >= deadline:
+            complete = False
+            break
+    if len(text) > max_scan_chars:
+        complete = False
+
+    if complete and collected <= budget:
+        return text
+
+    chosen: List[Tuple[int, str]] = []
+    remaining = budget
+    for _, index, sentence, n_tokens in sorted(candidates, key=lambda c: (-c[0], c[1])):
+        if n_tokens <= remaining:
+            chosen.append((index, sentence))
+            remaining -= n_tokens
+        if remaining == 0:
+            break
+
+    if not chosen and candidates:
+        # every sentence is longer than the budget: cut the best one
+        _, _, sentence, _ = min(candidates, key=lambda c: (-c[0], c[1]))
+        cut = list(islice(TOKEN_RE.finditer(sentence), budget))
+        return (sentence[:cut[-1].end()] if cut else "") + "..."
+
+    return " ".join(sentence for _, sentence in sorted(chosen)).rstrip(".") + "..."
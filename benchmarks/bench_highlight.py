@@ -0,0 +1,94 @@
+# benchmarks/bench_highlight.py
+#
+# Compares the per-entity highlighters this replaced (str.replace per
+# entity; one regex per entity) with backend/src/highlighter.py, with
+# hundreds of entities on long texts. Run from the project root:
+#   python -m benchmarks.bench_highlight --entities 300 --chars 50000
+
+import argparse
+import random
+import re
+import time
+
+from backend.src.highlighter import compile_automaton, highlight
+
+
+def replace_per_entity(text, entities):
+    """The former routers/chat.py version."""
+    for entity in entities:
+        text = text.replace(entity["text"], f"<strong>{entity['text']}</strong>")
+    return text
+
+
+def regex_per_entity(summary_text, query_entities):
+    """The former summarizer.py version."""
+    highlighted_text = summary_text
+    entity_texts = sorted({ent["text"] for ent in query_entities if "text" in ent}, key=len, reverse=True)
+    replacements = {}
+    for i, entity_text in enumerate(entity_texts):
+        placeholder = f"__HIGHLIGHT_{i}__"
+        pattern = re.compile(f"({re.escape(entity_text)})", re.IGNORECASE)
+
+        def get_replacement(match):
+            replacements[placeholder] = f"**{match.group(1)}**"
+            return placeholder
+
+        highlighted_text = pattern.sub(get_replacement, highlighted_text)
+    for placeholder, value in replacements.items():
+        highlighted_text = highlighted_text.replace(placeholder, value)
+    return highlighted_text
+
+
+def make_case(n_entities: int, n_chars: int, seed: int = 0):
+    """A long text of filler words, order IDs, tracking numbers and carriers, and the entities to mark."""
+    rng = random.Random(seed)
+    entities = [f"SC{rng.randint(10000, 99999)}" for _ in range(n_entities // 2)]
+    entities += [f"1Z{rng.randint(10**9, 10**10 - 1)}" for _ in range(n_entities - len(entities) - 4)]
+    entities += ["UPS", "FedEx", "DHL", "ShipCube"]
+    words = ["the", "package", "was", "delayed", "at", "hub", "please", "check", "order", "status"]
+
+    parts, size = [], 0
+    while size < n_chars:
+        word = rng.choice(entities) if rng.random() < 0.1 else rng.choice(words)
+        parts.append(word)
+        size += len(word) + 1
+    text = " ".join(parts)
+
+    with_offsets = []
+    for match in re.finditer(r"\S+", text):
+        if match.group() in entities:
+            with_offsets.append({"text": match.group(), "start_char": match.start(), "end_char": match.end()})
+    return text, [{"text": e} for e in entities], with_offsets
+
+
+def _time(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(n_entities: int, n_chars: int, repeat: int):
+    text, entities, with_offsets = make_case(n_entities, n_chars)
+
+    results = [
+        ("str.replace per entity", _time(lambda: replace_per_entity(text, entities), repeat)),
+        ("regex per entity", _time(lambda: regex_per_entity(text, entities), repeat)),
+    ]
+    compile_automaton.cache_clear()
+    results.append(("automaton, first call", _time(lambda: highlight(text, entities, "html"), 1)))
+    results.append(("automaton, cached", _time(lambda: highlight(text, entities, "html"), repeat)))
+    results.append(("entity offsets", _time(lambda: highlight(text, with_offsets, "html"), repeat)))
+
+    print(f"entities={n_entities} chars={len(text)} occurrences={len(with_offsets)}")
+    for name, seconds in results:
+        print(f"{name:24s}: {seconds * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the entity highlighters.")
+    parser.add_argument("--entities", type=int, default=300)
+    parser.add_argument("--chars", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.entities, args.chars, args.repeat)
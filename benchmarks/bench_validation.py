@@ -0,0 +1,86 @@
+# benchmarks/bench_validation.py
+#
+# Compares the per-row Pydantic path with the columnar engine on a
+# synthetic tracking frame. Run from the project root:
+#   python -m benchmarks.bench_validation --rows 100000 --invalid 0.01
+
+import argparse
+import time
+import random
+import warnings
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from ml.validation_model import Tracking
+from etl.load_data import _validate_records
+from etl.column_validation import validate_frame
+
+
+def make_tracking_frame(rows: int, invalid_share: float = 0.0, seed: int = 0) -> pd.DataFrame:
+    """
+    Builds a renamed (target-column) tracking frame like the one
+    load_incremental_data validates, with a share of broken rows.
+    """
+
+    rng = np.random.default_rng(seed)
+    timestamps = pd.Timestamp("2024-11-01") + pd.to_timedelta(rng.integers(0, 30 * 86400, rows), unit="s")
+
+    df = pd.DataFrame({
+        "order_id": [f"ORD{i:09d}" for i in range(rows)],
+        "user_id": rng.integers(1, 5000, rows),
+        "merchant_name": rng.choice(["Dog Is Human", "ShipCube"], rows),
+        "transaction_status": rng.choice(["Delivered", "In Transit", "Label Created"], rows),
+        "transaction_date": timestamps.strftime("%Y-%m-%d %H:%M:%S"),
+        "tracking_id": [f"1Z{i:016d}" for i in range(rows)],
+        "invoice_amount": rng.uniform(3, 80, rows).round(2),
+        "final_invoice_amt": rng.uniform(3, 90, rows).round(2),
+        "total_quantity": rng.integers(1, 10, rows),
+        "carrier": rng.choice(["UPS", "USPS", "FedEx", "DHL"], rows),
+        "zone_used": rng.choice(["1", "2", "5", "8"], rows),
+        "actual_weight_oz": rng.uniform(1, 400, rows).round(2),
+        "zip_code": [f"{z:05d}" for z in rng.integers(501, 99950, rows)],
+        "order_insert_timestamp": timestamps.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    })
+
+    bad = rng.random(rows) < invalid_share
+    df.loc[bad, "transaction_date"] = "not-a-date"
+    return df
+
+
+def _rate(rows, seconds):
+    return rows / seconds if seconds else float("inf")
+
+
+def run(rows: int, invalid_share: float):
+    with open("config/schema_mapping.yml", "r") as f:
+        mapping = yaml.safe_load(f)["tracking_export"]
+
+    df = make_tracking_frame(rows, invalid_share)
+    warnings.simplefilter("ignore")
+
+    start = time.perf_counter()
+    row_valid, row_failed = _validate_records(df.to_dict("records"), Tracking)
+    row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    col_valid, col_failed = validate_frame(df, mapping, Tracking)
+    col_seconds = time.perf_counter() - start
+
+    assert len(row_valid) == len(col_valid) and len(row_failed) == len(col_failed)
+
+    print(f"rows={rows} invalid={len(col_failed)}")
+    print(f"per-row pydantic : {row_seconds:8.3f}s  {_rate(rows, row_seconds):12,.0f} rows/s")
+    print(f"columnar         : {col_seconds:8.3f}s  {_rate(rows, col_seconds):12,.0f} rows/s")
+    print(f"speedup          : {row_seconds / col_seconds:8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--invalid", type=float, default=0.01, help="share of rows with a broken date")
+    args = parser.parse_args()
+
+    random.seed(0)
+    run(args.rows, args.invalid)
@@ -0,0 +1,205 @@
+# benchmarks/synthetic.py
+#
+# Synthetic tracking / customers / rate_table files for the ETL benchmarks.
+# Run from the project root:
+#   python -m benchmarks.synthetic tracking 1m data/bench/tracking_1m.csv --invalid 0.01
+
+import argparse
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from etl.load_plan import MAPPING_PATH, SCHEMA_PATH, parse_schema_sql
+
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+BLOCK_ROWS = 100_000      # rows generated and written at a time, so 10M rows never sit in memory
+LAYOUTS = ("source", "table")
+
+_EPOCH = pd.Timestamp("2024-11-01")
+_CITIES = ["Austin", "Denver", "Columbus", "Seattle", "Miami", "Newark", "Reno", "Ontario"]
+_LOCATIONS = [f"{code}{i:02d}" for code in ("US-W", "US-C", "US-E", "US-S", "CA") for i in range(10)]
+
+
+def parse_size(size) -> int:
+    """'10k', '1m', '10m' or a plain row count."""
+    return SIZES[size.lower()] if str(size).lower() in SIZES else int(size)
+
+
+def _tracking_block(rng, start: int, n: int, invalid_share: float) -> pd.DataFrame:
+    ids = np.arange(start, start + n)
+    placed = _EPOCH + pd.to_timedelta(rng.integers(0, 30 * 86400, n), unit="s")
+    labelled = placed + pd.to_timedelta(rng.integers(600, 2 * 86400, n), unit="s")
+    invoice = rng.uniform(3, 80, n).round(2)
+    fuel = (invoice * 0.08).round(2)
+    actual = rng.uniform(1, 400, n).round(2)
+    dim = rng.uniform(1, 400, n).round(2)
+
+    df = pd.DataFrame({
+        "order_id": [f"ORD{i:010d}" for i in ids],
+        "user_id": rng.integers(1, 5000, n),
+        "merchant_name": rng.choice(["Dog Is Human", "ShipCube Demo", "Paw Supply"], n),
+        "customer_name": [f"Customer {i}" for i in rng.integers(1, 200_000, n)],
+        "transaction_status": rng.choice(["Delivered", "In Transit", "Label Created", "Exception"], n),
+        "transaction_type": rng.choice(["Shipment", "Return"], n, p=[0.95, 0.05]),
+        "invoice_number": rng.integers(100_000, 999_999, n),
+        "transaction_date": placed.strftime("%Y-%m-%d %H:%M:%S"),
+        "store_order_id": ids + 5_000_000,
+        "tracking_id": [f"1Z{i:016d}" for i in ids],
+        # numeric in schema_mapping.yml but BOOLEAN in schema.sql, left empty
+        "fulfillment_without_surcharge": None,
+        "surcharge_applied": None,
+        "invoice_amount": invoice,
+        "wms_fuel_surcharge": fuel,
+        "delivery_area_surcharge": np.where(rng.random(n) < 0.1, 3.85, 0.0),
+        "address_correction": np.where(rng.random(n) < 0.02, 17, 0),
+        "insurance_amount": np.where(rng.random(n) < 0.2, 1.5, 0.0),
+        "final_invoice_amt": (invoice + fuel).round(2),
+        "products_sold": [f"SKU-{a}x{b}" for a, b in zip(rng.integers(100, 999, n), rng.integers(1, 5, n))],
+        "total_quantity": rng.integers(1, 10, n),
+        "ship_option_id": rng.integers(1, 40, n),
+        "carrier": rng.choice(["UPS", "USPS", "FedEx", "DHL"], n),
+        "carrier_service": rng.choice(["Ground", "Priority", "2Day", "Express"], n),
+        "zone_used": [f"Zone {z}" for z in rng.integers(1, 9, n)],
+        "actual_weight_oz": actual,
+        "dim_weight_oz": dim,
+        "billable_weight_oz": np.maximum(actual, dim),
+        "length": rng.uniform(4, 30, n).round(2),
+        "width": rng.uniform(4, 20, n).round(2),
+        "height": rng.uniform(1, 16, n).round(2),
+        # ZIP+4, so the column is read as text like the model expects
+        "zip_code": [f"{z:05d}-{p:04d}" for z, p in zip(rng.integers(501, 99950, n), rng.integers(0, 9999, n))],
+        "city": rng.choice(_CITIES, n),
+        "destination_country": rng.choice(["US", "CA"], n, p=[0.9, 0.1]),
+        "order_insert_timestamp": placed.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "label_generation_timestamp": labelled.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "fc_name": rng.choice(["FC-Reno", "FC-Columbus", "FC-Dallas"], n),
+        "order_category": rng.choice(["Standard", "Subscription", "Wholesale"], n),
+        "final_invoice_amt_added_50c": (invoice + fuel + 0.5).round(2),
+        "last_updated": placed.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "customer_id": None,
+    })
+
+    bad = rng.random(n) < invalid_share
+    df.loc[bad, "transaction_date"] = "not-a-date"
+    return df
+
+
+def _customers_block(rng, start: int, n: int, invalid_share: float) -> pd.DataFrame:
+    ids = np.arange(start, start + n)
+    df = pd.DataFrame({
+        "customer_id": [str(uuid.UUID(int=int(i) + 1, version=4)) for i in ids],
+        "customer_name": [f"Customer {i}" for i in ids],
+        "contact_email": [f"customer{i}@example.com" for i in ids],
+        "account_tier": rng.choice(["visitor", "client"], n, p=[0.7, 0.3]),
+        "created_at": (_EPOCH + pd.to_timedelta(ids % (365 * 86400), unit="s")).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    })
+
+    bad = rng.random(n) < invalid_share
+    df.loc[bad, "contact_email"] = df.loc[bad, "contact_email"].str.replace("@", "-at-", regex=False)
+    return df
+
+
+def _rate_table_block(rng, start: int, n: int, invalid_share: float) -> pd.DataFrame:
+    ids = np.arange(start, start + n)
+    lanes = len(_LOCATIONS) ** 2
+    products = 40
+    # Row i maps to a distinct (origin, destination, product_id, effective_date),
+    # which idx_rate_lookup requires
+    origin = ids % len(_LOCATIONS)
+    destination = (ids // len(_LOCATIONS)) % len(_LOCATIONS)
+    product = (ids // lanes) % products
+    day = ids // (lanes * products)
+
+    df = pd.DataFrame({
+        "route_id": [str(uuid.UUID(int=int(i) + 1, version=4)) for i in ids],
+        "origin": np.asarray(_LOCATIONS)[origin],
+        "destination": np.asarray(_LOCATIONS)[destination],
+        "product_id": [f"P{p:03d}" for p in product],
+        "effective_date": (_EPOCH + pd.to_timedelta(day, unit="D")).strftime("%Y-%m-%d"),
+        "base_rate": rng.uniform(2, 60, n).round(2),
+        "surcharge_type": rng.choice(["fuel", "residential", "none"], n),
+        "surcharge_value": rng.uniform(0, 5, n).round(2),
+        "currency": rng.choice(["USD", "CAD"], n, p=[0.85, 0.15]),
+        "last_updated": (_EPOCH + pd.to_timedelta(day, unit="D")).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    })
+
+    bad = rng.random(n) < invalid_share
+    df.loc[bad, "currency"] = "US"
+    return df
+
+
+# dataset -> (schema_mapping.yml key, block generator)
+DATASETS = {
+    "tracking": ("tracking_export", _tracking_block),
+    "customers": ("customer_export", _customers_block),
+    "rate_table": ("rate_table_export", _rate_table_block),
+}
+
+
+def _layout_columns(dataset: str, layout: str):
+    """
+    (target columns to keep, header names) for a layout.
+
+    source: the mapped columns under their source names, as an export
+    would arrive for load_incremental_data.
+    table:  every column of the target table in table order, as
+    bulk_load_historical's COPY expects.
+    """
+
+    config_key, _ = DATASETS[dataset]
+    with open(MAPPING_PATH, "r") as f:
+        mapping = yaml.safe_load(f)[config_key]
+
+    if layout == "source":
+        targets = [col["target"] for col in mapping["columns"]]
+        return targets, [col["source"] for col in mapping["columns"]]
+
+    with open(SCHEMA_PATH, "r") as f:
+        columns = list(parse_schema_sql(f.read())[mapping["target_table"]]["columns"])
+    return columns, columns
+
+
+def write_dataset(dataset: str, rows: int, path: str, invalid_share: float = 0.0, layout: str = "source",
+                  seed: int = 0, block_rows: int = BLOCK_ROWS) -> str:
+    """
+    Writes `rows` synthetic rows of `dataset` to a CSV at `path`,
+    a block at a time. Roughly `invalid_share` of the rows fail validation.
+    The table layout is meant for COPY, so it never contains invalid rows.
+    """
+
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset '{dataset}'. Expected one of {sorted(DATASETS)}.")
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Expected one of {LAYOUTS}.")
+    if layout == "table":
+        invalid_share = 0.0
+
+    _, make_block = DATASETS[dataset]
+    targets, header = _layout_columns(dataset, layout)
+    rng = np.random.default_rng(seed)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for start in range(0, rows, block_rows):
+            block = make_block(rng, start, min(block_rows, rows - start), invalid_share)
+            block = block.reindex(columns=targets)
+            block.to_csv(f, index=False, header=header if start == 0 else False)
+
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic ETL source file.")
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("size", help="10k, 1m, 10m or a row count")
+    parser.add_argument("path")
+    parser.add_argument("--invalid", type=float, default=0.01, help="share of rows that fail validation")
+    parser.add_argument("--layout", choices=LAYOUTS, default="source")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_dataset(args.dataset, parse_size(args.size), args.path, args.invalid, args.layout, args.seed)
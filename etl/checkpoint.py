@@ -0,0 +1,113 @@
+# etl/checkpoint.py
+
+import datetime as dt
+import hashlib
+import json
+import logging
+import os
+
+
+CHECKPOINT_DIR = ".checkpoints"
+SAMPLE_BYTES = 1024 * 1024      # hashed from each end of the file
+
+
+def file_identity(path: str) -> dict:
+    """
+    Identifies one version of a source file: path, size, mtime and a hash
+    of its first and last SAMPLE_BYTES (hashing a multi-GB export in full
+    on every run would cost more than the resume saves).
+    """
+
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        digest.update(f.read(SAMPLE_BYTES))
+        if stat.st_size > SAMPLE_BYTES:
+            f.seek(max(stat.st_size - SAMPLE_BYTES, SAMPLE_BYTES))
+            digest.update(f.read(SAMPLE_BYTES))
+
+    return {
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sample_hash": digest.hexdigest(),
+    }
+
+
+class SourceCheckpoint:
+    """
+    Durable progress of one load of one source file.
+
+    Saved after every committed chunk with the number of source rows
+    committed so far, the job counters and the DLQ position at that point.
+    A later run of the same file (same identity and settings) resumes after
+    the last committed chunk; the file is removed once a load completes.
+    `source` may be a (path, start, end) byte range of a file split across
+    workers: each range has a checkpoint of its own.
+    """
+
+    def __init__(self, config_key: str, source, directory: str = None, settings: dict = None):
+        directory = directory or CHECKPOINT_DIR
+        self.config_key = config_key
+        if isinstance(source, tuple):
+            path, start, end = source
+            self.identity = dict(file_identity(path), byte_range=[start, end])
+            name = f"{self.identity['path']}:{start}-{end}"
+        else:
+            self.identity = file_identity(source)
+            name = self.identity["path"]
+        self.settings = settings or {}
+        key = hashlib.sha1(name.encode("utf-8")).hexdigest()[:12]
+        self.path = os.path.join(directory, f"{config_key}_{key}.json")
+        self.state = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logging.warning(f"[{self.config_key}] Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+
+        if state.get("identity") != self.identity:
+            logging.warning(f"[{self.config_key}] {self.identity['path']} changed since the checkpoint "
+                            f"was written. Starting from the beginning.")
+            return None
+        if state.get("settings") != self.settings:
+            logging.warning(f"[{self.config_key}] Load settings changed since the checkpoint "
+                            f"({state.get('settings')} -> {self.settings}). Starting from the beginning.")
+            return None
+        return state
+
+    @property
+    def rows_committed(self) -> int:
+        return self.state["rows_committed"] if self.state else 0
+
+    def save(self, rows_committed: int, chunks_committed: int, counters: dict, dlq_run_id: str, dlq_position: dict):
+        self.state = {
+            "config_key": self.config_key,
+            "identity": self.identity,
+            "settings": self.settings,
+            "rows_committed": rows_committed,
+            "chunks_committed": chunks_committed,
+            "counters": counters,
+            "dlq": {"run_id": dlq_run_id, "position": dlq_position},
+            "updated_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        }
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def complete(self):
+        self.state = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
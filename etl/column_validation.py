@@ -0,0 +1,350 @@
+# etl/column_validation.py
+
+import logging
+import datetime as dt
+import inspect
+from decimal import Decimal
+from typing import Annotated, Union, get_args, get_origin
+
+import numpy as np
+import pandas as pd
+from annotated_types import MaxLen, MinLen
+from pydantic import TypeAdapter, ValidationError
+
+
+# yml dtype -> python type the column is checked and coerced as
+DTYPE_KINDS = {
+    "int": int,
+    "str": str,
+    "numeric": Decimal,
+    "datetime": dt.datetime,
+}
+
+# [0-9], not \d: \d also matches other Unicode digits ('١٢'), which the model rejects for ints
+_INT_PATTERN = r"^\s*[+-]?[0-9]+\s*$"
+_DECIMAL_PATTERN = r"^\s*[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?\s*$"
+_DATETIME_PATTERN = r"^[0-9]{4}-[0-9]{2}-[0-9]{2}([T ][0-9]{2}:[0-9]{2}(:[0-9]{2}(\.[0-9]{1,6})?)?(Z|[+-][0-9]{2}:[0-9]{2})?)?$"
+_TZ_SUFFIX_PATTERN = r"(?:Z|[+-][0-9]{2}:[0-9]{2})$"
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and value != value) or value is pd.NaT
+
+
+def normalize_record(record: dict) -> dict:
+    """
+    Replaces pandas' missing-value markers (NaN/NaT) with None,
+    which is how an empty cell should reach the Pydantic model.
+    """
+    return {k: (None if _is_missing(v) else v) for k, v in record.items()}
+
+
+def _is_nullable(annotation) -> bool:
+    return get_origin(annotation) is Union and type(None) in get_args(annotation)
+
+
+def _unwrap_optional(annotation):
+    if get_origin(annotation) is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _field_validators(ValidatorModel):
+    """
+    Groups the model's field validators by field name.
+    """
+    validators = {}
+    for decorator in ValidatorModel.__pydantic_decorators__.field_validators.values():
+        for field_name in decorator.info.fields:
+            validators.setdefault(field_name, []).append(decorator)
+    return validators
+
+
+def _is_simple_before_validator(decorator) -> bool:
+    """
+    True for `mode="before"` validators that only take the value,
+    which can be applied to a whole column with Series.map.
+    """
+    return decorator.info.mode == "before" and len(inspect.signature(decorator.func).parameters) == 1
+
+
+def _column_kind(field_name, field, yml_dtype, validators):
+    """
+    Picks how a column is checked: one of the DTYPE_KINDS python types,
+    or None to validate the column's unique values with a TypeAdapter.
+    """
+
+    annotation = _unwrap_optional(field.annotation)
+    for meta in field.metadata:
+        if not isinstance(meta, (MinLen, MaxLen)) or annotation is not str:
+            return None
+
+    kind = DTYPE_KINDS.get(yml_dtype)
+    if kind is not None and kind is not annotation:
+        logging.warning(f"Column '{field_name}' is declared as '{yml_dtype}' in schema_mapping.yml "
+                        f"but the model expects {getattr(annotation, '__name__', annotation)}. Using the model type.")
+
+    return annotation if annotation in DTYPE_KINDS.values() else None
+
+
+def _split_object_column(values):
+    """
+    Masks for the int, float and str cells of a mixed (object) column.
+    bool is excluded from int, as the model rejects it for Decimal fields.
+    """
+    if isinstance(values.dtype, pd.StringDtype):
+        none = pd.Series(False, index=values.index)
+        return none, none, values.notna()
+    types = values.map(type)
+    return types.eq(int), types.isin([float, np.float64]), types.eq(str)
+
+
+def _str_mask(values):
+    if isinstance(values.dtype, pd.StringDtype):
+        return values.notna()
+    return values.map(lambda v: isinstance(v, str)).astype(bool)
+
+
+def _check_str(values, field):
+    is_str = _str_mask(values)
+    ok = is_str.copy()
+    reason = pd.Series("expected a string", index=values.index, dtype=object)
+
+    lengths = values.where(is_str, "").astype(str).str.len()
+    for meta in field.metadata:
+        if isinstance(meta, MinLen):
+            too_short = is_str & (lengths < meta.min_length)
+            reason[too_short] = f"shorter than {meta.min_length} characters"
+            ok &= ~too_short
+        elif isinstance(meta, MaxLen):
+            too_long = is_str & (lengths > meta.max_length)
+            reason[too_long] = f"longer than {meta.max_length} characters"
+            ok &= ~too_long
+
+    return ok, reason, values
+
+
+def _check_int(values, field):
+    reason = pd.Series("expected an integer", index=values.index, dtype=object)
+
+    if pd.api.types.is_bool_dtype(values):
+        return pd.Series(False, index=values.index), reason, values
+
+    if pd.api.types.is_integer_dtype(values):
+        return pd.Series(True, index=values.index), reason, pd.Series(values.tolist(), index=values.index, dtype=object)
+
+    if pd.api.types.is_float_dtype(values):
+        arr = values.to_numpy(dtype=float)
+        with np.errstate(invalid="ignore"):
+            ok = pd.Series(np.isfinite(arr) & (np.floor(arr) == arr) & (np.abs(arr) < 2**63), index=values.index)
+        coerced = pd.Series(np.where(ok, arr, 0).astype(np.int64).tolist(), index=values.index, dtype=object)
+        return ok, reason, coerced
+
+    is_int, is_float, is_str = _split_object_column(values)
+    as_text = values.where(is_str)
+    ok = is_int | (is_str & as_text.str.match(_INT_PATTERN, na=False).astype(bool))
+    if is_float.any():
+        floats = values[is_float].astype(float)
+        ok[floats.index] = floats.map(lambda v: v == v and abs(v) != float("inf") and v == int(v))
+
+    # Built as an object array: assigning ints into a Series with missing
+    # values would upcast them to float (1 -> 1.0)
+    coerced = np.full(len(values), None, dtype=object)
+    numbers, texts = (ok & ~is_str).to_numpy(), (ok & is_str).to_numpy()
+    coerced[numbers] = [int(v) for v in values[numbers]]
+    coerced[texts] = [int(v) for v in as_text[texts]]
+    return ok, reason, pd.Series(coerced, index=values.index, dtype=object)
+
+
+def _check_decimal(values, field):
+    reason = pd.Series("expected a finite number", index=values.index, dtype=object)
+    coerced = pd.Series(None, index=values.index, dtype=object)
+
+    if pd.api.types.is_bool_dtype(values):
+        return pd.Series(False, index=values.index), reason, coerced
+
+    if pd.api.types.is_integer_dtype(values):
+        return pd.Series(True, index=values.index), reason, pd.Series([Decimal(v) for v in values.tolist()], index=values.index, dtype=object)
+
+    if pd.api.types.is_float_dtype(values) and values.dtype.itemsize == 8:
+        ok = pd.Series(np.isfinite(values.to_numpy(dtype=float)), index=values.index)
+        # float64 -> str gives the shortest repr, which is what the model parses
+        coerced[ok] = values[ok].astype(str).map(Decimal)
+        return ok, reason, coerced
+
+    is_int, is_float, is_str = _split_object_column(values)
+    as_text = values.where(is_str)
+    ok = is_int | (is_str & as_text.str.match(_DECIMAL_PATTERN, na=False).astype(bool))
+    if is_float.any():
+        floats = values[is_float].astype(float)
+        ok[floats.index] = np.isfinite(floats.to_numpy())
+
+    coerced[ok & is_int] = values[ok & is_int].map(Decimal)
+    coerced[ok & is_float] = values[ok & is_float].map(lambda v: Decimal(repr(float(v))))
+    coerced[ok & is_str] = as_text[ok & is_str].str.strip().map(Decimal)
+    return ok, reason, coerced
+
+
+def _check_datetime(values, field):
+    reason = pd.Series("expected an ISO 8601 datetime", index=values.index, dtype=object)
+    coerced = pd.Series(None, index=values.index, dtype=object)
+
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return pd.Series(True, index=values.index), reason, pd.Series(values.dt.to_pydatetime(), index=values.index, dtype=object)
+
+    as_text = values.where(_str_mask(values))
+    ok = as_text.str.match(_DATETIME_PATTERN, na=False).astype(bool)
+    has_tz = ok & as_text.str.contains(_TZ_SUFFIX_PATTERN, na=False).astype(bool)
+
+    # Naive strings are parsed in one go. Offset-aware ones go to Pydantic
+    # (once per distinct value), which keeps each value's own offset and tzinfo type.
+    naive = ok & ~has_tz
+    if naive.any():
+        parsed = pd.to_datetime(as_text[naive], format="ISO8601", errors="coerce")
+        ok[parsed.index[parsed.isna()]] = False
+        parsed = parsed.dropna()
+        coerced[parsed.index] = list(parsed.dt.to_pydatetime())
+    if has_tz.any():
+        tz_ok, _, tz_values = _check_with_adapter(as_text[has_tz].astype(object), field)
+        ok[has_tz] = tz_ok
+        coerced[has_tz] = tz_values
+
+    return ok, reason, coerced
+
+
+def _check_with_adapter(values, field):
+    """
+    Fallback for types with no vectorized check (UUID, date, EmailStr, ...):
+    each distinct value is validated once and the result broadcast back.
+    """
+
+    adapter = TypeAdapter(Annotated[tuple([field.annotation, *field.metadata])] if field.metadata else field.annotation)
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+
+    unique_ok = np.zeros(len(uniques), dtype=bool)
+    unique_values = [None] * len(uniques)
+    unique_reasons = [None] * len(uniques)
+    for i, value in enumerate(uniques):
+        try:
+            unique_values[i] = adapter.validate_python(value)
+            unique_ok[i] = True
+        except ValidationError as e:
+            unique_reasons[i] = "; ".join(err["msg"] for err in e.errors())
+
+    present = codes >= 0
+    ok = np.zeros(len(values), dtype=bool)
+    ok[present] = unique_ok[codes[present]]
+    coerced = pd.Series([unique_values[c] if c >= 0 else None for c in codes], index=values.index, dtype=object)
+    reason = pd.Series([unique_reasons[c] if c >= 0 else None for c in codes], index=values.index, dtype=object)
+    return pd.Series(ok, index=values.index), reason, coerced
+
+
+_KIND_CHECKS = {
+    int: _check_int,
+    str: _check_str,
+    Decimal: _check_decimal,
+    dt.datetime: _check_datetime,
+}
+
+
+def check_columns(df: pd.DataFrame, mapping: dict, ValidatorModel):
+    """
+    Coerces and checks whole columns at once, using the dtype declared for
+    each column in schema_mapping.yml and the constraints of the model.
+
+    Returns (coerced, bad_rows, cell_errors):
+      - coerced: DataFrame with one python-typed column per model field
+      - bad_rows: boolean Series, True for rows that failed a column check
+      - cell_errors: {row_index: {column: reason}} for the bad rows
+    """
+
+    dtypes = {col['target']: col.get('dtype') for col in mapping.get('columns', [])}
+    validators = _field_validators(ValidatorModel)
+
+    coerced = {}
+    bad_rows = pd.Series(False, index=df.index)
+    cell_errors = {}
+
+    def flag(mask, column, reasons):
+        for idx in mask[mask].index:
+            cell_errors.setdefault(idx, {})[column] = reasons[idx]
+
+    for name, field in ValidatorModel.model_fields.items():
+        if name not in df.columns:
+            if field.is_required():
+                bad_rows[:] = True
+                flag(pd.Series(True, index=df.index), name, pd.Series("missing required column", index=df.index))
+            elif field.default_factory is not None:
+                factory = field.default_factory
+                coerced[name] = [factory() for _ in range(len(df))]
+            else:
+                coerced[name] = [field.default] * len(df)
+            continue
+
+        values = df[name]
+        field_validators = validators.get(name, [])
+        if not all(_is_simple_before_validator(d) for d in field_validators):
+            # Only the model itself can run this validator
+            bad_rows[:] = True
+            flag(pd.Series(True, index=df.index), name, pd.Series("checked by the model", index=df.index))
+            coerced[name] = values.tolist()
+            continue
+
+        for decorator in field_validators:
+            values = values.map(decorator.func)
+
+        missing = values.isna()
+        kind = _column_kind(name, field, dtypes.get(name), validators)
+        check = _KIND_CHECKS.get(kind, _check_with_adapter)
+        ok, reasons, column = check(values.where(~missing), field)
+
+        if not _is_nullable(field.annotation):
+            reasons = reasons.where(~missing, "missing required value")
+            ok = ok & ~missing
+        else:
+            ok = ok | missing
+            column = column.where(~missing, None)
+
+        bad = ~ok
+        if bad.any():
+            bad_rows |= bad
+            flag(bad, name, reasons)
+
+        coerced[name] = column.tolist()
+
+    return pd.DataFrame(coerced, index=df.index, dtype=object), bad_rows, cell_errors
+
+
+def validate_frame(df: pd.DataFrame, mapping: dict, ValidatorModel):
+    """
+    Columnar replacement for validating each row with ValidatorModel(**record).
+
+    Rows that pass the column checks are emitted directly. Only the bad rows
+    go through the Pydantic model, which produces the detailed error message
+    (or accepts the row if the column check was stricter than the model).
+
+    Returns (valid_records, failed_records) in the same shape as the
+    per-row path in etl/load_data.py.
+    """
+
+    coerced, bad_rows, cell_errors = check_columns(df, mapping, ValidatorModel)
+
+    fields = list(ValidatorModel.model_fields)
+    clean = coerced.loc[~bad_rows, fields]
+    results = dict(zip(clean.index, (dict(zip(fields, row)) for row in clean.itertuples(index=False, name=None))))
+
+    failed_records = []
+    if bad_rows.any():
+        suspect = df.loc[bad_rows].astype(object).to_dict('index')
+        for idx, record in suspect.items():
+            record = normalize_record(record)
+            try:
+                results[idx] = ValidatorModel(**record).dict()
+            except ValidationError as e:
+                logging.warning(f"Validation failed for row: {record}. Column checks: {cell_errors.get(idx)}. Error: {e}")
+                failed_records.append({"original_data": record, "validation_error": str(e)})
+
+    valid_records = [results[idx] for idx in df.index if idx in results]
+    return valid_records, failed_records
@@ -0,0 +1,197 @@
+# etl/dlq.py
+
+import csv
+import datetime as dt
+import json
+import logging
+import os
+import time
+
+
+DLQ_FORMATS = ("csv", "jsonl", "parquet")
+DLQ_FIELDNAMES = ["original_data", "validation_error"]
+
+DEFAULT_BATCH_SIZE = 1000              # rows buffered before a write
+DEFAULT_FLUSH_INTERVAL = 5.0           # seconds a row may wait in the buffer
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024  # rotate after this file size
+DEFAULT_MAX_AGE = 3600.0               # rotate after this many seconds
+
+
+class DeadLetterQueue:
+    """
+    Buffered writer for rows that failed validation.
+
+    One file handle is kept open per job; rows are written in batches and
+    the file is rotated once it grows past max_bytes or gets older than
+    max_age seconds. Files are named
+    {config_key}_failures_{run_id}_{part}.{csv|jsonl|parquet} and are only
+    created once the first failure arrives.
+    """
+
+    def __init__(self, config_key: str, directory: str = ".", fmt: str = "csv",
+                 batch_size: int = DEFAULT_BATCH_SIZE, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_age: float = DEFAULT_MAX_AGE, run_id: str = None):
+
+        if fmt not in DLQ_FORMATS:
+            raise ValueError(f"Unknown DLQ format '{fmt}'. Expected one of {DLQ_FORMATS}.")
+
+        self.config_key = config_key
+        self.directory = directory
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.run_id = run_id or f"{dt.datetime.now(dt.timezone.utc):%Y%m%dT%H%M%S}_{os.getpid()}"
+
+        self.count = 0
+        self.files = []
+
+        self._buffer = []
+        self._handle = None
+        self._writer = None
+        self._part = 0
+        self._opened_at = None
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, failed_row_data: dict):
+        """
+        Buffers one failed row ({"original_data": ..., "validation_error": ...}).
+        """
+        self._buffer.append(failed_row_data)
+        self.count += 1
+
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def write_many(self, failed_records):
+        for failed_row_data in failed_records:
+            self.write(failed_row_data)
+
+    def flush(self):
+        """
+        Writes the buffered rows to the current file, rotating it first if needed.
+        """
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        try:
+            if self._should_rotate():
+                self._close_file()
+            if self._writer is None:
+                self._open_file()
+
+            self._write_batch(self._buffer)
+        except (IOError, OSError) as dlq_e:
+            logging.error(f"FATAL: Could not write to DLQ file for {self.config_key}. Error: {dlq_e}")
+        finally:
+            self._buffer = []
+
+    def close(self):
+        self.flush()
+        self._close_file()
+
+    def summary(self) -> dict:
+        return {"failed": self.count, "dlq_files": list(self.files)}
+
+    def mark(self) -> dict:
+        """
+        Flushes and returns the current position, for a checkpoint to
+        resume from (see resume). A parquet file cannot be cut back, so
+        with that format each mark closes the current part.
+        """
+        self.flush()
+        position = {"count": self.count, "files": list(self.files), "part": self._part, "size": None}
+        if self.fmt == "parquet":
+            self._close_file()
+        elif self._handle is not None:
+            position["size"] = self._handle.tell()
+        return position
+
+    def resume(self, position: dict):
+        """
+        Continues a run (same run_id) from a position returned by mark():
+        rows written after it are dropped and new rows go to the next part.
+        """
+        prefix = f"{self.config_key}_failures_{self.run_id}_"
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if not name.startswith(prefix):
+                    continue
+                part = name[len(prefix):].split(".", 1)[0]
+                if part.isdigit() and int(part) > position["part"]:
+                    os.remove(os.path.join(self.directory, name))
+
+        if position["size"] is not None and position["files"] and os.path.exists(position["files"][-1]):
+            with open(position["files"][-1], "r+b") as f:
+                f.truncate(position["size"])
+
+        self._close_file()
+        self.count = position["count"]
+        self.files = list(position["files"])
+        self._part = position["part"]
+
+    # --- file handling ---
+
+    def _should_rotate(self) -> bool:
+        if self._writer is None:
+            return False
+        if time.monotonic() - self._opened_at >= self.max_age:
+            return True
+        return os.path.getsize(self.files[-1]) >= self.max_bytes
+
+    def _open_file(self):
+        self._part += 1
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(
+            self.directory,
+            f"{self.config_key}_failures_{self.run_id}_{self._part:04d}.{self.fmt}"
+        )
+
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            schema = pa.schema([(name, pa.string()) for name in DLQ_FIELDNAMES])
+            self._writer = pq.ParquetWriter(path, schema)
+        else:
+            self._handle = open(path, "a", newline="", encoding="utf-8")
+            if self.fmt == "csv":
+                self._writer = csv.DictWriter(self._handle, fieldnames=DLQ_FIELDNAMES)
+                if self._handle.tell() == 0:
+                    self._writer.writeheader()
+            else:
+                self._writer = self._handle
+
+        self._opened_at = time.monotonic()
+        self.files.append(path)
+
+    def _write_batch(self, rows):
+        if self.fmt == "csv":
+            self._writer.writerows(rows)
+            self._handle.flush()
+        elif self.fmt == "jsonl":
+            self._handle.write("".join(json.dumps(row, default=str) + "\n" for row in rows))
+            self._handle.flush()
+        else:
+            import pyarrow as pa
+
+            self._writer.write_table(pa.table({
+                "original_data": [json.dumps(row["original_data"], default=str) for row in rows],
+                "validation_error": [row["validation_error"] for row in rows],
+            }))
+
+    def _close_file(self):
+        if self.fmt == "parquet" and self._writer is not None:
+            self._writer.close()
+        if self._handle is not None:
+            self._handle.close()
+        self._handle = None
+        self._writer = None
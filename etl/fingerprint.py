@@ -0,0 +1,154 @@
+# etl/fingerprint.py
+
+import datetime as dt
+import hashlib
+import logging
+import os
+import sqlite3
+from decimal import Decimal
+
+from sqlalchemy import text
+
+
+FINGERPRINT_DIR = ".fingerprints"
+FINGERPRINT_TABLE = "etl_row_fingerprints"
+CHANGE_DETECTION_MODES = ("sidecar", "database")
+
+# Columns that change on every run without the row itself changing
+VOLATILE_COLUMNS = ("last_updated", "created_at")
+
+
+def _canonical(value) -> str:
+    if value is None:
+        return "\x00"
+    if isinstance(value, Decimal):
+        return str(value.normalize()) if value else "0"
+    if isinstance(value, dt.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(dt.timezone.utc)
+        return value.isoformat()
+    return str(value)
+
+
+def row_fingerprint(record: dict, exclude=VOLATILE_COLUMNS) -> bytes:
+    """
+    Hash of the canonical validated form of a row: columns in sorted order,
+    Decimals normalized (1.50 == 1.5), aware datetimes in UTC.
+    """
+    canonical = "\x1f".join(
+        f"{key}={_canonical(record[key])}" for key in sorted(record) if key not in exclude
+    )
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).digest()
+
+
+class SidecarFingerprintIndex:
+    """
+    Fingerprints kept in a local SQLite file next to the job,
+    one file per target table.
+    """
+
+    def __init__(self, table_name: str, directory: str = None):
+        directory = directory or FINGERPRINT_DIR
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{table_name}.sqlite")
+        self._conn = sqlite3.connect(self.path, timeout=60)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS fingerprints (pk TEXT PRIMARY KEY, digest BLOB NOT NULL)")
+
+    def lookup(self, pks) -> dict:
+        found = {}
+        pks = list(pks)
+        for i in range(0, len(pks), 900):    # stay under SQLite's bound-variable limit
+            batch = pks[i:i + 900]
+            placeholders = ",".join("?" * len(batch))
+            found.update(self._conn.execute(
+                f"SELECT pk, digest FROM fingerprints WHERE pk IN ({placeholders})", batch
+            ))
+        return found
+
+    def update(self, fingerprints: dict):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO fingerprints (pk, digest) VALUES (?, ?) "
+                "ON CONFLICT(pk) DO UPDATE SET digest = excluded.digest",
+                fingerprints.items()
+            )
+
+    def close(self):
+        self._conn.close()
+
+
+class DatabaseFingerprintIndex:
+    """
+    Fingerprints kept in Postgres, in one shared etl_row_fingerprints table.
+    """
+
+    def __init__(self, table_name: str, engine):
+        self.table_name = table_name
+        self.engine = engine
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {FINGERPRINT_TABLE} ("
+                "table_name TEXT NOT NULL, pk TEXT NOT NULL, digest BYTEA NOT NULL, "
+                "PRIMARY KEY (table_name, pk))"
+            ))
+
+    def lookup(self, pks) -> dict:
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text(f"SELECT pk, digest FROM {FINGERPRINT_TABLE} WHERE table_name = :t AND pk = ANY(:pks)"),
+                {"t": self.table_name, "pks": list(pks)}
+            )
+            return {pk: bytes(digest) for pk, digest in rows}
+
+    def update(self, fingerprints: dict):
+        if not fingerprints:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(f"INSERT INTO {FINGERPRINT_TABLE} (table_name, pk, digest) VALUES (:t, :pk, :digest) "
+                     "ON CONFLICT (table_name, pk) DO UPDATE SET digest = EXCLUDED.digest"),
+                [{"t": self.table_name, "pk": pk, "digest": digest} for pk, digest in fingerprints.items()]
+            )
+
+    def close(self):
+        pass
+
+
+def open_fingerprint_index(mode: str, table_name: str, engine):
+    if mode == "sidecar":
+        return SidecarFingerprintIndex(table_name)
+    if mode == "database":
+        return DatabaseFingerprintIndex(table_name, engine)
+    raise ValueError(f"Unknown change_detection '{mode}'. Expected one of {CHANGE_DETECTION_MODES}.")
+
+
+def filter_changed(records, pk_column: str, index):
+    """
+    Drops records whose fingerprint matches the index.
+
+    Returns (changed_records, fingerprints, counts), where fingerprints
+    maps pk -> digest for the changed records (to be stored once they are
+    committed) and counts has inserted / updated / skipped, relative to
+    what the index has seen before.
+    """
+
+    latest = {}
+    for record in records:
+        latest[str(record[pk_column])] = record     # a repeated key: the last row wins
+
+    known = index.lookup(latest.keys())
+    changed, fingerprints = [], {}
+    counts = {"inserted": 0, "updated": 0, "skipped": len(records) - len(latest)}
+
+    for pk, record in latest.items():
+        digest = row_fingerprint(record)
+        previous = known.get(pk)
+        if previous == digest:
+            counts["skipped"] += 1
+            continue
+        counts["updated" if previous is not None else "inserted"] += 1
+        changed.append(record)
+        fingerprints[pk] = digest
+
+    logging.debug(f"Change detection: {counts}")
+    return changed, fingerprints, counts
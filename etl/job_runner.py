@@ -0,0 +1,193 @@
+# etl/job_runner.py
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from sqlalchemy import create_engine
+
+from etl.load_data import config, load_incremental_data
+from etl.readers import get_source_reader, read_csv_source
+from etl.utils import split_byte_ranges
+from etl.metrics import merge_reports, write_run_report, write_prometheus_textfile
+
+
+WORKER_POOL_SIZE = 2      # connections per worker engine
+
+_WORKER_ENGINE = None     # one engine (and connection pool) per worker process
+
+
+def _init_worker(db_conn_string: str):
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = create_engine(db_conn_string, pool_size=WORKER_POOL_SIZE, max_overflow=0)
+
+
+def _run_job_partition(config_key: str, source, load_kwargs: dict):
+    """
+    Worker entry point. `source` is a CSV path, or (path, start, end)
+    for one partition of a large file, which load_incremental_data reads
+    (and checkpoints) as a byte range.
+    """
+
+    started = time.perf_counter()
+    result = load_incremental_data(source, config_key, _WORKER_ENGINE, **load_kwargs)
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def build_job_graph(jobs: dict, mapping_config: dict = None) -> dict:
+    """
+    Reads `depends_on` for each job from schema_mapping.yml.
+    Dependencies that are not part of this run are assumed to be loaded.
+    Returns {config_key: set(dependencies)}.
+    """
+
+    mapping_config = config if mapping_config is None else mapping_config
+    graph = {}
+    for config_key in jobs:
+        depends_on = set(mapping_config.get(config_key, {}).get("depends_on", []))
+        skipped = depends_on - set(jobs)
+        if skipped:
+            logging.info(f"[{config_key}] Dependencies not in this run, assumed loaded: {sorted(skipped)}")
+        graph[config_key] = depends_on & set(jobs)
+
+    # Reject cycles before anything runs
+    remaining = {k: set(v) for k, v in graph.items()}
+    while remaining:
+        ready = [k for k, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Job dependencies in schema_mapping.yml form a cycle: {sorted(remaining)}")
+        for k in ready:
+            del remaining[k]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+    return graph
+
+
+def _merge_results(config_key: str, results) -> dict:
+    counters = ("rows_read", "valid", "failed", "upserted", "inserted", "updated", "skipped")
+    merged = {"config_key": config_key, "partitions": len(results), "dlq_files": [], "errors": []}
+    merged.update({key: 0 for key in counters})
+    for result in results:
+        for key in counters:
+            merged[key] += result.get(key, 0)
+        merged["dlq_files"].extend(result["dlq_files"])
+        if result["error"]:
+            merged["errors"].append(result["error"])
+    reports = [result["metrics"] for result in results if result.get("metrics")]
+    if reports:
+        merged["metrics"] = merge_reports(config_key, reports)
+    return merged
+
+
+def run_jobs(jobs: dict, db_conn_string: str, max_workers: int = None, partitions: dict = None,
+             executor_class=ProcessPoolExecutor, mapping_config: dict = None, report_path: str = None,
+             metrics_path: str = None, **load_kwargs) -> dict:
+    """
+    Runs load_incremental_data for each {config_key: csv_path} job in a
+    process pool. A job starts as soon as the jobs it depends_on have
+    succeeded; independent jobs run at the same time. A job whose
+    source file is split into partitions runs one task per byte range.
+
+    Returns a run summary with wall-clock and per-job timings. The per-stage
+    run report is written as JSON to report_path and as Prometheus text
+    metrics to metrics_path, when given.
+    """
+
+    mapping_config = config if mapping_config is None else mapping_config
+    partitions = partitions or {}
+
+    unknown = [k for k in jobs if k not in mapping_config]
+    for config_key in unknown:
+        logging.warning(f"Skipping job: '{config_key}' not found in schema_mapping.yml")
+    jobs = {k: v for k, v in jobs.items() if k not in unknown}
+
+    graph = build_job_graph(jobs, mapping_config)
+    summary = {"jobs": {}, "wall_clock_seconds": 0.0}
+    run_started = time.perf_counter()
+
+    done, failed = set(), set()
+    running = {}          # future -> config_key
+    open_tasks = {}       # config_key -> remaining partition count
+    job_results = {}      # config_key -> [partition results]
+    job_started = {}
+
+    with executor_class(max_workers=max_workers, initializer=_init_worker, initargs=(db_conn_string,)) as executor:
+
+        def submit_ready():
+            for config_key, depends_on in graph.items():
+                if config_key in job_started or config_key in failed:
+                    continue
+                if depends_on & failed:
+                    failed.add(config_key)
+                    summary["jobs"][config_key] = {"config_key": config_key, "status": "skipped",
+                                                   "reason": f"dependency failed: {sorted(depends_on & failed)}"}
+                    logging.error(f"[{config_key}] Skipped because a dependency failed.")
+                    continue
+                if not depends_on <= done:
+                    continue
+
+                csv_path = jobs[config_key]
+                n = partitions.get(config_key, mapping_config[config_key].get("partitions", 1))
+                sources = [csv_path]
+                if n > 1 and isinstance(csv_path, str) and os.path.exists(csv_path):
+                    # Only CSV can be cut at line boundaries; an xlsx is a zip container
+                    if get_source_reader(csv_path, mapping_config[config_key]) is read_csv_source:
+                        _, ranges = split_byte_ranges(csv_path, n)
+                        sources = [(csv_path, start, end) for start, end in ranges] or [csv_path]
+                    else:
+                        logging.warning(f"[{config_key}] {csv_path} is not a CSV source; "
+                                        f"loading it as one job instead of {n} partitions.")
+
+                logging.info(f"--- Starting job: {config_key} ({len(sources)} partition(s)) ---")
+                job_started[config_key] = time.perf_counter()
+                job_results[config_key] = []
+                open_tasks[config_key] = len(sources)
+                for source in sources:
+                    running[executor.submit(_run_job_partition, config_key, source, load_kwargs)] = config_key
+
+        submit_ready()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                config_key = running.pop(future)
+                try:
+                    job_results[config_key].append(future.result())
+                except Exception as e:
+                    logging.error(f"[{config_key}] Worker crashed: {e}")
+                    job_results[config_key].append({"rows_read": 0, "valid": 0, "failed": 0, "upserted": 0,
+                                                    "dlq_files": [], "error": str(e)})
+
+                open_tasks[config_key] -= 1
+                if open_tasks[config_key] == 0:
+                    job = _merge_results(config_key, job_results[config_key])
+                    job["seconds"] = time.perf_counter() - job_started[config_key]
+                    job["status"] = "failed" if job["errors"] else "ok"
+                    summary["jobs"][config_key] = job
+                    (failed if job["errors"] else done).add(config_key)
+                    logging.info(f"--- Finished job: {config_key} ({job['status']}) in {job['seconds']:.2f}s ---")
+
+            submit_ready()
+
+    summary["wall_clock_seconds"] = time.perf_counter() - run_started
+    log_run_summary(summary)
+
+    reports = [dict(job["metrics"], status=job["status"]) for job in summary["jobs"].values() if "metrics" in job]
+    if report_path:
+        write_run_report(report_path, reports, wall_clock_seconds=summary["wall_clock_seconds"])
+    if metrics_path:
+        write_prometheus_textfile(metrics_path, reports)
+    return summary
+
+
+def log_run_summary(summary: dict):
+    logging.info(f"Run finished in {summary['wall_clock_seconds']:.2f}s")
+    for config_key, job in summary["jobs"].items():
+        if job["status"] == "skipped":
+            logging.info(f"  {config_key:<20} skipped ({job['reason']})")
+            continue
+        logging.info(f"  {config_key:<20} {job['status']:<7} {job['seconds']:8.2f}s  "
+                     f"partitions={job['partitions']} read={job['rows_read']} "
+                     f"upserted={job['upserted']} failed={job['failed']}")
@@ -0,0 +1,296 @@
+# etl/load_plan.py
+
+import hashlib
+import json
+import logging
+import os
+import re
+from decimal import Decimal
+
+import yaml
+from sqlalchemy import Table, Column, MetaData
+from sqlalchemy.dialects.postgresql.base import ischema_names
+
+from etl.utils import get_validator_model
+
+
+MAPPING_PATH = "config/schema_mapping.yml"
+SCHEMA_PATH = "backend/src/ingest_pipeline/schema.sql"
+PLAN_CACHE_DIR = ".load_plans"
+PLAN_VERSION = 3          # part of the cache key: bump when the plan layout changes
+
+# yml dtype -> SQL base types a value of that dtype can be inserted into
+COMPATIBLE_SQL_TYPES = {
+    "int": {"integer", "bigint", "smallint", "numeric", "real", "double precision", "text", "character varying", "character"},
+    "numeric": {"numeric", "real", "double precision", "integer", "bigint", "smallint", "text", "character varying"},
+    "bool": {"boolean", "text", "character varying"},
+    "datetime": {"timestamp with time zone", "timestamp without time zone", "date", "text"},
+    "date": {"date", "timestamp with time zone", "timestamp without time zone", "text"},
+    "uuid": {"uuid", "text", "character varying"},
+    "str": None,          # sent as untyped literals, Postgres coerces them to any column type
+    "category": None,
+}
+
+_TYPE_ALIASES = {
+    "int": "integer",
+    "int4": "integer",
+    "int8": "bigint",
+    "varchar": "character varying",
+    "char": "character",
+    "timestamptz": "timestamp with time zone",
+    "timestamp": "timestamp without time zone",
+    "bool": "boolean",
+    "float8": "double precision",
+}
+
+# (yml dtype, SQL base type) -> converter the validated values go through
+# before the upsert, where the driver cannot send them as they are
+# (e.g. a 0/1 flag the model validates as a number, into a BOOLEAN column)
+COLUMN_CONVERTERS = {
+    ("bool", "boolean"): "bool",
+}
+
+_COLUMN_STOP_WORDS = {"PRIMARY", "NOT", "NULL", "DEFAULT", "REFERENCES", "CHECK", "UNIQUE", "CONSTRAINT", "GENERATED"}
+_TABLE_CONSTRAINTS = ("CONSTRAINT", "PRIMARY", "UNIQUE", "CHECK", "FOREIGN", "EXCLUDE")
+
+_PLAN_CACHE = {}
+
+
+def _split_top_level(body: str):
+    """Splits a CREATE TABLE body on commas that are not inside parentheses."""
+    parts, depth, current = [], 0, []
+    for ch in body:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _base_type(type_sql: str) -> str:
+    base = re.sub(r"\(.*?\)", "", type_sql).strip().lower()
+    return _TYPE_ALIASES.get(base, base)
+
+
+def parse_schema_sql(schema_sql: str) -> dict:
+    """
+    Reads the CREATE TABLE statements of schema.sql.
+    Returns {table: {"columns": {name: base SQL type}, "primary_key": name}}.
+    """
+
+    schema_sql = re.sub(r"--[^\n]*", "", schema_sql)
+    tables = {}
+
+    for match in re.finditer(r"CREATE TABLE\s+(?:IF NOT EXISTS\s+)?(\w+)\s*\((.*?)\)\s*;", schema_sql, re.S | re.I):
+        table_name, body = match.group(1), match.group(2)
+        columns, primary_key = {}, None
+
+        for definition in _split_top_level(body):
+            words = definition.split()
+            if not words or words[0].upper() in _TABLE_CONSTRAINTS:
+                pk = re.match(r"PRIMARY KEY\s*\((\w+)\)", definition, re.I)
+                if pk:
+                    primary_key = pk.group(1)
+                continue
+
+            type_words = []
+            for word in words[1:]:
+                if word.upper() in _COLUMN_STOP_WORDS:
+                    break
+                type_words.append(word)
+
+            columns[words[0]] = _base_type(" ".join(type_words))
+            if re.search(r"\bPRIMARY KEY\b", definition, re.I):
+                primary_key = words[0]
+
+        tables[table_name] = {"columns": columns, "primary_key": primary_key}
+
+    return tables
+
+
+def _to_bool(value):
+    """A 0/1 flag (int, Decimal or float) or a bool as a bool. Any other value is an error."""
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float, Decimal)) and value in (0, 1):
+        return value == 1
+    raise ValueError(f"expected 0 or 1, got {value!r}")
+
+
+# converter name (as stored in a plan) -> function of one value
+CONVERTERS = {
+    "bool": _to_bool,
+}
+
+
+def apply_converters(records, converters: dict):
+    """
+    Runs the plan's per-column converters ({column: converter name}) over
+    the records. Returns the converted records and DLQ entries for the
+    records a converter rejected.
+    """
+
+    functions = {column: CONVERTERS[name] for column, name in converters.items()}
+    converted, failed = [], []
+    for record in records:
+        try:
+            converted.append({**record, **{column: convert(record[column])
+                                           for column, convert in functions.items() if column in record}})
+        except ValueError as e:
+            failed.append({"original_data": record, "validation_error": str(e)})
+    return converted, failed
+
+
+def _model_field_names(model_key: str):
+    return list(get_validator_model(model_key).model_fields)
+
+
+def compile_load_plan(config_key: str, mapping: dict, tables: dict) -> dict:
+    """
+    Turns one schema_mapping.yml entry into a precomputed load plan and
+    lists every way the mapping and the target table disagree.
+    The conflict target is not part of the plan: on a partitioned table it
+    includes the partition column, which the load looks up at run time.
+    """
+
+    problems = []
+    target_table = mapping.get("target_table")
+    pk_column = mapping.get("primary_key")
+    model_key = mapping.get("model_key")
+    table = tables.get(target_table)
+
+    if table is None:
+        problems.append(f"target table '{target_table}' is not defined in schema.sql")
+        table = {"columns": {}, "primary_key": None}
+
+    model_fields = []
+    try:
+        model_fields = _model_field_names(model_key)
+    except ValueError as e:
+        problems.append(str(e))
+
+    column_types = table["columns"]
+    rename_map = {col["source"]: col["target"] for col in mapping.get("columns", [])}
+    dtypes = {col["target"]: col.get("dtype") for col in mapping.get("columns", [])}
+    converters = {}
+
+    if column_types:
+        if pk_column != table["primary_key"]:
+            problems.append(f"primary_key '{pk_column}' is not the primary key of '{target_table}' "
+                            f"({table['primary_key']})")
+
+        for target, dtype in dtypes.items():
+            sql_type = column_types.get(target)
+            if sql_type is None:
+                problems.append(f"column '{target}' does not exist in '{target_table}'")
+                continue
+            compatible = COMPATIBLE_SQL_TYPES.get(dtype)
+            if compatible is not None and sql_type not in compatible:
+                problems.append(f"column '{target}' is '{dtype}' in the mapping but {sql_type} in '{target_table}'")
+            elif (dtype, sql_type) in COLUMN_CONVERTERS:
+                converters[target] = COLUMN_CONVERTERS[(dtype, sql_type)]
+
+        for field in model_fields:
+            if field not in column_types:
+                problems.append(f"model field '{field}' has no column in '{target_table}'")
+
+    insert_columns = [c for c in column_types if c in model_fields]
+
+    return {
+        "config_key": config_key,
+        "model_key": model_key,
+        "target_table": target_table,
+        "primary_key": pk_column,
+        "source_columns": list(rename_map),
+        "rename_map": rename_map,
+        "column_order": list(rename_map.values()),
+        "dtypes": dtypes,
+        "target_column_types": column_types,
+        "insert_columns": insert_columns,
+        "converters": converters,
+        "problems": problems,
+    }
+
+
+def _source_hash(mapping_bytes: bytes, schema_bytes: bytes) -> str:
+    digest = hashlib.sha256()
+    digest.update(str(PLAN_VERSION).encode())
+    digest.update(b"\0")
+    digest.update(mapping_bytes)
+    digest.update(b"\0")
+    digest.update(schema_bytes)
+    return digest.hexdigest()[:16]
+
+
+def load_plans(mapping_path: str = MAPPING_PATH, schema_path: str = SCHEMA_PATH,
+               cache_dir: str = PLAN_CACHE_DIR) -> dict:
+    """
+    Returns {"config": parsed yml, "plans": {config_key: plan}}.
+
+    The result is cached on disk under a hash of schema_mapping.yml and
+    schema.sql, so a run only parses YAML and SQL when either file changed.
+    """
+
+    with open(mapping_path, "rb") as f:
+        mapping_bytes = f.read()
+    with open(schema_path, "rb") as f:
+        schema_bytes = f.read()
+
+    key = _source_hash(mapping_bytes, schema_bytes)
+    if key in _PLAN_CACHE:
+        return _PLAN_CACHE[key]
+
+    cache_path = os.path.join(cache_dir, f"plans-{key}.json")
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            compiled = json.load(f)
+    except (FileNotFoundError, ValueError):
+        mapping_config = yaml.safe_load(mapping_bytes) or {}
+        tables = parse_schema_sql(schema_bytes.decode("utf-8"))
+        compiled = {
+            "config": mapping_config,
+            "plans": {k: compile_load_plan(k, m, tables) for k, m in mapping_config.items()},
+        }
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(compiled, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logging.warning(f"Could not write load plan cache {cache_path}: {e}")
+
+        for config_key, plan in compiled["plans"].items():
+            for problem in plan["problems"]:
+                logging.warning(f"[{config_key}] Mapping does not match the table: {problem}")
+
+    _PLAN_CACHE[key] = compiled
+    return compiled
+
+
+def get_load_plan(config_key: str, **kwargs) -> dict:
+    plans = load_plans(**kwargs)["plans"]
+    if config_key not in plans:
+        raise KeyError(config_key)
+    return plans[config_key]
+
+
+def plan_table(plan: dict) -> Table:
+    """
+    Builds the SQLAlchemy Table from the plan's column types,
+    without reflecting the database.
+    """
+
+    columns = []
+    for name, sql_type in plan["target_column_types"].items():
+        type_class = ischema_names.get(sql_type)
+        columns.append(Column(name, type_class() if type_class else None,
+                              primary_key=(name == plan["primary_key"])))
+    return Table(plan["target_table"], MetaData(), *columns)
@@ -0,0 +1,208 @@
+# etl/metrics.py
+
+import datetime as dt
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+METRIC_PREFIX = "shipcube_etl"
+
+# Stages recorded by the loaders, in pipeline order
+STAGES = ("read", "rename", "validate", "convert", "dlq", "fingerprint", "reflect", "serialize", "partition", "upsert", "copy", "wait_commit")
+
+
+def peak_rss_bytes() -> int:
+    """High-water mark of this process's resident memory."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024     # kilobytes on Linux
+
+
+class LoadMetrics:
+    """
+    Stage timings and row/byte counters for one load, in total and per chunk.
+
+    Cheap enough to leave on: a perf_counter() pair per stage per chunk,
+    plus one getrusage() call per chunk. Safe to record from the commit
+    thread while the main thread reads the next chunk.
+    """
+
+    def __init__(self, config_key: str, source=None):
+        self.config_key = config_key
+        self.source = str(source) if isinstance(source, (str, os.PathLike)) else None
+        self.started_at = dt.datetime.now(dt.timezone.utc)
+        self._started = time.perf_counter()
+        self.seconds = None
+        self.stages = {}
+        self.counters = {"rows_read": 0, "valid": 0, "failed": 0, "upserted": 0, "bytes_read": 0}
+        self.chunks = {}
+        self._lock = threading.Lock()
+
+    def _chunk(self, chunk: int) -> dict:
+        if chunk not in self.chunks:
+            self.chunks[chunk] = {"chunk": chunk, "stages": {}, "rows_read": 0, "valid": 0, "failed": 0,
+                                  "upserted": 0, "bytes_read": 0, "peak_rss_bytes": None}
+        return self.chunks[chunk]
+
+    def add(self, stage: str, seconds: float, chunk: int = None):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+            if chunk is not None:
+                stages = self._chunk(chunk)["stages"]
+                stages[stage] = stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, stage: str, chunk: int = None):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started, chunk)
+
+    def timed(self, iterable, stage: str = "read"):
+        """Iterates `iterable`, recording the time of each next() as `stage` of that chunk."""
+        iterator = iter(iterable)
+        chunk = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(stage, time.perf_counter() - started)
+                return
+            chunk += 1
+            self.add(stage, time.perf_counter() - started, chunk)
+            yield item
+
+    def count(self, chunk: int = None, **counts):
+        """Adds row counts (rows_read, valid, failed, upserted) to the totals and to the chunk."""
+        with self._lock:
+            for key, value in counts.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+                if chunk is not None:
+                    record = self._chunk(chunk)
+                    record[key] = record.get(key, 0) + value
+
+    def bytes_position(self, position, chunk: int = None):
+        """Records how far into the source the reader has got, in bytes."""
+        if position is None:
+            return
+        self.count(chunk, bytes_read=max(position - self.counters["bytes_read"], 0))
+
+    def end_chunk(self, chunk: int):
+        with self._lock:
+            self._chunk(chunk)["peak_rss_bytes"] = peak_rss_bytes()
+
+    def finish(self):
+        if self.seconds is None:
+            self.seconds = time.perf_counter() - self._started
+        return self
+
+    def report(self) -> dict:
+        """JSON-serializable run report of this load."""
+        self.finish()
+        return {
+            "config_key": self.config_key,
+            "source": self.source,
+            "started_at": self.started_at.isoformat(),
+            "seconds": round(self.seconds, 6),
+            **self.counters,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            "chunks": [
+                dict(record, stages={k: round(v, 6) for k, v in record["stages"].items()})
+                for _, record in sorted(self.chunks.items())
+            ],
+        }
+
+
+def merge_reports(config_key: str, reports) -> dict:
+    """
+    One report for a job loaded in several partitions: stages and counters
+    summed, chunks tagged with their partition.
+    """
+
+    merged = {"config_key": config_key, "source": None, "started_at": None, "seconds": 0.0,
+              "rows_read": 0, "valid": 0, "failed": 0, "upserted": 0, "bytes_read": 0,
+              "peak_rss_bytes": 0, "stages": {}, "chunks": []}
+
+    for partition, report in enumerate(reports):
+        merged["source"] = merged["source"] or report["source"]
+        if merged["started_at"] is None or report["started_at"] < merged["started_at"]:
+            merged["started_at"] = report["started_at"]
+        merged["seconds"] = max(merged["seconds"], report["seconds"])
+        for key in ("rows_read", "valid", "failed", "upserted", "bytes_read"):
+            merged[key] += report.get(key, 0)
+        merged["peak_rss_bytes"] = max(merged["peak_rss_bytes"], report["peak_rss_bytes"])
+        for stage, seconds in report["stages"].items():
+            merged["stages"][stage] = merged["stages"].get(stage, 0.0) + seconds
+        merged["chunks"].extend(dict(chunk, partition=partition) for chunk in report["chunks"])
+
+    return merged
+
+
+def _labels(**labels) -> str:
+    escaped = {k: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for k, v in labels.items()}
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped.items()) + "}"
+
+
+def prometheus_text(reports) -> str:
+    """
+    Prometheus text exposition of a list of run reports
+    (LoadMetrics.report() dicts), one series per job.
+    """
+
+    families = {
+        "stage_seconds": ("gauge", "Seconds spent in each ETL stage during the last run."),
+        "rows": ("gauge", "Rows handled during the last run, by outcome."),
+        "bytes_read": ("gauge", "Source bytes read during the last run."),
+        "run_seconds": ("gauge", "Wall-clock seconds of the last run."),
+        "peak_rss_bytes": ("gauge", "Peak resident memory of the loading process."),
+        "last_run_timestamp_seconds": ("gauge", "Unix time the last run started."),
+    }
+    samples = {name: [] for name in families}
+
+    for report in reports:
+        job = report["config_key"]
+        for stage, seconds in report["stages"].items():
+            samples["stage_seconds"].append((_labels(job=job, stage=stage), seconds))
+        for outcome in ("rows_read", "valid", "failed", "upserted"):
+            samples["rows"].append((_labels(job=job, outcome=outcome), report.get(outcome, 0)))
+        samples["bytes_read"].append((_labels(job=job), report.get("bytes_read", 0)))
+        samples["run_seconds"].append((_labels(job=job), report["seconds"]))
+        samples["peak_rss_bytes"].append((_labels(job=job), report["peak_rss_bytes"]))
+        started = dt.datetime.fromisoformat(report["started_at"]).timestamp()
+        samples["last_run_timestamp_seconds"].append((_labels(job=job), started))
+
+    lines = []
+    for name, (kind, help_text) in families.items():
+        if not samples[name]:
+            continue
+        metric = f"{METRIC_PREFIX}_{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.extend(f"{metric}{labels} {value}" for labels, value in samples[name])
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: str, text: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def write_run_report(path: str, reports, **extra):
+    """Writes the run reports as one JSON document."""
+    document = {"generated_at": dt.datetime.now(dt.timezone.utc).isoformat(), **extra, "jobs": list(reports)}
+    _write_atomic(path, json.dumps(document, indent=2, default=str))
+
+
+def write_prometheus_textfile(path: str, reports):
+    """Writes the metrics for node_exporter's textfile collector (or any scraper reading a .prom file)."""
+    _write_atomic(path, prometheus_text(reports))
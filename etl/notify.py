@@ -0,0 +1,61 @@
+# etl/notify.py
+
+import json
+import logging
+
+from sqlalchemy import text
+
+
+UPSERT_CHANNEL = "etl_upsert"
+MAX_PAYLOAD_BYTES = 7_900       # NOTIFY payloads must stay under 8000 bytes
+
+
+def _payload(table_name: str, keys) -> str:
+    return json.dumps({"table": table_name, "keys": keys}, separators=(",", ":"))
+
+
+def upsert_payloads(table_name: str, keys) -> list:
+    """
+    NOTIFY payloads naming the upserted keys of a table, split to fit the
+    payload limit. A key too long to fit gives {"keys": null}: drop
+    everything cached for the table.
+    """
+
+    payloads = []
+    batch = []
+    empty = len(_payload(table_name, []))
+    size = empty
+
+    for key in map(str, keys):
+        key_size = len(json.dumps(key)) + 1       # ASCII-escaped, so characters are bytes
+        if empty + key_size > MAX_PAYLOAD_BYTES:
+            return [_payload(table_name, None)]
+        if size + key_size > MAX_PAYLOAD_BYTES:
+            payloads.append(_payload(table_name, batch))
+            batch, size = [], empty
+        batch.append(key)
+        size += key_size
+
+    if batch:
+        payloads.append(_payload(table_name, batch))
+    return payloads
+
+
+def notify_upserted(engine, table_name: str, keys):
+    """
+    Tells listeners (such as the chat API's order-status cache) which rows
+    of a table were just upserted. Sent after the upsert committed, in its
+    own short transaction; Postgres only, a no-op elsewhere.
+    """
+
+    if getattr(getattr(engine, "dialect", None), "name", None) != "postgresql":
+        return
+
+    try:
+        with engine.begin() as conn:
+            for payload in upsert_payloads(table_name, keys):
+                conn.execute(text("SELECT pg_notify(:channel, :payload)"),
+                             {"channel": UPSERT_CHANNEL, "payload": payload})
+    except Exception as e:
+        # The data is committed; stale caches expire on their own TTL
+        logging.warning(f"Could not notify listeners of the upsert into {table_name}: {e}")
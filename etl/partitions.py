@@ -0,0 +1,244 @@
+# etl/partitions.py
+#
+# Monthly range partitions of tables partitioned on a timestamp column
+# (the optional layout of tracking, see tracking_partitioned.sql).
+#
+# Such a table is keyed on (primary key, partition column), so Postgres
+# alone would keep both rows of an order whose transaction_date moved to
+# another month. The loaders keep one row per primary key: a batch is
+# collapsed to one record per key, and in the same transaction as the
+# upsert, the rows of its keys under another partition value are deleted
+# (delete_moved_rows here, build_move_sql for the COPY merge).
+#   python -m etl.partitions ensure tracking --months-ahead 3
+#   python -m etl.partitions detach tracking --keep-months 24 [--drop]
+
+import argparse
+import datetime as dt
+import logging
+import re
+
+import pandas as pd
+from sqlalchemy import column, delete, text, values
+
+from etl.staging_upsert import ORDER_COLUMN, _quote
+
+
+_PARTITION_COLUMNS = {}     # table name -> partition column (None if not partitioned)
+_KNOWN_PARTITIONS = set()   # partition names created or seen by this process
+
+
+def get_partition_column(table_name: str, engine):
+    """
+    The column a table is range-partitioned on, or None for a plain
+    table (or a database other than Postgres). Cached per table.
+    """
+
+    if table_name in _PARTITION_COLUMNS:
+        return _PARTITION_COLUMNS[table_name]
+
+    if getattr(getattr(engine, "dialect", None), "name", None) != "postgresql":
+        return None
+
+    with engine.connect() as conn:
+        column = conn.execute(text(
+            "SELECT a.attname FROM pg_partitioned_table p "
+            "JOIN pg_attribute a ON a.attrelid = p.partrelid AND a.attnum = p.partattrs[0] "
+            "WHERE p.partrelid = to_regclass(:table_name)"
+        ), {"table_name": table_name}).scalar()
+
+    _PARTITION_COLUMNS[table_name] = column
+    return column
+
+
+def to_utc(value) -> dt.datetime:
+    """`value` (a datetime, date or ISO string) as an aware UTC datetime; naive values are taken as UTC."""
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return ts.to_pydatetime()
+
+
+def month_start(value) -> dt.datetime:
+    """First instant (UTC) of the month holding `value` (a datetime, date or ISO string)."""
+    ts = to_utc(value)
+    return dt.datetime(ts.year, ts.month, 1, tzinfo=dt.timezone.utc)
+
+
+def next_month(month: dt.datetime) -> dt.datetime:
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def partition_name(table_name: str, month: dt.datetime) -> str:
+    return f"{table_name}_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_ddl(table_name: str, month: dt.datetime) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {_quote(partition_name(table_name, month))} "
+        f"PARTITION OF {_quote(table_name)} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+    )
+
+
+def ensure_partitions(engine, table_name: str, values) -> list:
+    """
+    Creates the monthly partitions the given partition-column values fall
+    into, if they do not exist yet. Concurrent loaders serialize on an
+    advisory lock per partition. Returns the names of the partitions created.
+    """
+
+    months = {month_start(v) for v in values if v is not None and not pd.isna(v)}
+    missing = sorted(m for m in months if partition_name(table_name, m) not in _KNOWN_PARTITIONS)
+    if not missing:
+        return []
+
+    created = []
+    with engine.begin() as conn:
+        for month in missing:
+            name = partition_name(table_name, month)
+            conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": name})
+            if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is None:
+                conn.execute(text(partition_ddl(table_name, month)))
+                created.append(name)
+
+    _KNOWN_PARTITIONS.update(partition_name(table_name, m) for m in missing)
+    for name in created:
+        logging.info(f"Created partition {name} of {table_name}.")
+    return created
+
+
+def list_partitions(engine, table_name: str) -> dict:
+    """Monthly partitions attached to the table: {month start: partition name}."""
+
+    pattern = re.compile(rf"^{re.escape(table_name)}_p(\d{{4}})_(\d{{2}})$")
+    with engine.connect() as conn:
+        names = conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table_name)"
+        ), {"table_name": table_name}).scalars().all()
+
+    partitions = {}
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            partitions[dt.datetime(int(match[1]), int(match[2]), 1, tzinfo=dt.timezone.utc)] = name
+    return partitions
+
+
+def detach_partitions_before(engine, table_name: str, before, drop: bool = False) -> list:
+    """
+    Detaches every monthly partition that ends on or before `before`.
+
+    DETACH ... CONCURRENTLY only takes a brief lock on the parent, and
+    dropping the detached table frees its space at once: no DELETE of old
+    rows and no long VACUUM afterwards. Without drop, the detached tables
+    stay behind as plain tables (to archive, or to ATTACH again).
+    """
+
+    cutoff = month_start(before)
+    old = [name for month, name in sorted(list_partitions(engine, table_name).items()) if next_month(month) <= cutoff]
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name in old:
+            conn.execute(text(f"ALTER TABLE {_quote(table_name)} DETACH PARTITION {_quote(name)} CONCURRENTLY"))
+            if drop:
+                conn.execute(text(f"DROP TABLE {_quote(name)}"))
+            _KNOWN_PARTITIONS.discard(name)
+            logging.info(f"{'Dropped' if drop else 'Detached'} partition {name} of {table_name}.")
+    return old
+
+
+def split_unroutable(records, partition_column: str):
+    """
+    Splits validated records into those that have a partition-column value
+    and DLQ entries for those that do not (no partition can take them).
+
+    The routable records get their partition value as an aware UTC
+    datetime. A naive value would otherwise be read in the session
+    TimeZone by Postgres but in UTC by ensure_partitions, and a row near a
+    month boundary would go to a partition that was never created.
+    """
+
+    routable, failed = [], []
+    for record in records:
+        value = record.get(partition_column)
+        if value is None:
+            failed.append({"original_data": record,
+                           "validation_error": f"{partition_column} is required: the table is partitioned on it"})
+            continue
+        try:
+            utc_value = to_utc(value)
+        except (ValueError, TypeError) as e:
+            failed.append({"original_data": record, "validation_error": f"{partition_column}: {e}"})
+            continue
+        routable.append(dict(record, **{partition_column: utc_value}))
+    return routable, failed
+
+
+def latest_per_key(records, pk_column: str, order_column: str = ORDER_COLUMN) -> list:
+    """
+    One record per primary key, like the DISTINCT ON of the COPY merge:
+    the newest order_column, then the last one in the batch.
+    """
+
+    latest = {}
+    for record in records:
+        key = record[pk_column]
+        kept = latest.get(key)
+        if kept is not None:
+            new, old = record.get(order_column), kept.get(order_column)
+            if (new is None and old is not None) or (None not in (new, old) and new < old):
+                continue
+        latest[key] = record
+    return list(latest.values())
+
+
+def delete_moved_rows(conn, table, records, pk_column: str, partition_column: str) -> int:
+    """
+    Deletes the rows of the records' primary keys that are stored under a
+    partition value other than the record's: the old copy of a row whose
+    partition value changed. `records` must hold one record per key (see
+    latest_per_key). Run on the upsert's connection, in its transaction.
+    Returns the number of rows deleted.
+    """
+
+    if not records:
+        return 0
+    batch = values(
+        column(pk_column, table.c[pk_column].type),
+        column(partition_column, table.c[partition_column].type),
+        name="batch",
+    ).data([(r[pk_column], r[partition_column]) for r in records])
+
+    moved = conn.execute(
+        delete(table).where(table.c[pk_column] == batch.c[pk_column],
+                            table.c[partition_column] != batch.c[partition_column])
+    ).rowcount
+    if moved:
+        logging.info(f"Moved {moved} rows of {table.name} to another {partition_column} partition.")
+    return moved
+
+
+if __name__ == "__main__":
+    from sqlalchemy import create_engine
+    from etl.load_data import DB_CONN_STRING
+
+    parser = argparse.ArgumentParser(description="Manage the monthly partitions of a partitioned table.")
+    parser.add_argument("action", choices=["ensure", "detach"])
+    parser.add_argument("table", nargs="?", default="tracking")
+    parser.add_argument("--months-ahead", type=int, default=3, help="ensure: months to create after the current one")
+    parser.add_argument("--keep-months", type=int, default=24, help="detach: months to keep, the current one included")
+    parser.add_argument("--drop", action="store_true", help="detach: drop the detached partitions")
+    args = parser.parse_args()
+
+    engine = create_engine(DB_CONN_STRING)
+    month = month_start(dt.datetime.now(dt.timezone.utc))
+    if args.action == "ensure":
+        months = [month]
+        for _ in range(args.months_ahead):
+            months.append(next_month(months[-1]))
+        ensure_partitions(engine, args.table, months)
+    else:
+        for _ in range(args.keep_months - 1):
+            month = month.replace(year=month.year - (month.month == 1), month=(month.month - 2) % 12 + 1)
+        detach_partitions_before(engine, args.table, month, drop=args.drop)
@@ -0,0 +1,154 @@
+# etl/readers.py
+
+import logging
+import os
+
+import pandas as pd
+
+from etl.utils import IterableTextIO, iter_byte_range
+
+
+DEFAULT_XLSX_CHUNK_SIZE = 50_000
+
+
+def read_csv_source(source, mapping: dict, usecols, chunk_size: int = None, skip_rows: int = 0):
+    """
+    CSV reader. `source` may be a path or a file-like object.
+    """
+    kwargs = {"skiprows": range(1, skip_rows + 1)} if skip_rows else {}
+    if chunk_size:
+        return pd.read_csv(source, usecols=usecols, chunksize=chunk_size, **kwargs)
+    return [pd.read_csv(source, usecols=usecols, **kwargs)]
+
+
+def read_xlsx_source(source, mapping: dict, usecols, chunk_size: int = None, skip_rows: int = 0):
+    """
+    Streaming .xlsx reader.
+
+    Opens the workbook in read-only mode and walks the sheet named by
+    `sheet_name` in schema_mapping.yml row by row, yielding DataFrames of
+    `chunk_size` rows with only the mapped columns (every named column
+    when usecols is None). Cell values keep the types openpyxl gives them
+    (int, float, datetime, str). The first `skip_rows` non-blank data rows
+    are skipped.
+    """
+
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("Reading .xlsx sources needs openpyxl (pip install openpyxl).")
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    sheet_name = mapping.get("sheet_name")
+    if sheet_name and sheet_name not in workbook.sheetnames:
+        workbook.close()
+        raise ValueError(f"Sheet '{sheet_name}' not found in {source}. Available: {workbook.sheetnames}")
+
+    def frames():
+        try:
+            sheet = workbook[sheet_name] if sheet_name else workbook.active
+            rows = sheet.iter_rows(values_only=True)
+
+            header = [str(h).strip() if h is not None else "" for h in next(rows, [])]
+            wanted = set(usecols) if usecols is not None else set(header) - {""}
+            missing = wanted - set(header)
+            if missing:
+                raise ValueError(f"Columns {sorted(missing)} not found in sheet '{sheet.title}'.")
+            positions = [i for i, name in enumerate(header) if name in wanted]
+            columns = [header[i] for i in positions]
+
+            size = chunk_size or DEFAULT_XLSX_CHUNK_SIZE
+            block = []
+            to_skip = skip_rows
+            for row in rows:
+                if not any(cell is not None for cell in row):
+                    continue      # trailing blank rows are common in exports
+                if to_skip:
+                    to_skip -= 1
+                    continue
+                block.append([row[i] if i < len(row) else None for i in positions])
+                if len(block) >= size:
+                    yield pd.DataFrame(block, columns=columns)
+                    block = []
+            if block:
+                yield pd.DataFrame(block, columns=columns)
+        finally:
+            workbook.close()
+
+    if chunk_size:
+        return frames()
+
+    # One frame for the whole sheet, as read_csv would give
+    blocks = list(frames())
+    return [pd.concat(blocks, ignore_index=True) if blocks else pd.DataFrame(columns=list(usecols))]
+
+
+SOURCE_READERS = {
+    ".csv": read_csv_source,
+    ".xlsx": read_xlsx_source,
+}
+
+
+def open_source(source):
+    """
+    A (path, start, end) byte range of a CSV (one partition of a split
+    file, see etl/job_runner.py) as a file-like object; other sources as they are.
+    """
+    if isinstance(source, tuple):
+        path, start, end = source
+        return IterableTextIO(iter_byte_range(path, start, end))
+    return source
+
+
+def get_source_reader(source, mapping: dict):
+    """
+    Picks a reader from the source path's extension, falling back to the
+    extension of `source_file_pattern` in the mapping. File-like sources
+    (such as a byte range of a CSV) are read as CSV.
+    """
+
+    if not isinstance(source, (str, os.PathLike)):
+        return read_csv_source
+
+    extension = os.path.splitext(str(source))[1].lower()
+    if extension not in SOURCE_READERS:
+        extension = os.path.splitext(mapping.get("source_file_pattern", ""))[1].lower()
+
+    reader = SOURCE_READERS.get(extension)
+    if reader is None:
+        logging.warning(f"No reader registered for '{source}'. Reading it as CSV.")
+        return read_csv_source
+    return reader
+
+
+def bytes_consumed(frames):
+    """
+    How many bytes of its file a chunked CSV reader has consumed so far,
+    or None if that cannot be told (xlsx, in-memory frames, file-like sources).
+    """
+    handle = getattr(getattr(frames, "handles", None), "handle", None)
+    raw = getattr(handle, "buffer", handle)
+    try:
+        return raw.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def read_source(source, mapping: dict, usecols, chunk_size: int = None, skip_rows: int = 0, cache_dir: str = None):
+    """
+    Returns an iterable of DataFrames (one per chunk) holding the
+    `usecols` source columns, whatever the source format, starting after
+    the first `skip_rows` data rows.
+
+    `source` may also be a (path, start, end) byte range of a CSV.
+    With cache_dir, a source path or byte range is parsed once into an
+    Arrow cache there and memory-mapped on later reads (see etl/source_cache.py).
+    """
+    reader = get_source_reader(source, mapping)
+    if cache_dir and isinstance(source, (str, os.PathLike, tuple)):
+        from etl.source_cache import read_source_cached
+        return read_source_cached(source, mapping, usecols, chunk_size, skip_rows, reader=reader, cache_dir=cache_dir)
+    source = open_source(source)
+    if skip_rows:
+        return reader(source, mapping, usecols, chunk_size, skip_rows=skip_rows)
+    return reader(source, mapping, usecols, chunk_size)
@@ -0,0 +1,180 @@
+# etl/rollups.py
+#
+# Invoice rollups of tracking: shipment counts and invoice/surcharge totals
+# by customer_id x carrier x zone_used x month, kept current by statement
+# triggers that apply only the difference between old and new rows.
+#   python -m etl.rollups install
+#   python -m etl.rollups rebuild [--since 2024-01]
+
+import argparse
+import datetime as dt
+import logging
+
+from sqlalchemy import text
+
+
+ROLLUP_TABLE = "tracking_invoice_rollup"
+SOURCE_TABLE = "tracking"
+GROUP_COLUMNS = ("customer_id", "carrier", "zone_used", "month")
+MONTH_EXPR = "date_trunc('month', transaction_date AT TIME ZONE 'UTC')::date"
+
+# rollup column -> tracking column summed into it
+SUM_COLUMNS = {
+    "final_invoice_amt": "final_invoice_amt",
+    "invoice_amount": "invoice_amount",
+    "wms_fuel_surcharge": "wms_fuel_surcharge",
+    "delivery_area_surcharge": "delivery_area_surcharge",
+    "address_correction": "address_correction",
+    "insurance_amount": "insurance_amount",
+}
+
+
+def rollup_table_ddl() -> str:
+    sums = "".join(f"    {name} NUMERIC(16,2) NOT NULL DEFAULT 0,\n" for name in SUM_COLUMNS)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (\n"
+        f"    customer_id UUID,\n"
+        f"    carrier TEXT,\n"
+        f"    zone_used TEXT,\n"
+        f"    month DATE,\n"
+        f"    shipments BIGINT NOT NULL DEFAULT 0,\n"
+        f"{sums}"
+        f"    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()\n"
+        f");\n\n"
+        # NULL customer/carrier/zone/month are groups of their own (Postgres 15+)
+        f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{ROLLUP_TABLE}_group\n"
+        f"    ON {ROLLUP_TABLE} ({', '.join(GROUP_COLUMNS)}) NULLS NOT DISTINCT;\n"
+        f"CREATE INDEX IF NOT EXISTS idx_{ROLLUP_TABLE}_month ON {ROLLUP_TABLE} (month);\n"
+    )
+
+
+def _delta_select(sources) -> str:
+    """
+    Net change per group from transition tables: `sources` is a list of
+    (relation, sign), e.g. [("new_rows", 1), ("old_rows", -1)].
+    Groups whose change is zero are left out.
+    """
+
+    rows = " UNION ALL ".join(
+        f"SELECT {sign} AS sign, customer_id, carrier, zone_used, {MONTH_EXPR} AS month, "
+        + ", ".join(f"COALESCE({column}, 0) AS {name}" for name, column in SUM_COLUMNS.items())
+        + f" FROM {relation}"
+        for relation, sign in sources
+    )
+    sums = ", ".join(f"SUM(sign * {name})" for name in SUM_COLUMNS)
+    changed = " OR ".join(["SUM(sign) <> 0"] + [f"SUM(sign * {name}) <> 0" for name in SUM_COLUMNS])
+    groups = ", ".join(GROUP_COLUMNS)
+    return (
+        f"SELECT {groups}, SUM(sign), {sums}\n"
+        f"        FROM ({rows}) AS delta\n"
+        f"        GROUP BY {groups}\n"
+        f"        HAVING {changed}\n"
+        f"        ORDER BY {groups}"        # one lock order for concurrent loads
+    )
+
+
+def _apply_delta_sql(sources) -> str:
+    columns = ", ".join(GROUP_COLUMNS + ("shipments",) + tuple(SUM_COLUMNS))
+    updates = ", ".join(f"{name} = r.{name} + EXCLUDED.{name}" for name in ("shipments",) + tuple(SUM_COLUMNS))
+    return (
+        f"INSERT INTO {ROLLUP_TABLE} AS r ({columns})\n"
+        f"        {_delta_select(sources)}\n"
+        f"        ON CONFLICT ({', '.join(GROUP_COLUMNS)}) DO UPDATE SET {updates}, updated_at = NOW()"
+    )
+
+
+def rollup_trigger_ddl() -> str:
+    """
+    One statement-level trigger per event. Each sees the statement's rows
+    through transition tables and applies their net change in one
+    INSERT ... ON CONFLICT. An ETL upsert (INSERT ... ON CONFLICT DO
+    UPDATE, or the COPY staging merge) fires the INSERT trigger for new
+    orders and the UPDATE trigger, with old and new values, for the rest.
+    """
+
+    events = {
+        "insert": ("INSERT", "REFERENCING NEW TABLE AS new_rows", [("new_rows", 1)]),
+        "update": ("UPDATE", "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+                   [("new_rows", 1), ("old_rows", -1)]),
+        "delete": ("DELETE", "REFERENCING OLD TABLE AS old_rows", [("old_rows", -1)]),
+    }
+
+    statements = []
+    for name, (event, referencing, sources) in events.items():
+        function = f"{ROLLUP_TABLE}_on_{name}"
+        statements.append(
+            f"CREATE OR REPLACE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS $$\n"
+            f"BEGIN\n"
+            f"    {_apply_delta_sql(sources)};\n"
+            f"    DELETE FROM {ROLLUP_TABLE} WHERE shipments = 0;\n"
+            f"    RETURN NULL;\n"
+            f"END $$;\n\n"
+            f"DROP TRIGGER IF EXISTS {function} ON {SOURCE_TABLE};\n"
+            f"CREATE TRIGGER {function} AFTER {event} ON {SOURCE_TABLE}\n"
+            f"    {referencing}\n"
+            f"    FOR EACH STATEMENT EXECUTE FUNCTION {function}();\n"
+        )
+    return "\n".join(statements)
+
+
+def rollup_ddl() -> str:
+    return rollup_table_ddl() + "\n" + rollup_trigger_ddl()
+
+
+def install_rollups(engine):
+    """Creates the rollup table and its triggers on tracking (idempotent), then fills it."""
+    with engine.begin() as conn:
+        conn.execute(text(rollup_ddl()))
+    rebuild_rollups(engine)
+
+
+def rebuild_rollups(engine, since=None) -> int:
+    """
+    Recomputes the rollup from tracking, for every month or for the months
+    from `since` (a date or 'YYYY-MM') on, e.g. after a backfill loaded
+    with the triggers disabled.
+
+    Writes to tracking wait until the rebuild commits (SHARE lock), so no
+    delta is applied twice or lost. Months of detached partitions stay in
+    the rollup unless they are rebuilt.
+    """
+
+    if isinstance(since, str):
+        since = dt.date.fromisoformat(f"{since}-01" if len(since) == 7 else since)
+    month_from = since.replace(day=1) if since else None
+
+    columns = ", ".join(GROUP_COLUMNS + ("shipments",) + tuple(SUM_COLUMNS))
+    sums = ", ".join(f"COALESCE(SUM({column}), 0)" for column in SUM_COLUMNS.values())
+    where = f"WHERE {MONTH_EXPR} >= :month_from" if month_from else ""
+
+    with engine.begin() as conn:
+        conn.execute(text(f"LOCK TABLE {SOURCE_TABLE} IN SHARE MODE"))
+        if month_from:
+            conn.execute(text(f"DELETE FROM {ROLLUP_TABLE} WHERE month >= :month_from"), {"month_from": month_from})
+        else:
+            conn.execute(text(f"TRUNCATE {ROLLUP_TABLE}"))
+        rows = conn.execute(text(
+            f"INSERT INTO {ROLLUP_TABLE} ({columns})\n"
+            f"SELECT customer_id, carrier, zone_used, {MONTH_EXPR}, COUNT(*), {sums}\n"
+            f"FROM {SOURCE_TABLE} {where}\n"
+            f"GROUP BY 1, 2, 3, 4"
+        ), {"month_from": month_from} if month_from else {}).rowcount
+
+    logging.info(f"Rebuilt {ROLLUP_TABLE}{f' from {month_from}' if month_from else ''}: {rows} groups.")
+    return rows
+
+
+if __name__ == "__main__":
+    from sqlalchemy import create_engine
+    from etl.load_data import DB_CONN_STRING
+
+    parser = argparse.ArgumentParser(description="Maintain the invoice rollups of tracking.")
+    parser.add_argument("action", choices=["install", "rebuild"])
+    parser.add_argument("--since", help="rebuild: first month to recompute (YYYY-MM); all months by default")
+    args = parser.parse_args()
+
+    engine = create_engine(DB_CONN_STRING)
+    if args.action == "install":
+        install_rollups(engine)
+    else:
+        rebuild_rollups(engine, args.since)
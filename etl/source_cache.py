@@ -0,0 +1,245 @@
+# etl/source_cache.py
+
+import hashlib
+import itertools
+import json
+import logging
+import os
+import shutil
+import time
+
+import pandas as pd
+
+
+SOURCE_CACHE_DIR = ".source_cache"
+CACHE_FORMAT_VERSION = 1
+CACHE_PART_ROWS = 100_000      # rows per cached part when the load itself is not chunked
+CACHE_MAX_BYTES = 20 * 1024 ** 3     # least recently used entries are removed above this
+CACHE_MAX_AGE_DAYS = 14              # entries not read for this long are removed
+
+_HASHES = {}                   # (path, size, mtime_ns) -> hash, for this process
+
+
+def file_hash(path: str, cache_dir: str = SOURCE_CACHE_DIR) -> str:
+    """
+    blake2b of the whole file. Remembered per (path, size, mtime) in
+    cache_dir/hashes.json, so an unchanged file is hashed once.
+    """
+
+    stat = os.stat(path)
+    identity = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    if identity in _HASHES:
+        return _HASHES[identity]
+
+    index_path = os.path.join(cache_dir, "hashes.json")
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            known = json.load(f)
+    except (FileNotFoundError, ValueError):
+        known = {}
+
+    if identity not in known:
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        known[identity] = digest.hexdigest()
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(known, f)
+        os.replace(tmp_path, index_path)
+
+    _HASHES[identity] = known[identity]
+    return known[identity]
+
+
+def parse_version(source, mapping: dict) -> str:
+    """
+    The part of the mapping that changes how a file parses (format and
+    sheet), plus the byte range for a (path, start, end) source. Column
+    lists and validators do not, so fixing them reuses the cache.
+    """
+    path = source[0] if isinstance(source, tuple) else source
+    spec = {"v": CACHE_FORMAT_VERSION, "format": os.path.splitext(str(path))[1].lower(),
+            "sheet_name": mapping.get("sheet_name")}
+    if isinstance(source, tuple):
+        spec["byte_range"] = list(source[1:])
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def cache_entry(source, mapping: dict, cache_dir: str = SOURCE_CACHE_DIR) -> str:
+    path = source[0] if isinstance(source, tuple) else source
+    return os.path.join(cache_dir, f"{file_hash(path, cache_dir)}-{parse_version(source, mapping)}")
+
+
+def _entry_size(entry: str) -> int:
+    return sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+
+
+def prune_cache(cache_dir: str = SOURCE_CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES,
+                max_age_days: float = CACHE_MAX_AGE_DAYS, keep: str = None) -> list:
+    """
+    Removes the entries not read for max_age_days, then the least recently
+    used ones until the cache fits in max_bytes. `keep` (the entry just
+    written) is never removed. The hashes of files that no longer have an
+    entry are dropped from hashes.json. Returns the removed entries.
+    """
+
+    entries = []
+    for name in os.listdir(cache_dir):
+        entry = os.path.join(cache_dir, name)
+        meta_path = os.path.join(entry, "meta.json")
+        if ".tmp-" in name or not os.path.exists(meta_path):
+            continue
+        entries.append((os.path.getmtime(meta_path), entry, _entry_size(entry)))
+
+    entries.sort()      # least recently used first
+    total = sum(size for _, _, size in entries)
+    cutoff = time.time() - max_age_days * 86400
+    removed = []
+    for last_used, entry, size in entries:
+        if entry == keep or (last_used >= cutoff and total <= max_bytes):
+            continue
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+        removed.append(entry)
+
+    index_path = os.path.join(cache_dir, "hashes.json")
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            known = json.load(f)
+    except (FileNotFoundError, ValueError):
+        known = {}
+    cached = {os.path.basename(entry).split("-")[0] for _, entry, _ in entries if entry not in removed}
+    kept = {identity: digest for identity, digest in known.items() if digest in cached}
+    if len(kept) < len(known):
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(kept, f)
+        os.replace(tmp_path, index_path)
+        _HASHES.clear()
+
+    for entry in removed:
+        logging.info(f"Removed {entry} from the source cache.")
+    return removed
+
+
+def _select(df: pd.DataFrame, usecols, source) -> pd.DataFrame:
+    missing = [c for c in usecols if c not in df.columns]
+    if missing:
+        raise ValueError(f"Columns {missing} not found in {source}.")
+    return df[usecols]
+
+
+def _skip(frames, skip_rows: int):
+    for df in frames:
+        if skip_rows >= len(df):
+            skip_rows -= len(df)
+            continue
+        if skip_rows:
+            df = df.iloc[skip_rows:].reset_index(drop=True)
+            skip_rows = 0
+        yield df
+
+
+def _write_through(source, entry: str, frames, usecols):
+    """
+    Yields the parsed frames (usecols only) while writing every column to
+    Arrow IPC parts. The entry only appears once the whole file is cached.
+    """
+
+    import pyarrow as pa
+
+    tmp_entry = f"{entry}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_entry, ignore_errors=True)
+    os.makedirs(tmp_entry)
+    caching = True
+    rows = 0
+
+    try:
+        for part, df in enumerate(frames, start=1):
+            if caching:
+                try:
+                    table = pa.Table.from_pandas(df, preserve_index=False)
+                    with pa.OSFile(os.path.join(tmp_entry, f"part-{part:05d}.arrow"), "wb") as sink:
+                        with pa.ipc.new_file(sink, table.schema) as writer:
+                            writer.write_table(table)
+                except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                    # Mixed-type object columns (common in xlsx) have no Arrow type
+                    logging.warning(f"Not caching {source}: {e}")
+                    caching = False
+            rows += len(df)
+            yield _select(df, usecols, source)
+
+        if caching:
+            with open(os.path.join(tmp_entry, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"source": os.path.abspath(source[0] if isinstance(source, tuple) else source),
+                           "byte_range": list(source[1:]) if isinstance(source, tuple) else None,
+                           "rows": rows, "parts": part if rows else 0}, f)
+            os.replace(tmp_entry, entry)
+            logging.info(f"Cached {rows} rows of {source} in {entry}.")
+            try:
+                prune_cache(os.path.dirname(entry), keep=entry)
+            except OSError as e:
+                logging.warning(f"Could not prune the source cache: {e}")
+    finally:
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+
+
+def _read_cached(entry: str, parts, usecols, chunk_size: int = None):
+    """
+    Memory-maps each cached part, keeps only `usecols` and yields
+    DataFrames of at most chunk_size rows.
+    """
+
+    import pyarrow as pa
+
+    for name in parts:
+        with pa.memory_map(os.path.join(entry, name), "r") as mapped:
+            table = pa.ipc.open_file(mapped).read_all().select(usecols)
+            step = chunk_size or table.num_rows
+            for offset in range(0, table.num_rows, max(step, 1)):
+                yield table.slice(offset, step).to_pandas()
+
+
+def read_source_cached(source, mapping: dict, usecols, chunk_size: int = None, skip_rows: int = 0,
+                       reader=None, cache_dir: str = SOURCE_CACHE_DIR):
+    """
+    Like read_source, but a file that was parsed before (same content, same
+    format and sheet) is read from its Arrow cache instead of being parsed again.
+    A (path, start, end) byte range is cached on its own.
+    On a miss, the file is parsed once with every column and cached as it
+    streams; the cache is then pruned to CACHE_MAX_BYTES and CACHE_MAX_AGE_DAYS.
+    """
+
+    usecols = list(usecols)
+    entry = cache_entry(source, mapping, cache_dir)
+
+    # Missing columns fail here, not mid-load, as with the uncached readers
+    if os.path.exists(os.path.join(entry, "meta.json")):
+        import pyarrow as pa
+
+        logging.info(f"Reading {source} from the source cache ({entry}).")
+        os.utime(os.path.join(entry, "meta.json"))      # last used, for prune_cache
+        parts = sorted(n for n in os.listdir(entry) if n.endswith(".arrow"))
+        if parts:
+            with pa.memory_map(os.path.join(entry, parts[0]), "r") as mapped:
+                _select(pd.DataFrame(columns=pa.ipc.open_file(mapped).schema.names), usecols, source)
+        frames = _read_cached(entry, parts, usecols, chunk_size)
+    else:
+        from etl.readers import open_source
+        parsed = iter(reader(open_source(source), mapping, None, chunk_size or CACHE_PART_ROWS))
+        first = next(parsed, None)
+        if first is not None:
+            _select(first, usecols, source)
+        frames = _write_through(source, entry, itertools.chain([first] if first is not None else [], parsed), usecols)
+
+    if skip_rows:
+        frames = _skip(frames, skip_rows)
+    if chunk_size:
+        return frames
+
+    # One frame for the whole file, as the uncached readers give
+    frames = list(frames)
+    return [pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=list(usecols))]
@@ -0,0 +1,180 @@
+# etl/staging_upsert.py
+
+import csv
+import io
+import logging
+import uuid
+
+from sqlalchemy.dialects import postgresql
+
+from etl.utils import IterableTextIO
+
+
+COPY_NULL = r"\N"
+ORDER_COLUMN = "last_updated"     # newest value wins when a batch repeats a primary key
+STAGE_SEQ_COLUMN = "_stage_seq"   # file order, breaks ties between equal ORDER_COLUMN values
+
+_PREPARER = postgresql.dialect().identifier_preparer
+
+
+def _quote(name: str) -> str:
+    return _PREPARER.quote(name)
+
+
+def key_columns(pk_column) -> list:
+    """The conflict key as a list: one column, or several for a partitioned table."""
+    return [pk_column] if isinstance(pk_column, str) else list(pk_column)
+
+
+def _format_value(value):
+    if value is None:
+        return COPY_NULL
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def iter_csv_rows(records, columns, rows_per_block: int = 500):
+    """
+    Yields the records as CSV text for COPY, a block of rows at a time.
+    None is written as the COPY NULL marker.
+    """
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    for i, record in enumerate(records, start=1):
+        writer.writerow([_format_value(record.get(col)) for col in columns])
+        if i % rows_per_block == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _latest_first(pk_column, order_column: str = None) -> list:
+    """ORDER BY of a DISTINCT ON the primary key that puts each key's newest staged row first."""
+
+    order_by = [_quote(key_columns(pk_column)[0])]
+    if order_column:
+        order_by.append(f"{_quote(order_column)} DESC NULLS LAST")
+    order_by.append(f"{_quote(STAGE_SEQ_COLUMN)} DESC")
+    return order_by
+
+
+def build_merge_sql(target: str, stage: str, columns, pk_column: str, order_column: str = None) -> str:
+    """
+    One set-based merge from the staging table into the target table.
+    DISTINCT ON keeps a single row per primary key: the newest order_column,
+    then the last one in the file. pk_column may be a tuple of columns
+    (primary key plus partition column): rows are still collapsed on the
+    primary key alone, and conflicts matched on the whole tuple.
+    """
+
+    keys = key_columns(pk_column)
+    key_list = ", ".join(_quote(c) for c in keys)
+    cols = ", ".join(_quote(c) for c in columns)
+
+    updates = ",\n        ".join(
+        f"{_quote(c)} = EXCLUDED.{_quote(c)}" for c in columns if c not in keys
+    )
+    conflict_action = f"DO UPDATE SET\n        {updates}" if updates else "DO NOTHING"
+
+    return (
+        f"INSERT INTO {_quote(target)} ({cols})\n"
+        f"SELECT DISTINCT ON ({_quote(keys[0])}) {cols}\n"
+        f"FROM {_quote(stage)}\n"
+        f"ORDER BY {', '.join(_latest_first(pk_column, order_column))}\n"
+        f"ON CONFLICT ({key_list}) {conflict_action}"
+    )
+
+
+def build_move_sql(target: str, stage: str, pk_column, order_column: str = None):
+    """
+    For a (primary key, partition column) key: deletes the target rows of
+    the staged primary keys that sit under another partition value than
+    the merged row will, i.e. the old copy of a row whose partition value
+    changed. Run before build_merge_sql in the same transaction, so that
+    the table keeps one row per primary key. None for a single-column key.
+    """
+
+    keys = key_columns(pk_column)
+    if len(keys) < 2:
+        return None
+
+    pk, partition_column = _quote(keys[0]), _quote(keys[1])
+    return (
+        f"DELETE FROM {_quote(target)} AS t\n"
+        f"USING (SELECT DISTINCT ON ({pk}) {pk}, {partition_column}\n"
+        f"       FROM {_quote(stage)}\n"
+        f"       ORDER BY {', '.join(_latest_first(pk_column, order_column))}) AS s\n"
+        f"WHERE t.{pk} = s.{pk} AND t.{partition_column} <> s.{partition_column}"
+    )
+
+
+def copy_upsert(table, records, pk_column: str, engine, order_column: str = ORDER_COLUMN):
+    """
+    Bulk upsert through a temporary staging table.
+
+    1. COPY the records into a temp table shaped like the target.
+    2. Collapse repeated primary keys (newest order_column wins).
+    3. Merge with one INSERT ... SELECT ... ON CONFLICT DO UPDATE.
+       With a (primary key, partition column) key, the rows whose
+       partition value changed are first deleted from their old partition.
+
+    Same idempotent result as the multi-row INSERT in etl/load_data.py,
+    without its bind-parameter limit or the duplicate-key failure.
+    pk_column may be a tuple of columns (primary key plus partition column).
+    """
+
+    if not records:
+        return 0
+
+    table_columns = [c.name for c in table.columns]
+    columns = [c for c in table_columns if c in records[0]]
+    missing = [c for c in key_columns(pk_column) if c not in columns]
+    if missing:
+        raise ValueError(f"Key column(s) {missing} missing from the records for {table.name}.")
+    if order_column not in columns:
+        order_column = None
+
+    stage = f"_stage_{table.name}_{uuid.uuid4().hex[:8]}"
+    moved = 0
+    cols = ", ".join(_quote(c) for c in columns)
+
+    conn = engine.raw_connection()
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"CREATE TEMP TABLE {_quote(stage)} "
+            f"(LIKE {_quote(table.name)} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        cursor.execute(f"ALTER TABLE {_quote(stage)} ADD COLUMN {_quote(STAGE_SEQ_COLUMN)} BIGSERIAL")
+
+        cursor.copy_expert(
+            f"COPY {_quote(stage)} ({cols}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            IterableTextIO(iter_csv_rows(records, columns))
+        )
+
+        move_sql = build_move_sql(table.name, stage, pk_column, order_column)
+        if move_sql:
+            cursor.execute(move_sql)
+            moved = cursor.rowcount
+        cursor.execute(build_merge_sql(table.name, stage, columns, pk_column, order_column))
+        merged = cursor.rowcount
+        conn.commit()
+
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if cursor:
+            cursor.close()
+        conn.close()
+
+    logging.debug(f"COPY upsert of {len(records)} records into {table.name} merged {merged} rows "
+                  f"({moved} moved to another partition).")
+    return merged
@@ -1,3 +1,7 @@
+import codecs
+import io
+import os
+
 from sqlalchemy import Table, MetaData
 from sqlalchemy.exc import NoSuchTableError
 
@@ -55,3 +59,93 @@ def get_validator_model(model_name: str):
                          
     return model
 
+
+
+class IterableTextIO(io.TextIOBase):
+    """
+    Read-only text file over an iterator of strings.
+
+    Lets cursor.copy_expert() stream rows as they are produced
+    instead of from one fully built io.StringIO buffer.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = ""
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = self._pending + "".join(self._chunks)
+            self._pending = ""
+            return data
+
+        while len(self._pending) < size:
+            try:
+                self._pending += next(self._chunks)
+            except StopIteration:
+                break
+
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def readline(self, size=-1):
+        while "\n" not in self._pending:
+            try:
+                self._pending += next(self._chunks)
+            except StopIteration:
+                break
+
+        end = self._pending.find("\n") + 1 or len(self._pending)
+        if size is not None and 0 <= size < end:
+            end = size
+        line, self._pending = self._pending[:end], self._pending[end:]
+        return line
+
+
+def split_byte_ranges(csv_path: str, partitions: int):
+    """
+    Splits a CSV into `partitions` byte ranges of the data rows, each
+    starting and ending on a line boundary. Returns (header_end, ranges).
+    Assumes no newlines inside quoted fields.
+    """
+
+    size = os.path.getsize(csv_path)
+    with open(csv_path, "rb") as f:
+        f.readline()
+        header_end = f.tell()
+
+        boundaries = [header_end]
+        step = max((size - header_end) // partitions, 1)
+        for i in range(1, partitions):
+            f.seek(max(header_end + i * step, boundaries[-1]))
+            if f.tell() > header_end:
+                f.readline()      # move to the start of the next full line
+            position = min(f.tell(), size)
+            if position > boundaries[-1]:
+                boundaries.append(position)
+        boundaries.append(size)
+
+    ranges = [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+    return header_end, ranges
+
+
+def iter_byte_range(csv_path: str, start: int, end: int, block_size: int = 1 << 20):
+    """
+    Yields the header line followed by the text between byte offsets start and end.
+    """
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(csv_path, "rb") as f:
+        yield f.readline().decode("utf-8")
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(block_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield decoder.decode(block)
+        yield decoder.decode(b"", final=True)
@@ -2,19 +2,34 @@
 import spacy
 from spacy.language import Language
 from spacy.pipeline import EntityRuler
-from ml.pii_redactor import redact_prompt
+from ml.pii_redactor import redact_many, redact_prompt
+
+
+class PIIRedactor:
+    """
+    Replaces each Doc with a Doc of its redacted text. nlp.pipe() calls
+    pipe(), which redacts a whole batch with one redact_many() call.
+    """
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+
+    def __call__(self, doc):
+        return self.nlp.make_doc(redact_prompt(doc.text))
+
+    def pipe(self, docs, batch_size=32):
+        for batch in spacy.util.minibatch(docs, size=batch_size):
+            for redacted_text in redact_many([doc.text for doc in batch]):
+                yield self.nlp.make_doc(redacted_text)
 
 
 @Language.factory("pii_redactor")
 def create_pii_redactor(nlp, name):
     """
     Factory that creates a PII redactor component.
-    Gives the inner function access to the 'nlp' object safely.
+    Gives the component access to the 'nlp' object safely.
     """
-    def pii_redactor_component(doc):
-        redacted_text = redact_prompt(doc.text)
-        return nlp.make_doc(redacted_text)
-    return pii_redactor_component
+    return PIIRedactor(nlp)
 
 
 
@@ -1,13 +1,78 @@
 # ml/pii_redactor.py
-from presidio_analyzer import AnalyzerEngine
+import os
+from functools import lru_cache
+from typing import Iterable, List
+
+import phonenumbers
+import regex
+import tldextract
+from presidio_analyzer import AnalyzerEngine, BatchAnalyzerEngine, EntityRecognizer, RecognizerResult
 from presidio_anonymizer import AnonymizerEngine
 from presidio_anonymizer.entities import OperatorConfig
 
 # --- 1. Set up the tools (runs once when the file is imported) ---
-print("Loading PII redaction engines...")
-analyzer = AnalyzerEngine()        # Finds PII
+
+# PHONE_NUMBER and EMAIL_ADDRESS are found without any NLP model, with the
+# same patterns, validation and phone regions as Presidio's EmailRecognizer
+# and PhoneRecognizer. Other entity types listed in PII_PRESIDIO_ENTITIES
+# (e.g. "PERSON,LOCATION") go through the full Presidio AnalyzerEngine,
+# which is only built when one is configured.
+FAST_PATH_ENTITIES = ("PHONE_NUMBER", "EMAIL_ADDRESS")
+PRESIDIO_ENTITIES = tuple(e for e in os.environ.get("PII_PRESIDIO_ENTITIES", "").split(",") if e)
+
+EMAIL_PATTERN = regex.compile(
+    r"\b((([!#$%&'*+\-/=?^_`{|}~\w])|([!#$%&'*+\-/=?^_`{|}~\w][!#$%&'*+\-/=?^_`{|}~\.\w]{0,}[!#$%&'*+\-/=?^_`{|}~\w]))[@]\w+(?:-+\w+)*(?:\.\w+(?:-+\w+)*)+)\b",
+    flags=regex.DOTALL | regex.MULTILINE | regex.IGNORECASE,
+)
+EMAIL_SCORE = 1.0                   # validated pattern match
+PHONE_SCORE = 0.4
+PHONE_REGIONS = ("US", "GB", "DE", "FR", "IL", "IN", "CA", "BR")
+PHONE_LENIENCY = 1
+
+OPERATORS = {
+    "PHONE_NUMBER": OperatorConfig("replace", {"new_value": "<PHONE>"}),
+    "EMAIL_ADDRESS": OperatorConfig("replace", {"new_value": "<EMAIL>"})
+}
+
 anonymizer = AnonymizerEngine()    # Replaces PII
-print("PII engines loaded successfully.")
+
+
+@lru_cache(maxsize=1)
+def presidio_analyzer() -> AnalyzerEngine:
+    print("Loading the Presidio analyzer...")
+    return AnalyzerEngine()
+
+
+@lru_cache(maxsize=4096)
+def _valid_email(candidate: str) -> bool:
+    return tldextract.extract(candidate).fqdn != ""
+
+
+def find_emails(text: str) -> List[RecognizerResult]:
+    if "@" not in text:
+        return []
+    return [
+        RecognizerResult("EMAIL_ADDRESS", match.start(), match.end(), EMAIL_SCORE)
+        for match in EMAIL_PATTERN.finditer(text)
+        if match.end() > match.start() and _valid_email(match.group())
+    ]
+
+
+def find_phone_numbers(text: str) -> List[RecognizerResult]:
+    if not any(c.isdigit() for c in text):
+        return []
+    return [
+        RecognizerResult("PHONE_NUMBER", match.start, match.end, PHONE_SCORE)
+        for region in PHONE_REGIONS
+        for match in phonenumbers.PhoneNumberMatcher(text, region, leniency=PHONE_LENIENCY)
+    ]
+
+
+def _redact(text: str, results: List[RecognizerResult]) -> str:
+    if not results:
+        return text
+    results = EntityRecognizer.remove_duplicates(results)
+    return anonymizer.anonymize(text=text, analyzer_results=results, operators=OPERATORS).text
 
 
 def redact_prompt(text: str) -> str:
@@ -16,30 +81,44 @@ def redact_prompt(text: str) -> str:
     with PII (like names, phones, emails) replaced.
     """
     try:
-        # 2. Find all PII entities in the text
-        analyzer_results = analyzer.analyze(text=text, language="en", entities=["PHONE_NUMBER", "EMAIL_ADDRESS"])
-
-        # Ensure analyzer_results is always a list
-        if not isinstance(analyzer_results, list):
-            analyzer_results = [analyzer_results]
-
-        # 3. Replace (anonymize) the entities we found
-        anonymized_result = anonymizer.anonymize(
-            text=text,
-            analyzer_results=analyzer_results,
-            operators={
-                "PHONE_NUMBER": OperatorConfig("replace", {"new_value": "<PHONE>"}),
-                "EMAIL_ADDRESS": OperatorConfig("replace", {"new_value": "<EMAIL>"})
-            }
-        )
-
-        return anonymized_result.text
+        results = find_emails(text) + find_phone_numbers(text)
+        if PRESIDIO_ENTITIES:
+            results += presidio_analyzer().analyze(text=text, language="en", entities=list(PRESIDIO_ENTITIES))
+        return _redact(text, results)
 
     except Exception as e:
         print(f"Error in PII redaction: {e}")
         return ""
 
 
+def redact_many(texts: Iterable[str], batch_size: int = 32) -> List[str]:
+    """
+    redact_prompt() for many texts. The Presidio fallback, if configured,
+    runs its NLP model over them in batches of batch_size; if the batch
+    fails, each text goes through redact_prompt() on its own.
+    """
+    texts = list(texts)
+    if PRESIDIO_ENTITIES:
+        try:
+            batch = BatchAnalyzerEngine(presidio_analyzer())
+            presidio_results = list(batch.analyze_iterator(texts, language="en", batch_size=batch_size,
+                                                           entities=list(PRESIDIO_ENTITIES)))
+        except Exception as e:
+            print(f"Error in PII redaction: {e}")
+            return [redact_prompt(text) for text in texts]
+    else:
+        presidio_results = [[] for _ in texts]
+
+    redacted = []
+    for text, extra in zip(texts, presidio_results):
+        try:
+            redacted.append(_redact(text, find_emails(text) + find_phone_numbers(text) + list(extra)))
+        except Exception as e:
+            print(f"Error in PII redaction: {e}")
+            redacted.append("")
+    return redacted
+
+
 # --- 4. Test the file directly ---
 if __name__ == "__main__":
     raw_prompt = (
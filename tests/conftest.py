@@ -42,6 +42,14 @@ def sample_mapping_config_yaml():
                     - { source: "Order Insert Timestamp", target: "order_insert_timestamp" }
            """
 
+def _mock_frame(df):
+    """A DataFrame mock whose rename() returns a mock of the renamed frame."""
+    mock_df = MagicMock(spec=pd.DataFrame)
+    mock_df.to_dict.return_value = df.to_dict('records')
+    mock_df.rename.side_effect = lambda columns: _mock_frame(df.rename(columns=columns))
+    mock_df.__len__.return_value = len(df)
+    return mock_df
+
 @pytest.fixture
 def mock_valid_dataframe():
     """A mock DataFrame with one valid row."""
@@ -50,10 +58,8 @@ def mock_valid_dataframe():
         'Order Insert Timestamp': ['2024-01-15 10:30:00']
     })
     # Create a mock that will be returned by pd.read_csv
-    mock_df = MagicMock(spec=pd.DataFrame)
-    mock_df.to_dict.return_value = df.to_dict('records')
+    mock_df = _mock_frame(df)
     mock_df.to_csv = MagicMock()
-    mock_df.__len__.return_value = len(df)
     return mock_df
 
 @pytest.fixture
@@ -64,13 +70,43 @@ def mock_invalid_dataframe():
         'Order Insert Timestamp': ['not-a-date']
     })
     # Create a mock that will be returned by pd.read_csv
-    mock_df = MagicMock(spec=pd.DataFrame)
-    mock_df.to_dict.return_value = df.to_dict('records')
-    mock_df.__len__.return_value = len(df)
-    return mock_df
+    return _mock_frame(df)
 
 @pytest.fixture
 def mock_get_validator(mocker):
     """Mocks the get_validator_model helper."""
     # Return the real Tracking model
-    return mocker.patch('etl.utils.get_validator_model', return_value=Tracking)
\ No newline at end of file
+    return mocker.patch('etl.utils.get_validator_model', return_value=Tracking)
+
+@pytest.fixture
+def tracking_config():
+    """A parsed mapping config for the tracking ingest job."""
+    return {
+        "tracking_ingest": {
+            "model_key": "tracking",
+            "target_table": "tracking",
+            "primary_key": "order_id",
+            "columns": [
+                {"source": "Order_ID", "target": "order_id", "dtype": "str"},
+                {"source": "Order Insert Timestamp", "target": "order_insert_timestamp", "dtype": "datetime"},
+            ],
+        }
+    }
+
+
+@pytest.fixture
+def tracking_table():
+    """A SQLAlchemy Table matching the Tracking model, without reflection."""
+    from sqlalchemy import Table, Column, MetaData, Text
+
+    return Table(
+        "tracking",
+        MetaData(),
+        *[Column(name, Text, primary_key=(name == "order_id")) for name in Tracking.model_fields],
+    )
+
+
+@pytest.fixture
+def mock_engine(mock_engine_and_conn):
+    """Just the mocked engine."""
+    return mock_engine_and_conn[0]
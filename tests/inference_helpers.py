@@ -0,0 +1,13 @@
+# tests/inference_helpers.py
+#
+# Picklable work for the inference pool tests, in a module that spawned
+# workers can import without loading the app.
+
+import time
+
+
+def slow_batch(items):
+    """A batch that keeps its worker busy for 0.2s; returns when it ran."""
+    started = time.time()
+    time.sleep(0.2)
+    return [(item, started, time.time()) for item in items]
@@ -0,0 +1,30 @@
+# tests/test_benchmarks_synthetic.py
+
+import pandas as pd
+
+from benchmarks.synthetic import write_dataset
+from etl.load_data import config
+from etl.column_validation import validate_frame
+from etl.utils import get_validator_model
+
+
+def test_source_layout_validates_with_the_requested_invalid_share(tmp_path):
+    mapping = config["rate_table_export"]
+    path = write_dataset("rate_table", 5_000, str(tmp_path / "rates.csv"), invalid_share=0.1, block_rows=1_000)
+
+    df = pd.read_csv(path).rename(columns={c["source"]: c["target"] for c in mapping["columns"]})
+    valid, failed = validate_frame(df, mapping, get_validator_model("rate_table"))
+
+    assert len(df) == 5_000
+    assert 350 < len(failed) < 650
+    assert len(valid) + len(failed) == 5_000
+    assert not df.duplicated(["origin", "destination", "product_id", "effective_date"]).any()
+
+
+def test_table_layout_follows_schema_column_order(tmp_path):
+    path = write_dataset("customers", 10, str(tmp_path / "customers.csv"), invalid_share=0.5, layout="table")
+
+    df = pd.read_csv(path)
+
+    assert list(df.columns) == ["customer_id", "customer_name", "contact_email", "account_tier", "created_at"]
+    assert df["contact_email"].str.contains("@").all()
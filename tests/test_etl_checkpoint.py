@@ -0,0 +1,114 @@
+# tests/test_etl_checkpoint.py
+
+import csv
+import os
+
+from etl.checkpoint import SourceCheckpoint
+from etl.load_data import load_incremental_data
+from etl.utils import split_byte_ranges
+
+
+def _write_source(path, bad_ids=()):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Order_ID", "Order Insert Timestamp"])
+        for i in range(1, 7):
+            writer.writerow([f"ORD{i}", "not-a-date" if i in bad_ids else "2024-01-15 10:30:00"])
+
+
+def test_checkpoint_is_discarded_when_the_file_changes(tmp_path):
+    source = tmp_path / "tracking.csv"
+    _write_source(source)
+    checkpoint = SourceCheckpoint("tracking_ingest", str(source), str(tmp_path / "ckpt"), {"chunk_size": 2})
+    checkpoint.save(2, 1, {"rows_read": 2}, "run1", {"count": 0, "files": [], "part": 0, "size": None})
+
+    assert SourceCheckpoint("tracking_ingest", str(source), str(tmp_path / "ckpt"), {"chunk_size": 2}).rows_committed == 2
+    assert SourceCheckpoint("tracking_ingest", str(source), str(tmp_path / "ckpt"), {"chunk_size": 3}).rows_committed == 0
+
+    _write_source(source, bad_ids=(1,))
+    assert SourceCheckpoint("tracking_ingest", str(source), str(tmp_path / "ckpt"), {"chunk_size": 2}).rows_committed == 0
+
+
+def test_resume_continues_after_last_committed_chunk(mocker, tracking_config, tracking_table, tmp_path):
+    """
+    The second commit fails; the re-run skips the committed chunk and the
+    DLQ ends up with each failed row exactly once.
+    """
+
+    mocker.patch('etl.load_data.config', tracking_config)
+    mocker.patch('etl.load_data.get_sqlalchemy_table', return_value=tracking_table)
+    source = tmp_path / "tracking.csv"
+    _write_source(source, bad_ids=(2, 5))
+    kwargs = dict(chunk_size=2, dlq_dir=str(tmp_path / "dlq"), checkpoint_dir=str(tmp_path / "ckpt"))
+
+    committed = []
+
+    def flaky_upsert(table, records, pk_column, engine):
+        if len(committed) == 1:
+            raise ConnectionError("server closed the connection unexpectedly")
+        committed.append([r["order_id"] for r in records])
+
+    mocker.patch('etl.load_data._upsert_records', side_effect=flaky_upsert)
+    first = load_incremental_data(str(source), 'tracking_ingest', mocker.MagicMock(), **kwargs)
+
+    assert first["error"] == "load"
+    assert committed == [["ORD1"]]
+    assert len(os.listdir(tmp_path / "ckpt")) == 1
+
+    committed.append(None)       # later commits succeed
+    mocker.patch('etl.load_data._upsert_records', side_effect=lambda t, records, pk, e: committed.append(
+        [r["order_id"] for r in records]))
+    second = load_incremental_data(str(source), 'tracking_ingest', mocker.MagicMock(), **kwargs)
+
+    assert second["error"] is None
+    assert committed[2:] == [["ORD3", "ORD4"], ["ORD6"]]
+    assert (second["rows_read"], second["valid"], second["failed"], second["upserted"]) == (6, 4, 2, 4)
+    assert second["dlq_files"] == first["dlq_files"][:1] + second["dlq_files"][1:]
+
+    failed_ids = []
+    for path in second["dlq_files"]:
+        with open(path) as f:
+            failed_ids += [row["original_data"].split("'order_id': '")[1][:4] for row in csv.DictReader(f)]
+    assert failed_ids == ["ORD2", "ORD5"]
+    assert os.listdir(tmp_path / "ckpt") == []
+
+
+def test_byte_range_partitions_resume_on_their_own(mocker, tracking_config, tracking_table, tmp_path):
+    mocker.patch('etl.load_data.config', tracking_config)
+    mocker.patch('etl.load_data.get_sqlalchemy_table', return_value=tracking_table)
+    source = tmp_path / "tracking.csv"
+    _write_source(source)
+    _, ranges = split_byte_ranges(str(source), 2)
+    with open(source, "rb") as f:
+        data = f.read()
+    ids = [[line.split(b",")[0].decode() for line in data[start:end].splitlines()] for start, end in ranges]
+    assert len(ids[1]) >= 2
+    kwargs = dict(chunk_size=1, dlq_dir=str(tmp_path / "dlq"), checkpoint_dir=str(tmp_path / "ckpt"),
+                  source_cache_dir=str(tmp_path / "cache"))
+
+    committed = []
+
+    def flaky_upsert(table, records, pk_column, engine):
+        if len(committed) == 1:
+            raise ConnectionError("server closed the connection unexpectedly")
+        committed.append(records[0]["order_id"])
+
+    mocker.patch('etl.load_data._upsert_records', side_effect=flaky_upsert)
+    first = load_incremental_data((str(source), *ranges[1]), 'tracking_ingest', mocker.MagicMock(), **kwargs)
+    assert first["error"] == "load" and committed == ids[1][:1]
+
+    mocker.patch('etl.load_data._upsert_records',
+                 side_effect=lambda t, records, pk, e: committed.append(records[0]["order_id"]))
+    other = load_incremental_data((str(source), *ranges[0]), 'tracking_ingest', mocker.MagicMock(), **kwargs)
+    assert other["error"] is None and committed[1:] == ids[0]
+    assert len(os.listdir(tmp_path / "ckpt")) == 1      # the failed range's checkpoint is kept
+
+    del committed[:]
+    second = load_incremental_data((str(source), *ranges[1]), 'tracking_ingest', mocker.MagicMock(), **kwargs)
+
+    assert second["error"] is None
+    assert committed == ids[1][1:]                      # resumed after the committed row
+    assert (second["rows_read"], second["upserted"]) == (len(ids[1]), len(ids[1]))
+    assert os.listdir(tmp_path / "ckpt") == []
+    # each range is cached on its own
+    assert len([d for d in os.listdir(tmp_path / "cache") if d != "hashes.json"]) == 2
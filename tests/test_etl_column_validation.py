@@ -0,0 +1,111 @@
+# tests/test_etl_column_validation.py
+
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from ml.validation_model import Tracking, Customer
+from etl.column_validation import check_columns, validate_frame, normalize_record
+
+
+TRACKING_MAPPING = {
+    "columns": [
+        {"source": "Order ID", "target": "order_id", "dtype": "str"},
+        {"source": "User ID", "target": "user_id", "dtype": "int"},
+        {"source": "Transaction Date (UTC)", "target": "transaction_date", "dtype": "datetime"},
+        {"source": "Invoice", "target": "invoice_amount", "dtype": "numeric"},
+        {"source": "Carrier", "target": "carrier", "dtype": "str"},
+    ]
+}
+
+
+def _validate_row_by_row(df, model):
+    valid, failed = [], []
+    for record in df.to_dict('records'):
+        try:
+            valid.append(model(**normalize_record(record)).dict())
+        except ValidationError:
+            failed.append(record)
+    return valid, failed
+
+
+def _without(records, *keys):
+    return [{k: v for k, v in r.items() if k not in keys} for r in records]
+
+
+def _typed(records):
+    """Values with their types, so that 1 vs 1.0 or +05:30 vs UTC do not compare equal."""
+    return [{k: (type(v), repr(v)) for k, v in r.items()} for r in records]
+
+
+@pytest.fixture
+def mixed_tracking_frame():
+    """Good rows and rows that break each column check (the last two with non-ASCII digits)."""
+    return pd.DataFrame({
+        'order_id': ['A1', 'A2', None, 'A4', 'A5', 'A6', 5, 'A8', 'A9', 'A10'],
+        'user_id': [1, 2.0, '3', ' 4 ', '5.0', None, 7, True, '١٢', '12'],
+        'transaction_date': ['2024-01-15 10:30:00', '2024-01-15T10:30:00Z', '2024-02-30',
+                             '2024-01-15T10:30:00+02:00', None, '01/02/2024', '2024-01-15', '2024-01-15 10:30',
+                             '2024-01-15', '٢٠٢٤-01-15'],
+        'invoice_amount': [1.1, '2.50', ' 3 ', 'abc', None, '1e3', float('inf'), 'nan', '١٢', '1.٥'],
+        'carrier': ['UPS', None, 'x', 3, 'y', 'z', 'w', 'v', 'u', 't'],
+    })
+
+
+def test_validate_frame_matches_pydantic(mixed_tracking_frame):
+    """The columnar engine accepts, rejects and coerces exactly like the model."""
+
+    valid, failed = validate_frame(mixed_tracking_frame, TRACKING_MAPPING, Tracking)
+    expected_valid, expected_failed = _validate_row_by_row(mixed_tracking_frame, Tracking)
+
+    assert _typed(_without(valid, 'last_updated')) == _typed(_without(expected_valid, 'last_updated'))
+    assert len(failed) == len(expected_failed)
+    assert all("validation_error" in f for f in failed)
+
+
+def test_validate_frame_keeps_ints_and_offsets_of_string_columns():
+    """A string column with bad ints still gives int values; offsets are kept as given."""
+
+    df = pd.DataFrame({
+        'order_id': pd.Series(['A1', 'A2', 'A3', 'A4', 'A5'], dtype="string"),
+        'user_id': pd.Series(['1', 'x', None, ' 4 ', '5'], dtype="string"),
+        'transaction_date': pd.Series(['2024-01-15T10:30:00+05:30', '2024-01-15T10:30:00Z', None,
+                                       '2024-01-15 10:30:00', '2024-01-15T10:30:00-08:00'], dtype="string"),
+    })
+
+    valid, failed = validate_frame(df, TRACKING_MAPPING, Tracking)
+    expected_valid, expected_failed = _validate_row_by_row(df, Tracking)
+
+    assert _typed(_without(valid, 'last_updated')) == _typed(_without(expected_valid, 'last_updated'))
+    assert len(failed) == len(expected_failed) == 1
+    assert valid[0]['user_id'] == 1 and type(valid[0]['user_id']) is int
+    assert valid[0]['transaction_date'].utcoffset().total_seconds() == 5.5 * 3600
+
+
+def test_check_columns_reports_bad_cells(mixed_tracking_frame):
+    """Bad rows are masked and each bad cell gets a reason."""
+
+    _, bad_rows, cell_errors = check_columns(mixed_tracking_frame, TRACKING_MAPPING, Tracking)
+
+    assert not bad_rows[0]
+    assert bad_rows[2]
+    assert cell_errors[2]['order_id'] == "missing required value"
+    assert cell_errors[3]['carrier'] == "expected a string"
+    assert 'transaction_date' in cell_errors[5]
+
+
+def test_validate_frame_runs_field_validators_and_constraints():
+    """Before-validators (strip_whitespace) and length limits are applied per column."""
+
+    df = pd.DataFrame({
+        'customer_name': ['  Bob ', '', None, 'Al'],
+        'contact_email': ['a@b.com', 'bad', None, 'a@b.com'],
+        'account_tier': ['client', 'x' * 30, 'visitor', None],
+    })
+
+    valid, failed = validate_frame(df, {}, Customer)
+    expected_valid, expected_failed = _validate_row_by_row(df, Customer)
+
+    assert _without(valid, 'customer_id', 'created_at') == _without(expected_valid, 'customer_id', 'created_at')
+    assert valid[0]['customer_name'] == 'Bob'
+    assert len(failed) == len(expected_failed) == 3
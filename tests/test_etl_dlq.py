@@ -0,0 +1,41 @@
+# tests/test_etl_dlq.py
+
+import json
+
+import pytest
+
+from etl.dlq import DeadLetterQueue
+
+
+def _failure(i):
+    return {"original_data": {"order_id": f"ORD{i}"}, "validation_error": "bad date"}
+
+
+def test_dlq_buffers_and_writes_on_close(tmp_path):
+    """Rows are buffered and written through one handle when the DLQ closes."""
+
+    with DeadLetterQueue("tracking_ingest", directory=str(tmp_path), batch_size=100, flush_interval=60) as dlq:
+        dlq.write_many(_failure(i) for i in range(3))
+        assert dlq.files == []      # nothing flushed yet
+
+    assert dlq.summary() == {"failed": 3, "dlq_files": dlq.files}
+    with open(dlq.files[0]) as f:
+        assert len(f.read().splitlines()) == 4   # header + 3 rows
+
+
+def test_dlq_rotates_by_size(tmp_path):
+    """A new part file is started once the current one passes max_bytes."""
+
+    with DeadLetterQueue("tracking_ingest", directory=str(tmp_path), fmt="jsonl",
+                         batch_size=2, max_bytes=1) as dlq:
+        dlq.write_many(_failure(i) for i in range(6))
+
+    assert len(dlq.files) == 3
+    assert dlq.files[0].endswith("_0001.jsonl")
+    rows = [json.loads(line) for path in dlq.files for line in open(path)]
+    assert [r["original_data"]["order_id"] for r in rows] == [f"ORD{i}" for i in range(6)]
+
+
+def test_dlq_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match="Unknown DLQ format"):
+        DeadLetterQueue("tracking_ingest", directory=str(tmp_path), fmt="xml")
@@ -0,0 +1,37 @@
+# tests/test_etl_fingerprint.py
+
+import datetime as dt
+from decimal import Decimal
+
+from etl.fingerprint import row_fingerprint, filter_changed, SidecarFingerprintIndex
+
+
+def test_row_fingerprint_uses_canonical_form():
+    """Equal values in different spellings hash the same; volatile columns are ignored."""
+
+    a = {"order_id": "ORD1", "invoice_amount": Decimal("1.50"),
+         "transaction_date": dt.datetime(2024, 1, 15, 12, 0, tzinfo=dt.timezone.utc),
+         "last_updated": dt.datetime(2024, 1, 1)}
+    b = {"transaction_date": dt.datetime(2024, 1, 15, 14, 0, tzinfo=dt.timezone(dt.timedelta(hours=2))),
+         "invoice_amount": Decimal("1.5"), "order_id": "ORD1",
+         "last_updated": dt.datetime(2025, 6, 1)}
+
+    assert row_fingerprint(a) == row_fingerprint(b)
+    assert row_fingerprint(a) != row_fingerprint({**a, "invoice_amount": Decimal("2")})
+
+
+def test_filter_changed_with_sidecar_index(tmp_path):
+    index = SidecarFingerprintIndex("tracking", directory=str(tmp_path))
+    first = [{"order_id": "ORD1", "carrier": "UPS"}, {"order_id": "ORD2", "carrier": "DHL"}]
+
+    changed, fingerprints, counts = filter_changed(first, "order_id", index)
+    assert counts == {"inserted": 2, "updated": 0, "skipped": 0}
+    index.update(fingerprints)
+
+    second = [{"order_id": "ORD1", "carrier": "UPS"}, {"order_id": "ORD2", "carrier": "FedEx"},
+              {"order_id": "ORD3", "carrier": "USPS"}]
+    changed, _, counts = filter_changed(second, "order_id", index)
+
+    assert counts == {"inserted": 1, "updated": 1, "skipped": 1}
+    assert [r["order_id"] for r in changed] == ["ORD2", "ORD3"]
+    index.close()
@@ -0,0 +1,93 @@
+# tests/test_etl_job_runner.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from etl import job_runner
+from etl.job_runner import build_job_graph, run_jobs
+
+
+MAPPING = {
+    "customer_export": {"target_table": "customers"},
+    "tracking_export": {"target_table": "tracking", "depends_on": ["customer_export"]},
+    "rate_table_export": {"target_table": "rate_table"},
+}
+
+
+@pytest.fixture(autouse=True)
+def mock_create_engine(mocker):
+    """Workers build their own engine; no database is needed here."""
+    return mocker.patch.object(job_runner, "create_engine")
+
+
+def _result(rows):
+    return {"rows_read": rows, "valid": rows, "failed": 0, "upserted": rows, "dlq_files": [], "error": None}
+
+
+def test_build_job_graph_reads_depends_on():
+    graph = build_job_graph({"customer_export": "c.csv", "tracking_export": "t.csv"}, MAPPING)
+    assert graph == {"customer_export": set(), "tracking_export": {"customer_export"}}
+
+
+def test_build_job_graph_rejects_cycles():
+    mapping = {"a": {"depends_on": ["b"]}, "b": {"depends_on": ["a"]}}
+    with pytest.raises(ValueError, match="cycle"):
+        build_job_graph({"a": "a.csv", "b": "b.csv"}, mapping)
+
+
+def test_run_jobs_respects_dependencies(mocker):
+    order = []
+
+    def fake_load(source, config_key, engine, **kwargs):
+        order.append(config_key)
+        return _result(10)
+
+    mocker.patch.object(job_runner, "load_incremental_data", side_effect=fake_load)
+    jobs = {"tracking_export": "t.csv", "customer_export": "c.csv", "rate_table_export": "r.csv", "missing": "m.csv"}
+
+    summary = run_jobs(jobs, "postgresql://u:p@localhost/db", max_workers=2,
+                       executor_class=ThreadPoolExecutor, mapping_config=MAPPING)
+
+    assert order.index("customer_export") < order.index("tracking_export")
+    assert set(summary["jobs"]) == {"tracking_export", "customer_export", "rate_table_export"}
+    assert summary["jobs"]["tracking_export"]["upserted"] == 10
+    assert summary["wall_clock_seconds"] >= 0
+
+
+def test_run_jobs_skips_dependents_of_failed_job(mocker):
+    def fake_load(source, config_key, engine, **kwargs):
+        result = _result(0)
+        result["error"] = "load" if config_key == "customer_export" else None
+        return result
+
+    mocker.patch.object(job_runner, "load_incremental_data", side_effect=fake_load)
+
+    summary = run_jobs({"customer_export": "c.csv", "tracking_export": "t.csv"}, "postgresql://u:p@localhost/db",
+                       executor_class=ThreadPoolExecutor, mapping_config=MAPPING)
+
+    assert summary["jobs"]["customer_export"]["status"] == "failed"
+    assert summary["jobs"]["tracking_export"]["status"] == "skipped"
+
+
+def test_run_jobs_partitions_only_csv_sources(mocker, tmp_path):
+    sources = []
+
+    def fake_load(source, config_key, engine, **kwargs):
+        sources.append((config_key, source))
+        return _result(1)
+
+    mocker.patch.object(job_runner, "load_incremental_data", side_effect=fake_load)
+    csv_path = tmp_path / "c.csv"
+    csv_path.write_text("id\n" + "".join(f"{i}\n" for i in range(1000)))
+    xlsx_path = tmp_path / "t.xlsx"
+    xlsx_path.write_bytes(b"PK\x03\x04" + b"\x00" * 4096)     # a zip container must not be byte-split
+    mapping = {"customer_export": {"target_table": "customers", "partitions": 4},
+               "tracking_export": {"target_table": "tracking", "partitions": 4}}
+
+    summary = run_jobs({"customer_export": str(csv_path), "tracking_export": str(xlsx_path)},
+                       "postgresql://u:p@localhost/db", executor_class=ThreadPoolExecutor, mapping_config=mapping)
+
+    assert sum(1 for key, _ in sources if key == "customer_export") == 4
+    assert [source for key, source in sources if key == "tracking_export"] == [str(xlsx_path)]
+    assert summary["jobs"]["tracking_export"]["status"] == "ok"
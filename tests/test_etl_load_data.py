@@ -6,12 +6,12 @@ from unittest.mock import patch, mock_open, call, MagicMock
 
 # Import the functions we are testing
 from etl.load_data import load_incremental_data as load_data
-from etl.bulk_load_initial import bulk_load_historical
+from etl.bulk_load_initial import bulk_load_historical, bulk_load_streaming
 
 
 def test_load_data_success(mocker, mock_engine_and_conn, 
-                           sample_mapping_config_yaml, mock_valid_dataframe,
-                           mock_get_validator):
+                           tracking_config, mock_valid_dataframe,
+                           tracking_table, tmp_path):
     """
     Tests the full 'happy path' of the incremental load.
     It checks that valid data is read, validated, and upserted.
@@ -19,18 +19,15 @@ def test_load_data_success(mocker, mock_engine_and_conn,
 
     mock_engine, mock_db_conn = mock_engine_and_conn
 
-    config_dict = yaml.safe_load(sample_mapping_config_yaml)
-    mocker.patch('etl.load_data.yaml.safe_load', return_value=config_dict)
+    mocker.patch('etl.load_data.config', tracking_config)
     mocker.patch('pandas.read_csv', return_value=mock_valid_dataframe)
-    mocker.patch('csv.DictWriter', autospec=True)
+    mocker.patch('etl.load_data.get_sqlalchemy_table', return_value=tracking_table)
     
-    mock_table = MagicMock()
-    mocker.patch('etl.utils.get_sqlalchemy_table', return_value=mock_table)
-    
-    failed_records = load_data(
+    result = load_data(
         csv_path='dummy.csv', 
         config_key='tracking_ingest', 
-        engine=mock_engine
+        engine=mock_engine,
+        dlq_dir=str(tmp_path)
     )
     
     mock_engine.begin.assert_called_once()
@@ -39,50 +36,46 @@ def test_load_data_success(mocker, mock_engine_and_conn,
     executed_sql_obj = mock_db_conn.execute.call_args[0][0]
     sql_string = str(executed_sql_obj)
     
-    assert len(failed_records) == 0
+    assert result['failed'] == 0
+    assert result['upserted'] == 1
+    assert result['dlq_files'] == []
     assert "INSERT INTO" in sql_string.upper()
     assert "ON CONFLICT" in sql_string.upper()
 
 
 def test_load_data_validation_error_dlq(mocker, mock_engine_and_conn,
-                                        sample_mapping_config_yaml, mock_invalid_dataframe,
-                                        mock_get_validator):
+                                        tracking_config, mock_invalid_dataframe,
+                                        tmp_path):
     """
     Tests the 'error path' where Pydantic validation fails.
     Checks that the DLQ file is written to and the database is NOT called.
     """
 
     mock_engine, mock_db_conn = mock_engine_and_conn
-    # 1. Mock the config file loading
-    config_dict = yaml.safe_load(sample_mapping_config_yaml)
-    mocker.patch('etl.load_data.config', config_dict)
+    # 1. Mock the config
+    mocker.patch('etl.load_data.config', tracking_config)
     
     # 2. Mock file reads, this time returning an *invalid* DataFrame
     mocker.patch('pandas.read_csv', return_value=mock_invalid_dataframe)
     
-    # 3. Mock the csv.DictWriter to check what's written to the DLQ
-    mock_writer = MagicMock()
-    mocker.patch('csv.DictWriter', return_value=mock_writer)
-    
-    # 4. Mock the file open operation
-    m_open = mock_open()
-    mocker.patch('builtins.open', m_open)
-    
     # --- Act ---
-    failed_records = load_data(
+    result = load_data(
         csv_path='dummy.csv', 
         config_key='tracking_ingest', 
-        engine=mock_engine
+        engine=mock_engine,
+        dlq_dir=str(tmp_path)
     )
     
     # --- Assert ---
-    # 1. Check that one record failed
-    assert len(failed_records) == 1
-    assert "validation_error" in failed_records[0]
+    # 1. Check that one record failed and only the count is returned
+    assert result['failed'] == 1
+    assert len(result['dlq_files']) == 1
     
     # 2. Check that the DLQ was written to
-    mock_writer.writeheader.assert_called()
-    mock_writer.writerow.assert_called()
+    with open(result['dlq_files'][0]) as f:
+        lines = f.read().splitlines()
+    assert lines[0] == "original_data,validation_error"
+    assert "ORD456" in lines[1]
     
     # 3. Check that the database was NEVER called (because no rows were valid)
     mock_engine.begin.assert_not_called()
@@ -121,4 +114,154 @@ def test_bulk_load_historical(mocker, mock_engine_and_conn, mock_raw_conn_cursor
     mock_cursor.copy_from.assert_called_once_with(mock_buffer, 'tracking', sep=',', null="")
     
     # 3. Check that the transaction was committed
-    mock_conn.commit.assert_called_once()
\ No newline at end of file
+    mock_conn.commit.assert_called_once()
+
+def test_load_data_chunked(mocker, mock_engine_and_conn, tracking_config, tracking_table, tmp_path):
+    """
+    Tests the streaming mode.
+    Each chunk is validated and upserted in its own transaction.
+    """
+
+    mock_engine, mock_db_conn = mock_engine_and_conn
+    mocker.patch('etl.load_data.config', tracking_config)
+    mocker.patch('etl.load_data.get_sqlalchemy_table', return_value=tracking_table)
+
+    chunks = [
+        pd.DataFrame({'Order_ID': ['ORD1', 'ORD2'], 'Order Insert Timestamp': ['2024-01-15 10:30:00'] * 2}),
+        pd.DataFrame({'Order_ID': ['ORD3', 'ORD4'], 'Order Insert Timestamp': ['2024-01-15 10:30:00', 'not-a-date']}),
+    ]
+    mock_read_csv = mocker.patch('pandas.read_csv', return_value=iter(chunks))
+    progress = MagicMock()
+
+    result = load_data(
+        csv_path='dummy.csv',
+        config_key='tracking_ingest',
+        engine=mock_engine,
+        chunk_size=2,
+        progress_callback=progress,
+        dlq_dir=str(tmp_path)
+    )
+
+    assert mock_read_csv.call_args.kwargs['chunksize'] == 2
+    assert mock_engine.begin.call_count == 2
+    assert mock_db_conn.execute.call_count == 2
+    assert result['failed'] == 1
+    assert result['upserted'] == 3
+
+    reports = [c.args[0] for c in progress.call_args_list]
+    assert [r['chunk'] for r in reports] == [1, 2]
+    assert reports[-1]['rows_read'] == 4
+    assert reports[-1]['valid'] == 1 and reports[-1]['failed'] == 1
+
+
+def test_load_data_chunked_stops_on_db_error(mocker, mock_engine_and_conn, tracking_config, tracking_table):
+    """
+    Tests that a failed commit stops the stream instead of loading later chunks.
+    """
+
+    mock_engine, mock_db_conn = mock_engine_and_conn
+    mock_db_conn.execute.side_effect = RuntimeError("connection lost")
+    mocker.patch('etl.load_data.config', tracking_config)
+    mocker.patch('etl.load_data.get_sqlalchemy_table', return_value=tracking_table)
+
+    chunks = [
+        pd.DataFrame({'Order_ID': [f'ORD{i}'], 'Order Insert Timestamp': ['2024-01-15 10:30:00']})
+        for i in range(5)
+    ]
+    mocker.patch('pandas.read_csv', return_value=iter(chunks))
+
+    result = load_data(csv_path='dummy.csv', config_key='tracking_ingest', engine=mock_engine, chunk_size=1)
+
+    # Chunk 1 fails while chunk 2 is validated; the error surfaces before chunk 2 is submitted
+    assert mock_db_conn.execute.call_count == 1
+    assert result['error'] == "load"
+    assert result['upserted'] == 0
+
+
+def test_bulk_load_streaming_reads_source_file_directly(mock_engine_and_conn, mock_raw_conn_cursor, tmp_path):
+    """
+    When every source column is loaded, COPY reads the file itself
+    and the header becomes the COPY column list.
+    """
+
+    mock_engine, _ = mock_engine_and_conn
+    mock_conn, mock_cursor = mock_raw_conn_cursor
+    path = tmp_path / "tracking.csv"
+    path.write_text("Order ID,Carrier\nORD1,UPS\nORD2,DHL\n")
+
+    copied = []
+    mock_cursor.copy_expert.side_effect = lambda sql, stream: copied.append(stream.read())
+
+    bulk_load_streaming(str(path), "tracking", mock_engine,
+                        column_map={"Order ID": "order_id", "Carrier": "carrier"})
+
+    copy_sql = mock_cursor.copy_expert.call_args.args[0]
+    assert copy_sql == 'COPY "tracking" ("order_id", "carrier") FROM STDIN WITH (FORMAT csv, HEADER true)'
+    assert copied == [path.read_text()]
+    mock_conn.commit.assert_called_once()
+
+
+def test_bulk_load_streaming_drops_unmapped_columns_in_parallel(mock_engine_and_conn, mock_raw_conn_cursor, tmp_path):
+    """
+    Unmapped columns are stripped line by line, and each byte range
+    is COPYed on its own connection.
+    """
+
+    mock_engine, _ = mock_engine_and_conn
+    _, mock_cursor = mock_raw_conn_cursor
+    path = tmp_path / "tracking.csv"
+    path.write_text("Order ID,Notes,Carrier\n" + "".join(f"ORD{i},x,UPS\n" for i in range(40)))
+
+    copied = []
+    mock_cursor.copy_expert.side_effect = lambda sql, stream: copied.append(stream.read())
+
+    bulk_load_streaming(str(path), "tracking", mock_engine,
+                        column_map={"Order ID": "order_id", "Carrier": "carrier"}, workers=4)
+
+    assert mock_engine.raw_connection.call_count == 4
+    rows = sorted(line for text in copied for line in text.splitlines()[1:])
+    assert rows == sorted(f"ORD{i},UPS" for i in range(40))
+
+
+def test_bulk_load_streaming_closes_the_file_when_selecting_columns(mocker, mock_engine_and_conn,
+                                                                  mock_raw_conn_cursor, tmp_path):
+    """
+    The file under the column-selecting stream is closed, even when COPY fails.
+    """
+
+    mock_engine, _ = mock_engine_and_conn
+    _, mock_cursor = mock_raw_conn_cursor
+    path = tmp_path / "tracking.csv"
+    path.write_text("Order ID,Notes,Carrier\nORD1,x,UPS\n")
+
+    opened = []
+    real_open = open
+    mocker.patch("builtins.open", side_effect=lambda *a, **k: opened.append(real_open(*a, **k)) or opened[-1])
+    mock_cursor.copy_expert.side_effect = RuntimeError("COPY failed")
+
+    rows = bulk_load_streaming(str(path), "tracking", mock_engine,
+                               column_map={"Order ID": "order_id", "Carrier": "carrier"})
+
+    assert rows == 0
+    assert opened and all(f.closed for f in opened)
+
+
+def test_load_data_skips_unchanged_rows(mocker, mock_engine_and_conn, tracking_config, tracking_table, tmp_path):
+    """
+    A second load of the same file upserts nothing when change detection is on.
+    """
+
+    mock_engine, mock_db_conn = mock_engine_and_conn
+    mocker.patch('etl.load_data.config', tracking_config)
+    mocker.patch('etl.load_data.get_sqlalchemy_table', return_value=tracking_table)
+    mocker.patch('etl.fingerprint.FINGERPRINT_DIR', str(tmp_path))
+
+    df = pd.DataFrame({'Order_ID': ['ORD1', 'ORD2'], 'Order Insert Timestamp': ['2024-01-15 10:30:00'] * 2})
+    mocker.patch('pandas.read_csv', side_effect=lambda *a, **k: df.copy())
+
+    first = load_data('dummy.csv', 'tracking_ingest', mock_engine, change_detection="sidecar", dlq_dir=str(tmp_path))
+    second = load_data('dummy.csv', 'tracking_ingest', mock_engine, change_detection="sidecar", dlq_dir=str(tmp_path))
+
+    assert (first['inserted'], first['upserted']) == (2, 2)
+    assert (second['skipped'], second['upserted']) == (2, 0)
+    assert mock_db_conn.execute.call_count == 1
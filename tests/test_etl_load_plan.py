@@ -0,0 +1,129 @@
+# tests/test_etl_load_plan.py
+
+from decimal import Decimal
+
+from sqlalchemy import Boolean
+
+import etl.load_plan as load_plan
+from etl.load_data import load_incremental_data
+from etl.load_plan import parse_schema_sql, compile_load_plan, load_plans, plan_table, apply_converters
+
+
+SCHEMA = """
+-- CREATE TABLE commented_out (id INT);
+CREATE TABLE tracking (
+    order_id TEXT PRIMARY KEY,
+    invoice_amount NUMERIC(10,2),
+    surcharge_applied BOOLEAN,
+    order_insert_timestamp TIMESTAMPTZ,
+    last_updated TIMESTAMPTZ DEFAULT NOW()
+);
+"""
+
+MAPPING = """
+tracking_ingest:
+  model_key: "tracking"
+  target_table: "tracking"
+  primary_key: "order_id"
+  columns:
+    - { source: "Order_ID", target: "order_id", dtype: "str" }
+    - { source: "Order Insert Timestamp", target: "order_insert_timestamp", dtype: "datetime" }
+"""
+
+
+def test_parse_schema_sql_reads_columns_and_primary_key():
+    tables = parse_schema_sql(SCHEMA)
+
+    assert list(tables) == ["tracking"]
+    assert tables["tracking"]["primary_key"] == "order_id"
+    assert tables["tracking"]["columns"]["invoice_amount"] == "numeric"
+    assert tables["tracking"]["columns"]["order_insert_timestamp"] == "timestamp with time zone"
+
+
+def test_compile_load_plan_reports_mapping_table_mismatch():
+    tables = parse_schema_sql(SCHEMA)
+    mapping = {
+        "model_key": "customers",
+        "target_table": "tracking",
+        "primary_key": "order_id",
+        "columns": [
+            {"source": "Surcharge", "target": "surcharge_applied", "dtype": "numeric"},
+            {"source": "Zone", "target": "zone_used", "dtype": "str"},
+        ],
+    }
+
+    plan = compile_load_plan("tracking_ingest", mapping, tables)
+
+    assert "column 'surcharge_applied' is 'numeric' in the mapping but boolean in 'tracking'" in plan["problems"]
+    assert "column 'zone_used' does not exist in 'tracking'" in plan["problems"]
+    assert plan["rename_map"] == {"Surcharge": "surcharge_applied", "Zone": "zone_used"}
+
+
+def test_load_plans_reuses_disk_cache(tmp_path, mocker):
+    (tmp_path / "mapping.yml").write_text(MAPPING)
+    paths = dict(mapping_path=str(tmp_path / "mapping.yml"), schema_path=load_plan.SCHEMA_PATH,
+                 cache_dir=str(tmp_path / "plans"))
+    mocker.patch.object(load_plan, "_PLAN_CACHE", {})
+
+    first = load_plans(**paths)
+    load_plan._PLAN_CACHE.clear()
+    safe_load = mocker.patch("etl.load_plan.yaml.safe_load")
+    second = load_plans(**paths)
+
+    safe_load.assert_not_called()
+    assert second == first
+    plan = second["plans"]["tracking_ingest"]
+    assert plan["problems"] == []
+    assert plan["converters"] == {}
+    assert [c.name for c in plan_table(plan).primary_key] == ["order_id"]
+
+
+def test_repo_mapping_compiles_against_schema_sql(tmp_path, mocker):
+    mocker.patch.object(load_plan, "_PLAN_CACHE", {})
+
+    plans = load_plans(cache_dir=str(tmp_path))["plans"]
+
+    assert {key: plan["problems"] for key, plan in plans.items()} == {key: [] for key in plans}
+    plan = plans["tracking_export"]
+    # 0/1 flags, validated as Decimal by the model, stored in BOOLEAN columns
+    assert plan["converters"] == {"fulfillment_without_surcharge": "bool", "surcharge_applied": "bool"}
+    assert isinstance(plan_table(plan).c.surcharge_applied.type, Boolean)
+    records = [{"surcharge_applied": Decimal("1"), "fulfillment_without_surcharge": Decimal("0")},
+               {"surcharge_applied": None},
+               {"surcharge_applied": Decimal("2.50")}]
+    converted, failed = apply_converters(records, plan["converters"])
+    assert converted == [{"surcharge_applied": True, "fulfillment_without_surcharge": False},
+                         {"surcharge_applied": None}]
+    assert failed == [{"original_data": {"surcharge_applied": Decimal("2.50")},
+                       "validation_error": "expected 0 or 1, got Decimal('2.50')"}]
+
+
+def test_load_with_plan_sends_non_flag_values_to_the_dlq(mocker, tmp_path):
+    mapping = {"model_key": "tracking", "target_table": "tracking", "primary_key": "order_id",
+               "columns": [{"source": "Order_ID", "target": "order_id", "dtype": "str"},
+                           {"source": "Surcharge Applied", "target": "surcharge_applied", "dtype": "bool"}]}
+    mocker.patch("etl.load_data.config", {"tracking_ingest": mapping})
+    mocker.patch("etl.load_plan._model_field_names", return_value=["order_id", "surcharge_applied"])
+    mocker.patch("etl.load_data.get_load_plan",
+                 return_value=compile_load_plan("tracking_ingest", mapping, parse_schema_sql(SCHEMA)))
+    upsert = mocker.patch("etl.load_data._upsert_records")
+    source = tmp_path / "tracking.csv"
+    source.write_text("Order_ID,Surcharge Applied\nORD1,1\nORD2,2.50\nORD3,0\n")
+
+    result = load_incremental_data(str(source), "tracking_ingest", mocker.MagicMock(), use_load_plan=True,
+                                   dlq_dir=str(tmp_path))
+
+    assert (result["valid"], result["failed"]) == (2, 1)
+    records = upsert.call_args.args[1]
+    assert [(r["order_id"], r["surcharge_applied"]) for r in records] == [("ORD1", True), ("ORD3", False)]
+
+
+def test_load_with_plan_refuses_mismatch_before_reading(mocker, tracking_config):
+    mocker.patch("etl.load_data.config", tracking_config)
+    mocker.patch("etl.load_data.get_load_plan", return_value={"problems": ["column 'x' does not exist"]})
+    read_source = mocker.patch("etl.load_data.read_source")
+
+    result = load_incremental_data("tracking.csv", "tracking_ingest", mocker.MagicMock(), use_load_plan=True)
+
+    assert result["error"] == "config"
+    read_source.assert_not_called()
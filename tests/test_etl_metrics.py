@@ -0,0 +1,85 @@
+# tests/test_etl_metrics.py
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from etl import job_runner
+from etl.load_data import load_incremental_data
+from etl.metrics import LoadMetrics, prometheus_text
+
+
+def test_load_metrics_per_chunk_stages_and_counts():
+    metrics = LoadMetrics("tracking_export", "tracking.csv")
+
+    for chunk, frame in enumerate(metrics.timed([1, 2], "read"), start=1):
+        with metrics.stage("validate", chunk):
+            pass
+        metrics.count(chunk, rows_read=10, valid=9, failed=1)
+        metrics.bytes_position(chunk * 100, chunk)
+
+    worker = threading.Thread(target=lambda: metrics.add("upsert", 0.5, chunk=2))
+    worker.start()
+    worker.join()
+    report = metrics.report()
+
+    assert report["rows_read"] == 20 and report["failed"] == 2 and report["bytes_read"] == 200
+    assert [c["chunk"] for c in report["chunks"]] == [1, 2]
+    assert set(report["chunks"][1]["stages"]) == {"read", "validate", "upsert"}
+    assert report["chunks"][1]["bytes_read"] == 100
+    assert report["stages"]["upsert"] == 0.5
+    json.dumps(report)
+
+
+def test_prometheus_text_has_one_series_per_job_and_stage():
+    report = LoadMetrics("tracking_export").report()
+    report["stages"] = {"read": 1.5, "upsert": 2.0}
+
+    text = prometheus_text([report])
+
+    assert "# TYPE shipcube_etl_stage_seconds gauge" in text
+    assert 'shipcube_etl_stage_seconds{job="tracking_export",stage="read"} 1.5' in text
+    assert 'shipcube_etl_rows{job="tracking_export",outcome="upserted"} 0' in text
+
+
+def test_load_incremental_data_reports_stages(mocker, mock_engine_and_conn, tracking_config, tracking_table, tmp_path):
+    mock_engine, _ = mock_engine_and_conn
+    mocker.patch('etl.load_data.config', tracking_config)
+    mocker.patch('etl.load_data.get_sqlalchemy_table', return_value=tracking_table)
+    chunks = [
+        pd.DataFrame({'Order_ID': ['ORD1'], 'Order Insert Timestamp': ['2024-01-15 10:30:00']}),
+        pd.DataFrame({'Order_ID': ['ORD2'], 'Order Insert Timestamp': ['not-a-date']}),
+    ]
+    mocker.patch('pandas.read_csv', return_value=iter(chunks))
+
+    result = load_incremental_data('dummy.csv', 'tracking_ingest', mock_engine, chunk_size=1, dlq_dir=str(tmp_path))
+    report = result["metrics"]
+
+    assert {"read", "rename", "validate", "dlq", "reflect", "upsert", "wait_commit"} <= set(report["stages"])
+    assert [(c["rows_read"], c["valid"], c["failed"]) for c in report["chunks"]] == [(1, 1, 0), (1, 0, 1)]
+    assert report["upserted"] == result["upserted"] == 1
+
+
+def test_run_jobs_writes_run_report_and_metrics(mocker, tmp_path):
+    mocker.patch.object(job_runner, "create_engine")
+
+    def fake_load(source, config_key, engine, **kwargs):
+        metrics = LoadMetrics(config_key, source)
+        metrics.add("read", 0.25, chunk=1)
+        metrics.count(1, rows_read=5, valid=5, upserted=5)
+        return {"rows_read": 5, "valid": 5, "failed": 0, "upserted": 5, "dlq_files": [], "error": None,
+                "metrics": metrics.report()}
+
+    mocker.patch.object(job_runner, "load_incremental_data", side_effect=fake_load)
+
+    job_runner.run_jobs({"customer_export": "c.csv"}, "postgresql://u:p@localhost/db",
+                        executor_class=ThreadPoolExecutor, mapping_config={"customer_export": {}},
+                        report_path=str(tmp_path / "run.json"), metrics_path=str(tmp_path / "etl.prom"))
+
+    report = json.loads((tmp_path / "run.json").read_text())
+    assert report["jobs"][0]["config_key"] == "customer_export"
+    assert report["jobs"][0]["status"] == "ok"
+    assert report["jobs"][0]["stages"] == {"read": 0.25}
+    assert 'shipcube_etl_rows{job="customer_export",outcome="rows_read"} 5' in (tmp_path / "etl.prom").read_text()
@@ -0,0 +1,126 @@
+# tests/test_etl_partitions.py
+
+import csv
+import datetime as dt
+
+from sqlalchemy.dialects import postgresql
+
+from backend.src.ingest_pipeline.create_schema import build_schema_sql
+from etl.load_data import _upsert_records, load_incremental_data
+from etl.load_plan import parse_schema_sql
+from etl.bulk_load_initial import bulk_load_streaming
+from etl.partitions import month_start, partition_ddl, partition_name, split_unroutable
+from etl.staging_upsert import build_merge_sql, build_move_sql
+
+
+def test_monthly_partition_bounds_are_utc():
+    month = month_start("2024-12-31T23:30:00-05:00")     # already January in UTC
+
+    assert month == dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc)
+    assert partition_name("tracking", month) == "tracking_p2025_01"
+    assert partition_ddl("tracking", month_start(dt.datetime(2024, 12, 5))) == (
+        "CREATE TABLE IF NOT EXISTS tracking_p2024_12 PARTITION OF tracking "
+        "FOR VALUES FROM ('2024-12-01T00:00:00+00:00') TO ('2025-01-01T00:00:00+00:00')"
+    )
+
+
+def test_partition_values_are_sent_as_utc_instants(mocker, mock_engine_and_conn, mock_raw_conn_cursor, tmp_path):
+    records = [{"order_id": "ORD1", "transaction_date": dt.datetime(2024, 1, 31, 23, 30)},
+               {"order_id": "ORD2", "transaction_date": "2024-02-01T01:30:00+02:00"},
+               {"order_id": "ORD3", "transaction_date": "not a date"}]
+
+    routable, failed = split_unroutable(records, "transaction_date")
+
+    # naive values are UTC for Postgres too, whatever the server's TimeZone
+    utc = dt.timezone.utc
+    assert [r["transaction_date"] for r in routable] == [dt.datetime(2024, 1, 31, 23, 30, tzinfo=utc)] * 2
+    assert {month_start(r["transaction_date"]) for r in routable} == {dt.datetime(2024, 1, 1, tzinfo=utc)}
+    assert [f["original_data"]["order_id"] for f in failed] == ["ORD3"]
+
+    mocker.patch("etl.bulk_load_initial.get_partition_column", return_value="transaction_date")
+    mocker.patch("etl.bulk_load_initial.ensure_partitions")
+    _, cursor = mock_raw_conn_cursor
+    path = tmp_path / "tracking.csv"
+    path.write_text("order_id,transaction_date\nORD1,2024-01-31 23:30:00\n")
+
+    bulk_load_streaming(str(path), "tracking", mock_engine_and_conn[0])
+    cursor.execute.assert_called_once_with("SET LOCAL TIME ZONE %s", ("UTC",))
+
+
+def test_partitioned_layout_keeps_the_tracking_columns():
+    plain = parse_schema_sql(build_schema_sql())
+    partitioned_sql = build_schema_sql(partitioned_tracking=True)
+    partitioned = parse_schema_sql(partitioned_sql)
+
+    assert partitioned["tracking"]["columns"] == plain["tracking"]["columns"]
+    assert set(partitioned) == set(plain)
+    assert "PARTITION BY RANGE (transaction_date)" in partitioned_sql
+    assert "USING brin (transaction_date)" in partitioned_sql
+
+
+def test_merge_on_primary_key_and_partition_column():
+    sql = build_merge_sql("tracking", "_stage", ["order_id", "transaction_date", "carrier"],
+                          ("order_id", "transaction_date"))
+
+    # one row per order_id, even if a batch holds it under two dates
+    assert "SELECT DISTINCT ON (order_id)" in sql
+    assert "ON CONFLICT (order_id, transaction_date) DO UPDATE SET" in sql
+    assert "transaction_date = EXCLUDED" not in sql
+    assert build_move_sql("tracking", "_stage", "order_id") is None
+
+
+def test_date_moved_across_a_month_replaces_the_old_row(mock_engine_and_conn, tracking_table):
+    engine, conn = mock_engine_and_conn
+    records = [
+        {"order_id": "ORD1", "transaction_date": "2024-01-31 23:30:00+00", "last_updated": "2024-02-01 09:00"},
+        {"order_id": "ORD2", "transaction_date": "2024-01-10 08:00:00+00", "last_updated": "2024-02-01 09:00"},
+        {"order_id": "ORD1", "transaction_date": "2024-02-01 00:30:00+00", "last_updated": "2024-02-02 09:00"},
+    ]
+
+    _upsert_records(tracking_table, records, ("order_id", "transaction_date"), engine)
+
+    delete_stmt, upsert_stmt = (c.args[0] for c in conn.execute.call_args_list)
+    delete_sql = str(delete_stmt.compile(dialect=postgresql.dialect()))
+    assert delete_sql.startswith("DELETE FROM tracking USING (VALUES")
+    assert "tracking.order_id = batch.order_id AND tracking.transaction_date != batch.transaction_date" in delete_sql
+    params = upsert_stmt.compile(dialect=postgresql.dialect()).params
+    # the newer February row is kept; the January copy of ORD1 is deleted in the same transaction
+    assert sorted(v for k, v in params.items() if k.startswith("transaction_date")) == [
+        "2024-01-10 08:00:00+00", "2024-02-01 00:30:00+00"]
+
+    move_sql = build_move_sql("tracking", "_stage", ("order_id", "transaction_date"), "last_updated")
+    assert move_sql == (
+        "DELETE FROM tracking AS t\n"
+        "USING (SELECT DISTINCT ON (order_id) order_id, transaction_date\n"
+        "       FROM _stage\n"
+        "       ORDER BY order_id, last_updated DESC NULLS LAST, _stage_seq DESC) AS s\n"
+        "WHERE t.order_id = s.order_id AND t.transaction_date <> s.transaction_date"
+    )
+
+
+def test_load_routes_rows_to_partitions(mocker, tracking_table, tmp_path):
+    config = {"tracking_ingest": {
+        "model_key": "tracking", "target_table": "tracking", "primary_key": "order_id",
+        "columns": [{"source": "Order_ID", "target": "order_id", "dtype": "str"},
+                    {"source": "Transaction Date", "target": "transaction_date", "dtype": "datetime"}],
+    }}
+    mocker.patch('etl.load_data.config', config)
+    mocker.patch('etl.load_data.get_sqlalchemy_table', return_value=tracking_table)
+    mocker.patch('etl.load_data.get_partition_column', return_value="transaction_date")
+    ensure = mocker.patch('etl.load_data.ensure_partitions')
+    upsert = mocker.patch('etl.load_data._upsert_records')
+
+    source = tmp_path / "tracking.csv"
+    with open(source, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Order_ID", "Transaction Date"])
+        writer.writerows([["ORD1", "2024-01-15 10:30:00"], ["ORD2", ""], ["ORD3", "2024-02-01 08:00:00"]])
+
+    result = load_incremental_data(str(source), 'tracking_ingest', mocker.MagicMock(), dlq_dir=str(tmp_path))
+
+    assert (result["valid"], result["failed"], result["upserted"]) == (2, 1, 2)
+    (table, records, key, _), _ = upsert.call_args
+    assert key == ("order_id", "transaction_date")
+    assert [r["order_id"] for r in records] == ["ORD1", "ORD3"]
+    assert {month_start(v) for v in ensure.call_args.args[2]} == {
+        dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc), dt.datetime(2024, 2, 1, tzinfo=dt.timezone.utc)}
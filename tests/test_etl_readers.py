@@ -0,0 +1,48 @@
+# tests/test_etl_readers.py
+
+import datetime as dt
+
+import pytest
+
+from etl.readers import read_source, get_source_reader, read_csv_source, read_xlsx_source
+
+
+MAPPING = {"source_file_pattern": "5_Dog Is Human Nov - 24.xlsx", "sheet_name": "Export"}
+
+
+@pytest.fixture
+def tracking_workbook(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "Summary"
+    sheet = workbook.create_sheet("Export")
+    sheet.append(["Order ID", "Notes", "Transaction Date (UTC)", "Invoice"])
+    for i in range(5):
+        sheet.append([f"ORD{i}", "ignore me", dt.datetime(2024, 11, i + 1, 9, 30), 10.5 + i])
+    sheet.append([None, None, None, None])
+
+    path = tmp_path / "export.xlsx"
+    workbook.save(path)
+    return str(path)
+
+
+def test_get_source_reader_picks_by_extension(tmp_path):
+    assert get_source_reader("data/tracking.csv", MAPPING) is read_csv_source
+    assert get_source_reader("data/tracking.xlsx", {}) is read_xlsx_source
+    assert get_source_reader("data/export", MAPPING) is read_xlsx_source    # from source_file_pattern
+
+
+def test_xlsx_reader_streams_mapped_columns_in_chunks(tracking_workbook):
+    usecols = ["Order ID", "Transaction Date (UTC)", "Invoice"]
+    frames = list(read_source(tracking_workbook, MAPPING, usecols, chunk_size=2))
+
+    assert [len(f) for f in frames] == [2, 2, 1]       # the blank trailing row is dropped
+    assert list(frames[0].columns) == usecols
+    assert frames[0].loc[0, "Transaction Date (UTC)"] == dt.datetime(2024, 11, 1, 9, 30)
+    assert frames[2].loc[0, "Invoice"] == 14.5
+
+
+def test_xlsx_reader_reports_missing_sheet(tracking_workbook):
+    with pytest.raises(ValueError, match="Sheet 'Orders' not found"):
+        read_source(tracking_workbook, {"sheet_name": "Orders"}, ["Order ID"])
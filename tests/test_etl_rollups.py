@@ -0,0 +1,34 @@
+# tests/test_etl_rollups.py
+
+import datetime as dt
+
+from backend.src.ingest_pipeline.create_schema import build_schema_sql
+from etl.rollups import ROLLUP_TABLE, rebuild_rollups, rollup_trigger_ddl
+
+
+def test_triggers_apply_net_change_of_each_statement():
+    ddl = rollup_trigger_ddl()
+
+    assert ddl.count("FOR EACH STATEMENT") == 3
+    assert "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows" in ddl
+    # an update adds the new values and takes the old ones back out
+    update = ddl[ddl.index("_on_update()"):ddl.index("_on_delete()")]
+    assert "SELECT 1 AS sign" in update and "SELECT -1 AS sign" in update
+    assert "shipments = r.shipments + EXCLUDED.shipments" in update
+    assert "final_invoice_amt = r.final_invoice_amt + EXCLUDED.final_invoice_amt" in update
+
+    assert ROLLUP_TABLE not in build_schema_sql()
+    assert "NULLS NOT DISTINCT" in build_schema_sql(invoice_rollups=True)
+
+
+def test_rebuild_from_a_month_locks_writers_and_recomputes(mock_engine_and_conn):
+    engine, conn = mock_engine_and_conn
+    conn.execute.return_value.rowcount = 12
+
+    assert rebuild_rollups(engine, since="2024-03") == 12
+
+    statements = [str(c.args[0]) for c in conn.execute.call_args_list]
+    assert statements[0] == "LOCK TABLE tracking IN SHARE MODE"
+    assert statements[1].startswith(f"DELETE FROM {ROLLUP_TABLE} WHERE month >= :month_from")
+    assert "GROUP BY 1, 2, 3, 4" in statements[2]
+    assert conn.execute.call_args_list[1].args[1] == {"month_from": dt.date(2024, 3, 1)}
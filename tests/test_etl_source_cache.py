@@ -0,0 +1,87 @@
+# tests/test_etl_source_cache.py
+
+import json
+import os
+import time
+
+import pandas as pd
+import pytest
+
+import etl.source_cache as source_cache
+from etl.readers import read_source
+
+
+def _write_source(path, n=5):
+    pd.DataFrame({
+        "Order_ID": [f"ORD{i}" for i in range(n)],
+        "Weight": [i * 1.5 for i in range(n)],
+        "Unmapped": list(range(n)),
+    }).to_csv(path, index=False)
+
+
+def test_second_read_comes_from_the_cache(mocker, tmp_path):
+    source = tmp_path / "tracking.csv"
+    _write_source(source)
+    cache_dir = str(tmp_path / "cache")
+
+    first = pd.concat(read_source(str(source), {}, ["Order_ID", "Weight"], 2, cache_dir=cache_dir))
+    parse = mocker.patch("pandas.read_csv", side_effect=AssertionError("parsed again"))
+    second = pd.concat(read_source(str(source), {}, ["Order_ID"], 2, cache_dir=cache_dir))
+
+    assert list(first["Order_ID"]) == list(second["Order_ID"]) == [f"ORD{i}" for i in range(5)]
+    assert list(second.columns) == ["Order_ID"]
+    assert parse.call_count == 0
+
+    # Resuming skips rows of the cache the same way
+    resumed = pd.concat(read_source(str(source), {}, ["Order_ID", "Weight"], 2, skip_rows=3, cache_dir=cache_dir))
+    assert list(resumed["Order_ID"]) == ["ORD3", "ORD4"]
+    assert resumed["Weight"].tolist() == [4.5, 6.0]
+
+
+def test_changed_file_or_partial_read_is_not_served_from_cache(tmp_path):
+    source = tmp_path / "tracking.csv"
+    _write_source(source)
+    cache_dir = str(tmp_path / "cache")
+
+    # A read abandoned part-way leaves no cache entry behind
+    frames = iter(read_source(str(source), {}, ["Order_ID"], 2, cache_dir=cache_dir))
+    next(frames)
+    frames.close()
+    assert not [d for d in os.listdir(cache_dir) if d != "hashes.json"]
+
+    list(read_source(str(source), {}, ["Order_ID"], 2, cache_dir=cache_dir))
+    _write_source(source, n=3)
+    (whole,) = read_source(str(source), {}, ["Order_ID"], cache_dir=cache_dir)
+    assert len(whole) == 3
+
+    with pytest.raises(ValueError):
+        read_source(str(source), {}, ["Missing"], 2, cache_dir=cache_dir)
+
+
+def test_cache_is_pruned_by_age_and_size(mocker, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    sources = []
+    for i in range(3):
+        sources.append(tmp_path / f"tracking_{i}.csv")
+        _write_source(sources[-1], n=5 + i)
+        list(read_source(str(sources[-1]), {}, ["Order_ID"], 2, cache_dir=cache_dir))
+
+    entries = sorted(d for d in os.listdir(cache_dir) if d != "hashes.json")
+    assert len(entries) == 3
+    by_source = {}
+    for entry in entries:
+        with open(os.path.join(cache_dir, entry, "meta.json")) as f:
+            by_source[os.path.basename(json.load(f)["source"])] = entry
+
+    # tracking_0 was last read a month ago; tracking_1 before tracking_2
+    old = time.time() - 30 * 86400
+    os.utime(os.path.join(cache_dir, by_source["tracking_0.csv"], "meta.json"), (old, old))
+    os.utime(os.path.join(cache_dir, by_source["tracking_1.csv"], "meta.json"), (old + 20 * 86400,) * 2)
+    one_entry = source_cache._entry_size(os.path.join(cache_dir, by_source["tracking_2.csv"]))
+
+    removed = source_cache.prune_cache(cache_dir, max_bytes=one_entry)
+
+    assert sorted(os.path.basename(e) for e in removed) == sorted([by_source["tracking_0.csv"], by_source["tracking_1.csv"]])
+    assert sorted(d for d in os.listdir(cache_dir) if d != "hashes.json") == [by_source["tracking_2.csv"]]
+    with open(os.path.join(cache_dir, "hashes.json")) as f:
+        assert list(json.load(f).values()) == [by_source["tracking_2.csv"].split("-")[0]]
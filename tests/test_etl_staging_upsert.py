@@ -0,0 +1,79 @@
+# tests/test_etl_staging_upsert.py
+
+import datetime as dt
+from decimal import Decimal
+
+import pytest
+
+from etl.staging_upsert import copy_upsert, build_merge_sql, iter_csv_rows
+from etl.utils import IterableTextIO
+
+
+def test_iter_csv_rows_formats_values():
+    """None becomes the COPY NULL marker; datetimes are ISO formatted."""
+
+    records = [
+        {"order_id": "ORD1", "invoice_amount": Decimal("1.50"), "last_updated": dt.datetime(2024, 1, 15, 10, 30)},
+        {"order_id": "ORD2", "invoice_amount": None, "last_updated": None},
+    ]
+    text = "".join(iter_csv_rows(records, ["order_id", "invoice_amount", "last_updated"], rows_per_block=1))
+
+    assert text == "ORD1,1.50,2024-01-15T10:30:00\nORD2,\\N,\\N\n"
+
+
+def test_iterable_text_io_reads_across_chunks():
+    stream = IterableTextIO(["ab", "c\nde", "f\n"])
+    assert stream.read(4) == "abc\n"
+    assert stream.readline() == "def\n"
+    assert stream.read() == ""
+
+
+def test_build_merge_sql_keeps_newest_row_per_key():
+    sql = build_merge_sql("tracking", "_stage_tracking", ["order_id", "carrier", "last_updated"],
+                          "order_id", "last_updated")
+
+    assert 'SELECT DISTINCT ON (order_id)' in sql
+    assert 'ORDER BY order_id, last_updated DESC NULLS LAST, _stage_seq DESC' in sql
+    assert 'ON CONFLICT (order_id) DO UPDATE SET' in sql
+    assert 'carrier = EXCLUDED.carrier' in sql
+    assert 'order_id = EXCLUDED' not in sql
+
+
+def test_copy_upsert(mock_engine_and_conn, mock_raw_conn_cursor, tracking_table):
+    """Records are COPYed into a temp table and merged in one statement."""
+
+    mock_engine, _ = mock_engine_and_conn
+    mock_conn, mock_cursor = mock_raw_conn_cursor
+
+    copied = []
+    mock_cursor.copy_expert.side_effect = lambda sql, stream: copied.append(stream.read())
+
+    records = [
+        {"order_id": "ORD1", "carrier": "UPS", "last_updated": dt.datetime(2024, 1, 1)},
+        {"order_id": "ORD1", "carrier": "FedEx", "last_updated": dt.datetime(2024, 1, 2)},
+    ]
+    copy_upsert(tracking_table, records, "order_id", mock_engine)
+
+    statements = [c.args[0] for c in mock_cursor.execute.call_args_list]
+    assert statements[0].startswith("CREATE TEMP TABLE")
+    assert "ON COMMIT DROP" in statements[0]
+    assert "ON CONFLICT (order_id)" in statements[-1]
+
+    copy_sql = mock_cursor.copy_expert.call_args.args[0]
+    assert copy_sql.startswith("COPY _stage_tracking_")
+    assert copied[0].count("ORD1") == 2       # duplicates are collapsed by the merge, not dropped early
+
+    mock_conn.commit.assert_called_once()
+    mock_conn.close.assert_called_once()
+
+
+def test_copy_upsert_rolls_back_on_error(mock_engine_and_conn, mock_raw_conn_cursor, tracking_table):
+    mock_engine, _ = mock_engine_and_conn
+    mock_conn, mock_cursor = mock_raw_conn_cursor
+    mock_cursor.copy_expert.side_effect = RuntimeError("COPY failed")
+
+    with pytest.raises(RuntimeError):
+        copy_upsert(tracking_table, [{"order_id": "ORD1"}], "order_id", mock_engine)
+
+    mock_conn.rollback.assert_called_once()
+    mock_conn.commit.assert_not_called()
@@ -3,7 +3,7 @@
 import pytest
 from sqlalchemy import Table
 from ml.validation_model import Tracking
-from etl.utils import get_validator_model, get_sqlalchemy_table
+from etl.utils import get_validator_model, get_sqlalchemy_table, split_byte_ranges, iter_byte_range
 
 
 def test_get_validator_model_success():
@@ -31,4 +31,15 @@ def test_get_sqlalchemy_table(mocker, mock_engine):
         autoload_with=mock_engine
     )
 
-    assert result == mock_table_class.return_value
\ No newline at end of file
+    assert result == mock_table_class.return_value
+
+
+def test_split_byte_ranges_covers_file_on_line_boundaries(tmp_path):
+    path = tmp_path / "tracking.csv"
+    path.write_text("Order ID,Carrier\n" + "".join(f"ORD{i},UPS\n" for i in range(100)))
+
+    _, ranges = split_byte_ranges(str(path), 4)
+    body = ["".join(iter_byte_range(str(path), start, end)).splitlines()[1:] for start, end in ranges]
+
+    assert len(ranges) == 4
+    assert sum(body, []) == [f"ORD{i},UPS" for i in range(100)]
@@ -0,0 +1,99 @@
+# tests/test_etl_watch_folder.py
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from etl import job_runner
+from etl.watch_folder import WatchFolderService, InotifyWatcher, match_config_key
+
+
+MAPPING = {
+    "customer_export": {"source_file_pattern": "all_clients*.csv"},
+    "tracking_export": {"source_file_pattern": "tracking_*.csv", "depends_on": ["customer_export"]},
+}
+
+
+@pytest.fixture
+def loads(mocker):
+    mocker.patch.object(job_runner, "create_engine")
+    calls = []
+
+    def fake_load(source, config_key, engine, **kwargs):
+        calls.append((config_key, source.rsplit("/", 1)[-1], kwargs["chunk_size"]))
+        return {"rows_read": 1, "valid": 1, "failed": 0, "upserted": 1, "dlq_files": [], "error": None}
+
+    mocker.patch.object(job_runner, "load_incremental_data", side_effect=fake_load)
+    return calls
+
+
+def _service(directory, **kwargs):
+    return WatchFolderService([str(directory)], "postgresql://u:p@localhost/db", mapping_config=MAPPING,
+                              settle_seconds=0, use_inotify=False, executor_class=ThreadPoolExecutor,
+                              chunk_size=100, **kwargs)
+
+
+def test_match_config_key_uses_source_file_pattern():
+    assert match_config_key("tracking_2024-11-02.csv", MAPPING) == "tracking_export"
+    assert match_config_key("notes.txt", MAPPING) is None
+
+
+def test_loads_settled_files_in_dependency_order(tmp_path, loads):
+    (tmp_path / "tracking_1.csv").write_text("Order_ID\nORD1\n")
+    (tmp_path / "all_clients.csv").write_text("ClientName\nAcme\n")
+    (tmp_path / "upload.csv.part").write_text("partial")
+    service = _service(tmp_path)
+
+    for _ in range(4):
+        service.tick(timeout=0.05)
+
+    assert loads == [("customer_export", "all_clients.csv", 100), ("tracking_export", "tracking_1.csv", 100)]
+    assert sorted(p.name for p in (tmp_path / "processed").iterdir()) == ["all_clients.csv", "tracking_1.csv"]
+    assert (tmp_path / "upload.csv.part").exists()
+
+
+def test_failed_database_load_is_retried(tmp_path, mocker, loads):
+    mocker.patch.object(job_runner, "load_incremental_data", return_value={
+        "rows_read": 0, "valid": 0, "failed": 0, "upserted": 0, "dlq_files": [], "error": "load"})
+    (tmp_path / "all_clients.csv").write_text("ClientName\nAcme\n")
+    service = _service(tmp_path, retry_seconds=60)
+
+    for _ in range(3):
+        service.tick(timeout=0.05)
+
+    assert (tmp_path / "all_clients.csv").exists()
+    assert "all_clients.csv" not in [p.name for p in (tmp_path / "failed").iterdir()]
+    assert str(tmp_path / "all_clients.csv") in service._candidates
+
+
+def test_failed_database_load_backs_off_then_gives_up(tmp_path, mocker, loads):
+    load = mocker.patch.object(job_runner, "load_incremental_data", return_value={
+        "rows_read": 0, "valid": 0, "failed": 0, "upserted": 0, "dlq_files": [], "error": "load"})
+    (tmp_path / "all_clients.csv").write_text("ClientName\nAcme\n")
+    service = _service(tmp_path, retry_seconds=0.05, max_attempts=3)
+    path = str(tmp_path / "all_clients.csv")
+
+    waits = {}
+    for _ in range(100):
+        if path in service._candidates:
+            waits.setdefault(load.call_count, service._candidates[path][3] - time.monotonic())
+        service.tick(timeout=0.02)
+        if load.call_count == 3 and not service._running:
+            break
+
+    assert load.call_count == 3
+    assert waits[2] - waits[1] > 0.03        # waited 0.05s after the first failure, 0.1s after the second
+    assert (tmp_path / "failed" / "all_clients.csv").exists()
+    assert path not in service._candidates and path not in service._failures
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_watcher_reports_closed_files(tmp_path):
+    watcher = InotifyWatcher([str(tmp_path)])
+    try:
+        (tmp_path / "all_clients.csv").write_text("ClientName\nAcme\n")
+        assert str(tmp_path / "all_clients.csv") in watcher.poll(1.0)
+    finally:
+        watcher.close()
@@ -0,0 +1,54 @@
+# tests/test_highlighter.py
+
+import random
+
+from backend.src.highlighter import compile_automaton, highlight
+
+
+def _reference(text, entity_texts):
+    """Leftmost-longest matching, the slow way."""
+    patterns = {t.lower() for t in entity_texts}
+    lowered, out, i = text.lower(), [], 0
+    while i < len(text):
+        ends = [i + len(p) for p in patterns if lowered.startswith(p, i)]
+        if ends:
+            out.append(f"**{text[i:max(ends)]}**")
+            i = max(ends)
+        else:
+            out.append(text[i])
+            i += 1
+    return "".join(out)
+
+
+def test_longest_match_wins_and_nothing_is_nested():
+    entities = [{"text": "ship"}, {"text": "shipcube"}, {"text": "cube"}, {}]
+
+    assert highlight("ShipCube ships cubes.", entities) == "**ShipCube** **ship**s **cube**s."
+    assert highlight("ShipCube ships.", entities, style="html") == "<strong>ShipCube</strong> <strong>ship</strong>s."
+    assert highlight("No match here.", entities) == "No match here."
+
+
+def test_offsets_are_used_when_they_match_the_text():
+    text = "Order SC12345 <urgent> & SC12345 again"
+    entities = [{"text": "SC12345", "label": "ORDER_ID", "start_char": 6, "end_char": 13}]
+
+    # only the occurrence the model found, and HTML output is escaped
+    assert highlight(text, entities, style="html") == (
+        "Order <strong>SC12345</strong> &lt;urgent&gt; &amp; SC12345 again")
+    # offsets from another text (e.g. before summarizing) fall back to matching
+    assert highlight("Still SC12345", entities) == "Still **SC12345**"
+
+
+def test_automaton_matches_the_reference_and_is_cached():
+    rng = random.Random(7)
+    alphabet = "abAB-"
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        entity_texts = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 5))) for _ in range(rng.randint(1, 6))]
+        entities = [{"text": t} for t in entity_texts]
+        assert highlight(text, entities) == _reference(text, entity_texts), (text, entity_texts)
+
+    compile_automaton.cache_clear()
+    highlight("SC12345 and EU54321", [{"text": "SC12345"}, {"text": "eu54321"}])
+    highlight("EU54321 only", [{"text": "eu54321"}, {"text": "SC12345"}])
+    assert compile_automaton.cache_info().misses == 1
@@ -0,0 +1,64 @@
+# tests/test_inference_batcher.py
+
+import asyncio
+
+import pytest
+
+from backend.src.app.services.batching import MicroBatcher
+
+
+def test_concurrent_requests_share_batches_and_get_their_own_results():
+    calls = []
+
+    def upper(texts):
+        calls.append(list(texts))
+        return [t.upper() for t in texts]
+
+    async def scenario():
+        batcher = MicroBatcher(upper, max_batch_size=4, max_wait_ms=20, name="ner")
+        results = await asyncio.gather(*(batcher.submit(f"msg{i}") for i in range(6)))
+        await batcher.close()
+        return batcher, results
+
+    batcher, results = asyncio.run(scenario())
+
+    assert results == [f"MSG{i}" for i in range(6)]
+    # one full batch, the rest after the wait window
+    assert [len(c) for c in calls] == [4, 2]
+    assert batcher.batch_sizes.count == 2 and batcher.queue_wait.count == 6
+
+    lines = batcher.prometheus_lines()
+    assert 'shipcube_nlp_batch_size_bucket{batcher="ner",le="4"} 2' in lines
+    assert 'shipcube_nlp_queue_wait_seconds_count{batcher="ner"} 6' in lines
+
+
+def test_failed_batch_raises_in_every_caller_and_worker_keeps_going():
+    def flaky(texts):
+        if "boom" in texts:
+            raise RuntimeError("model failed")
+        return [len(t) for t in texts]
+
+    async def scenario():
+        batcher = MicroBatcher(flaky, max_batch_size=2, max_wait_ms=5)
+        failed = await asyncio.gather(batcher.submit("boom"), batcher.submit("ok"), return_exceptions=True)
+        after = await batcher.submit("fine")
+        await batcher.close()
+        return failed, after
+
+    failed, after = asyncio.run(scenario())
+
+    assert all(isinstance(r, RuntimeError) for r in failed)
+    assert after == 4
+
+
+def test_single_request_waits_at_most_the_window():
+    async def scenario():
+        batcher = MicroBatcher(lambda texts: texts, max_batch_size=16, max_wait_ms=10)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await batcher.submit("x")
+        elapsed = loop.time() - started
+        await batcher.close()
+        return elapsed
+
+    assert asyncio.run(scenario()) == pytest.approx(0.01, abs=0.2)
@@ -0,0 +1,85 @@
+# tests/test_inference_pool.py
+
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.src.app.main import app
+from backend.src.app.services.batching import MicroBatcher
+from backend.src.app.services.inference import InferencePool, InferenceTimeout
+from tests.inference_helpers import slow_batch
+
+
+def test_event_loop_stays_responsive_while_workers_compute():
+    async def scenario():
+        pool = InferencePool(workers=2, initializer=None)
+        pids = await pool.start()
+
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        beat = asyncio.create_task(heartbeat())
+        with pytest.raises(InferenceTimeout):
+            await pool.run(time.sleep, 0.5, timeout=0.2)
+        result = await pool.run(pow, 2, 10)
+        beat.cancel()
+        await pool.close()
+        return pids, ticks, result
+
+    pids, ticks, result = asyncio.run(scenario())
+
+    assert len(pids) == 2 and os.getpid() not in pids
+    assert ticks >= 10        # the loop kept running during the blocked work
+    assert result == 1024
+
+
+def test_batches_run_in_parallel_on_the_workers():
+    async def scenario():
+        pool = InferencePool(workers=4, initializer=None)
+        await pool.start()
+        batcher = MicroBatcher(slow_batch, max_batch_size=2, max_wait_ms=5, executor=pool, max_in_flight=4)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(16)))
+        elapsed = time.perf_counter() - started
+        await batcher.close()
+        await pool.close()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(scenario())
+
+    assert [item for item, _, _ in results] == list(range(16))
+    # 8 batches of 0.2s on 4 workers: two rounds, not eight
+    assert elapsed < 1.0
+    runs = sorted({(start, end) for _, start, end in results})
+    assert any(later[0] < earlier[1] for earlier, later in zip(runs, runs[1:]))
+
+
+def test_pool_is_replaced_after_a_worker_dies():
+    async def scenario():
+        pool = InferencePool(workers=1, initializer=None)
+        with pytest.raises(BrokenProcessPool):
+            await pool.run(os._exit, 1)
+        result = await pool.run(pow, 2, 3)
+        await pool.close()
+        return result
+
+    assert asyncio.run(scenario()) == 8
+
+
+def test_chat_returns_504_when_inference_times_out(mocker):
+    mocker.patch("backend.src.app.routers.chat.analyze_message", side_effect=InferenceTimeout("too slow"))
+    client = TestClient(app)
+
+    assert client.get("/api/health").json() == {"status": "ok", "router": "chat"}
+    response = client.post("/api/chat/query", json={"text": "Where is order SC12345?"})
+    assert response.status_code == 504
+    assert response.json() == {"detail": "too slow"}
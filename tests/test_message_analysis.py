@@ -0,0 +1,47 @@
+# tests/test_message_analysis.py
+
+import spacy
+from spacy.language import Language
+
+from backend.src.app.services.analysis import analyze_many, disabled_components, unused_components
+
+
+@Language.component("fail_if_run")
+def fail_if_run(doc):
+    raise AssertionError("component should have been disabled")
+
+
+def _pipeline():
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "ORDER_ID", "pattern": [{"TEXT": {"REGEX": r"^(SC|EU)\d{5}$"}}]}])
+    nlp.add_pipe("fail_if_run", name="parser")
+    return nlp
+
+
+def test_one_parse_serves_entities_offsets_and_summary(monkeypatch):
+    monkeypatch.setattr("backend.src.config.SUMMARY_PLACEHOLDER_TOKEN_LIMIT", 5)
+    text = "Where is SC12345 ? It left on Monday and EU54321 too."
+
+    long, short = analyze_many(_pipeline(), [text, "Track EU54321"])
+
+    assert long.entities == [
+        {"text": "SC12345", "label": "ORDER_ID", "start_char": 9, "end_char": 16},
+        {"text": "EU54321", "label": "ORDER_ID", "start_char": 41, "end_char": 48},
+    ]
+    assert all(long.text[e["start_char"]:e["end_char"]] == e["text"] for e in long.entities)
+    # the order ID sentences fit in 5 tokens, the first one is taken
+    assert long.summary() == "Where is SC12345 ?..."
+    assert short.summary() == "Track EU54321"
+    assert short.to_dict() == {
+        "text": "Track EU54321",
+        "entities": [{"text": "EU54321", "label": "ORDER_ID", "start_char": 6, "end_char": 13}],
+        "summary": "Track EU54321",
+    }
+
+
+def test_components_are_disabled_per_endpoint():
+    names = ["pii_redactor", "transformer", "tagger", "parser", "attribute_ruler", "lemmatizer", "entity_ruler", "ner"]
+
+    assert disabled_components(names, "chat") == ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+    assert unused_components(names) == ["tagger", "parser", "attribute_ruler", "lemmatizer"]
@@ -0,0 +1,169 @@
+# tests/test_order_service.py
+
+import asyncio
+import json
+import types
+
+from backend.src.app.services import order_service
+from backend.src.app.services.order_service import OrderStatusService, TTLCache
+from etl.notify import upsert_payloads
+
+
+class FakePool:
+    """Stands in for an asyncpg pool: records each query's order IDs."""
+
+    def __init__(self, rows, delay=0.0):
+        self.rows = rows
+        self.delay = delay
+        self.queries = []
+
+    def acquire(self):
+        pool = self
+
+        class Connection:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def fetch(self, sql, order_ids):
+                pool.queries.append(list(order_ids))
+                await asyncio.sleep(pool.delay)
+                return [pool.rows[i] for i in order_ids if i in pool.rows]
+
+        return Connection()
+
+    async def close(self):
+        pass
+
+
+ROWS = {
+    "SC12345": {"order_id": "SC12345", "transaction_status": "Delivered", "carrier": "UPS", "tracking_id": "1Z999"},
+    "EU54321": {"order_id": "EU54321", "transaction_status": "In Transit", "carrier": "DHL", "tracking_id": "JD014"},
+}
+
+
+def test_lookup_batches_coalesces_and_caches():
+    pool = FakePool(ROWS, delay=0.01)
+    service = OrderStatusService(pool=pool)
+
+    async def scenario():
+        first, second = await asyncio.gather(
+            service.lookup(["SC12345", "EU54321", "SC00000"]),
+            service.lookup(["SC12345"]),
+        )
+        third = await service.lookup(["EU54321", "SC00000"])
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+
+    assert pool.queries == [["SC12345", "EU54321", "SC00000"]]     # one query, shared and then cached
+    assert first["SC12345"]["status"] == "Delivered" and first["SC12345"]["tracking_id"] == "1Z999"
+    assert first["SC00000"] is None
+    assert second == {"SC12345": first["SC12345"]}
+    assert third["EU54321"]["carrier"] == "DHL"
+
+
+def test_slow_lookup_times_out_and_upserts_invalidate():
+    pool = FakePool(ROWS, delay=0.2)
+    service = OrderStatusService(pool=pool, timeout=0.01)
+
+    async def scenario():
+        early = await service.lookup(["SC12345"])
+        await asyncio.sleep(0.3)
+        late = await service.lookup(["SC12345"])
+        return early, late
+
+    early, late = asyncio.run(scenario())
+    assert early == {}                                  # the reply does not wait for the database
+    assert late["SC12345"]["status"] == "Delivered"     # but the fetch still filled the cache
+
+    (payload,) = upsert_payloads("tracking", ["SC12345"])
+    service._on_notify(None, 1, "etl_upsert", payload)
+    assert service.cache.get("SC12345") == (False, None)
+
+    service.cache.set("EU54321", ROWS["EU54321"], 60)
+    service._on_notify(None, 1, "etl_upsert", json.dumps({"table": "tracking", "keys": None}))
+    assert len(service.cache) == 0
+
+
+def test_fetch_in_flight_during_an_upsert_is_not_cached():
+    pool = FakePool(ROWS, delay=0.05)
+    service = OrderStatusService(pool=pool)
+
+    async def scenario():
+        lookup = asyncio.ensure_future(service.lookup(["SC12345", "EU54321"]))
+        await asyncio.sleep(0.01)
+        (payload,) = upsert_payloads("tracking", ["SC12345"])
+        service._on_notify(None, 1, "etl_upsert", payload)
+        return await lookup
+
+    result = asyncio.run(scenario())
+
+    assert set(result) == {"SC12345", "EU54321"}
+    assert service.cache.get("SC12345") == (False, None)      # may be the status from before the upsert
+    assert service.cache.get("EU54321")[0]
+
+
+class FakeListener:
+    def __init__(self):
+        self.channels = []
+        self.on_terminate = None
+
+    async def add_listener(self, channel, callback):
+        self.channels.append(channel)
+
+    def add_termination_listener(self, callback):
+        self.on_terminate = callback
+
+    async def close(self):
+        pass
+
+
+def test_lost_listener_reconnects_and_nothing_is_cached_meanwhile(mocker):
+    mocker.patch.object(order_service, "LISTENER_RETRY_MIN_SECONDS", 0.01)
+    listeners = [FakeListener(), FakeListener()]
+    attempts = iter([listeners[0], OSError("connection refused"), listeners[1]])
+
+    async def connect(dsn):
+        attempt = next(attempts)
+        if isinstance(attempt, Exception):
+            raise attempt
+        return attempt
+
+    mocker.patch.dict("sys.modules", {"asyncpg": types.SimpleNamespace(connect=connect)})
+    pool = FakePool(ROWS)
+    service = OrderStatusService(pool=pool)
+
+    async def scenario():
+        await service._connect_listener()
+        await service.lookup(["SC12345"])
+        listeners[0].on_terminate(listeners[0])
+        assert len(service.cache) == 0
+
+        await service.lookup(["SC12345"])
+        assert len(service.cache) == 0        # no upsert can be heard about: not cached
+        await asyncio.sleep(0.1)              # one failed attempt, then reconnected
+        await service.lookup(["SC12345"])
+        await service.lookup(["SC12345"])
+        await service.close()
+
+    asyncio.run(scenario())
+
+    assert service._listener is None and listeners[1].channels == ["etl_upsert"]
+    assert len(pool.queries) == 3
+    assert service.cache.get("SC12345")[0]
+
+
+def test_ttl_cache_expires_and_evicts():
+    now = [0.0]
+    cache = TTLCache(max_entries=2, clock=lambda: now[0])
+    cache.set("a", 1, ttl=10)
+    cache.set("b", 2, ttl=1)
+    cache.get("a")
+    cache.set("c", 3, ttl=10)      # evicts b, the least recently used
+
+    assert cache.get("b") == (False, None)
+    now[0] = 11
+    assert cache.get("a") == (False, None)
@@ -0,0 +1,54 @@
+# tests/test_pii_redactor.py
+
+import pytest
+from presidio_analyzer import EntityRecognizer
+from presidio_analyzer.predefined_recognizers import EmailRecognizer, PhoneRecognizer
+
+from ml import pii_redactor
+from ml.pii_redactor import OPERATORS, anonymizer, redact_many, redact_prompt
+
+
+MESSAGES = [
+    "Hi, this is John Doe, my order SC12345 is late. Call me at 212-555-5555 or email me at john.doe@example.com.",
+    "Where is my order SC12345? It should have arrived on 12/03/2024 at 10:30.",
+    "Reach me on +44 20 7946 0958, or on +49 30 901820, or at (415) 555-0132 ext. 12",
+    "Mail ops@ship-cube.co.uk and cc: a.b+tag@sub.example.org; not me@localhost or x@y.invalidtld",
+    "Tracking 1Z999AA10123456784 and invoice 2024-11-05, call 0800 123 4567 now!",
+    "Thanks, that's all!",
+    "",
+]
+
+
+def _presidio(text):
+    """Presidio's own recognizers for the two types, as AnalyzerEngine runs them."""
+    results = EmailRecognizer().analyze(text, ["EMAIL_ADDRESS"]) + PhoneRecognizer().analyze(text, ["PHONE_NUMBER"])
+    results = EntityRecognizer.remove_duplicates(results)
+    return anonymizer.anonymize(text=text, analyzer_results=results, operators=OPERATORS).text
+
+
+@pytest.mark.parametrize("text", MESSAGES)
+def test_fast_path_redacts_like_presidio(text):
+    assert redact_prompt(text) == _presidio(text)
+
+
+def test_redact_many_and_presidio_fallback_only_when_configured(mocker):
+    analyzer = mocker.patch.object(pii_redactor, "presidio_analyzer")
+
+    assert redact_many(MESSAGES[:2]) == [redact_prompt(m) for m in MESSAGES[:2]]
+    assert redact_prompt(MESSAGES[0]) == (
+        "Hi, this is John Doe, my order SC12345 is late. Call me at <PHONE> or email me at <EMAIL>.")
+    analyzer.assert_not_called()
+
+    mocker.patch.object(pii_redactor, "PRESIDIO_ENTITIES", ("PERSON",))
+    person = pii_redactor.RecognizerResult("PERSON", 12, 20, 0.85)
+    analyzer.return_value.analyze.return_value = [person]
+
+    assert redact_prompt(MESSAGES[0]).startswith("Hi, this is <PERSON>, my order SC12345")
+    assert analyzer.return_value.analyze.call_args.kwargs["entities"] == ["PERSON"]
+
+
+def test_redact_many_fails_like_redact_prompt(mocker):
+    mocker.patch.object(pii_redactor, "PRESIDIO_ENTITIES", ("PERSON",))
+    mocker.patch.object(pii_redactor, "presidio_analyzer", side_effect=OSError("model not found"))
+
+    assert redact_many(MESSAGES[:2]) == [redact_prompt(m) for m in MESSAGES[:2]] == ["", ""]
@@ -0,0 +1,58 @@
+# tests/test_rate_client.py
+
+import datetime as dt
+from decimal import Decimal
+
+from backend.src.connectors.rate_client import RateLookupEngine
+
+
+def _row(effective_date, base_rate, last_updated, product_id="GROUND"):
+    return {"origin": "CA", "destination": "NY", "product_id": product_id,
+            "effective_date": effective_date, "base_rate": Decimal(base_rate), "surcharge_type": None,
+            "surcharge_value": None, "currency": "USD", "last_updated": last_updated}
+
+
+def _engine(mocker, *batches):
+    engine = mocker.MagicMock()
+    conn = engine.connect.return_value.__enter__.return_value
+    conn.execute.return_value.mappings.return_value.all.side_effect = list(batches)
+    return engine, conn
+
+
+def test_quote_returns_rate_in_effect_on_ship_date(mocker):
+    t0 = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+    engine, _ = _engine(mocker, [
+        _row(dt.date(2024, 1, 1), "10.00", t0),
+        _row(dt.date(2024, 3, 1), "12.00", t0),
+        _row(dt.date(2024, 2, 1), "11.00", t0),
+    ])
+    rates = RateLookupEngine(engine)
+    rates.refresh()
+
+    assert rates.quote("CA", "NY", "GROUND", dt.date(2023, 12, 31)) is None
+    assert rates.quote("CA", "NY", "GROUND", "2024-02-15")["base_rate"] == Decimal("11.00")
+    assert rates.quote("CA", "NY", "GROUND", dt.date(2024, 3, 1))["base_rate"] == Decimal("12.00")
+    assert rates.quote("CA", "NY", "EXPRESS", dt.date(2024, 3, 1)) is None
+    assert [q and q["base_rate"] for q in rates.quote_many([
+        ("CA", "NY", "GROUND", dt.date(2024, 1, 20)), ("CA", "TX", "GROUND", dt.date(2024, 1, 20)),
+    ])] == [Decimal("10.00"), None]
+
+
+def test_refresh_reads_only_rows_past_the_watermark(mocker):
+    t0 = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+    t1 = t0 + dt.timedelta(hours=1)
+    engine, conn = _engine(mocker, [_row(dt.date(2024, 1, 1), "10.00", t0)],
+                           [_row(dt.date(2024, 1, 1), "9.50", t1), _row(dt.date(2024, 1, 1), "20.00", t1, "EXPRESS")])
+    rates = RateLookupEngine(engine)
+    rates.refresh()
+    before = rates.quote("CA", "NY", "GROUND", dt.date(2024, 6, 1))
+
+    assert rates.refresh() == 2
+    sql, params = conn.execute.call_args.args
+    assert "WHERE last_updated > :since" in str(sql)
+    assert params["since"] < t0 and rates.watermark == t1
+
+    assert before["base_rate"] == Decimal("10.00")      # quotes already handed out are untouched
+    assert rates.quote("CA", "NY", "GROUND", dt.date(2024, 6, 1))["base_rate"] == Decimal("9.50")
+    assert rates.quote("CA", "NY", "EXPRESS", dt.date(2024, 6, 1))["base_rate"] == Decimal("20.00")
+    assert (len(rates), rates.lanes) == (2, 2)
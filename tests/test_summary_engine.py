@@ -0,0 +1,49 @@
+# tests/test_summary_engine.py
+
+import time
+
+from backend.src.summary_engine import count_tokens, extractive_summary, split_sentences
+
+
+THREAD = (
+    "Hi team, hope you are well.\n"
+    "Thanks again for the quick help last week! We really appreciate it.\n"
+    "Our warehouse moved to a new building, so please update the address.\n"
+    "> On Monday, Support wrote: thanks for reaching out.\n"
+    "Order SC12345 shipped with UPS on the 3rd but tracking still shows no movement.\n"
+    "Could you please check with the carrier? Best regards, Ana."
+)
+
+
+def test_summary_keeps_the_informative_sentences_in_order():
+    summary = extractive_summary(THREAD, token_budget=25)
+
+    assert summary == (
+        "Hi team, hope you are well. "
+        "Order SC12345 shipped with UPS on the 3rd but tracking still shows no movement..."
+    )
+    assert count_tokens(summary) <= 25 + 3          # plus the "..."
+    assert extractive_summary("Where is SC12345?", token_budget=30) == "Where is SC12345?"
+
+
+def test_sentences_do_not_split_inside_numbers_or_emails():
+    text = "Refund $12.50 to ana.b@example.com today. Thanks!\nBye"
+
+    assert list(split_sentences(text)) == [
+        (0, "Refund $12.50 to ana.b@example.com today."), (42, "Thanks!"), (50, "Bye")]
+
+
+def test_cost_does_not_grow_with_the_input():
+    sentence = "Please forward this to the team and keep everyone in the loop. "
+    long_thread = sentence * 40_000 + "Order EU54321 was lost by DHL."    # ~2.5 MB
+    no_punctuation = "word " * 500_000
+
+    started = time.perf_counter()
+    summary = extractive_summary(long_thread, token_budget=50)
+    run_on = extractive_summary(no_punctuation, token_budget=50)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5
+    assert "EU54321" not in summary          # beyond what is read
+    assert count_tokens(summary) <= 53
+    assert run_on == "word " * 49 + "word..."
@@ -0,0 +1,73 @@
+# tests/test_tracking_client.py
+
+import asyncio
+
+import httpx
+import pytest
+
+from backend.src.connectors.tracking_client import TrackingClient, write_back
+from backend.src.connectors.tracking_stub import StubTrackingServer
+
+
+def _carriers(url, batch_size=3, timeout=2.0):
+    return {
+        "UPS": {"url": f"{url}/ups/track", "batch_size": batch_size, "rate_per_second": 1000, "timeout": timeout},
+        "DHL": {"url": f"{url}/dhl/track", "batch_size": batch_size, "rate_per_second": 1000, "timeout": timeout},
+    }
+
+
+def test_lookups_are_coalesced_and_batched_per_carrier():
+    statuses = {"1Z1": "Delivered", "1Z2": "In Transit", "1Z3": "In Transit", "1Z4": "Exception", "JD1": "Delivered"}
+    with StubTrackingServer(statuses) as server:
+        async def scenario():
+            async with TrackingClient(_carriers(server.url), batch_window=0.02) as client:
+                return await client.track_many([
+                    ("UPS", "1Z1"), ("UPS", "1Z2"), ("UPS", "1Z1"), ("UPS", "1Z3"),
+                    ("UPS", "1Z4"), ("DHL", "JD1"), ("DHL", "JD9"),
+                ])
+
+        results = asyncio.run(scenario())
+
+    assert [r and r["status"] for r in results] == [
+        "Delivered", "In Transit", "Delivered", "In Transit", "Exception", "Delivered", None]
+    # 1Z1 is asked for once; UPS fills one batch of 3 and sends the rest after the window
+    assert sorted(server.requests) == [("dhl", ["JD1", "JD9"]), ("ups", ["1Z1", "1Z2", "1Z3"]), ("ups", ["1Z4"])]
+
+
+def test_carrier_timeout_fails_only_that_batch():
+    with StubTrackingServer({"1Z1": "Delivered"}, delay=0.5) as server:
+        async def scenario():
+            async with TrackingClient(_carriers(server.url, timeout=0.05)) as client:
+                return await client.track_many([("UPS", "1Z1"), ("UPS", "1Z2")])
+
+        results = asyncio.run(scenario())
+
+    assert all(isinstance(r, httpx.TimeoutException) for r in results)
+    with pytest.raises(ValueError):
+        asyncio.run(_track_unknown_carrier())
+
+
+async def _track_unknown_carrier():
+    async with TrackingClient({}) as client:
+        await client.track("Pigeon", "P1")
+
+
+def test_write_back_upserts_changed_statuses(mocker, tracking_table):
+    mocker.patch("backend.src.connectors.tracking_client.get_partition_column", return_value="transaction_date")
+    mocker.patch("backend.src.connectors.tracking_client.get_sqlalchemy_table", return_value=tracking_table)
+    upsert = mocker.patch("backend.src.connectors.tracking_client.copy_upsert")
+    notify = mocker.patch("backend.src.connectors.tracking_client.notify_upserted")
+
+    shipments = [
+        {"order_id": "ORD1", "transaction_date": "2024-01-02", "transaction_status": "In Transit"},
+        {"order_id": "ORD2", "transaction_date": "2024-01-03", "transaction_status": "In Transit"},
+        {"order_id": "ORD3", "transaction_date": "2024-01-04", "transaction_status": "In Transit"},
+    ]
+    results = [{"status": "Delivered"}, {"status": "In Transit"}, TimeoutError()]
+
+    assert write_back(mocker.MagicMock(), shipments, results) == 1
+    (_, records, key, _), _ = upsert.call_args
+    assert key == ("order_id", "transaction_date")
+    assert [(r["order_id"], r["transaction_status"], r["transaction_date"]) for r in records] == [
+        ("ORD1", "Delivered", "2024-01-02")]
+    assert notify.call_args.args[2] == ["ORD1"]